@@ -21,6 +21,7 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.streaming import TokenStream
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -61,6 +62,8 @@ class MessageBuffer:
             "Portfolio Manager": "pending",
         }
         self.current_agent = None
+        # Tokens of the agent that is currently generating, shown before its report lands
+        self.token_stream = TokenStream()
         self.report_sections = {
             "market_report": None,
             "sentiment_report": None,
@@ -354,24 +357,7 @@ def update_display(layout, spinner_text=None):
     )
 
     # Analysis panel showing current report
-    if message_buffer.current_report:
-        layout["analysis"].update(
-            Panel(
-                Markdown(message_buffer.current_report),
-                title="Current Report",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
-    else:
-        layout["analysis"].update(
-            Panel(
-                "[italic]Waiting for analysis report...[/italic]",
-                title="Current Report",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
+    update_analysis_panel(layout)
 
     # Footer with statistics
     tool_calls_count = len(message_buffer.tool_calls)
@@ -391,6 +377,39 @@ def update_display(layout, spinner_text=None):
     layout["footer"].update(Panel(stats_table, border_style="grey50"))
 
 
+def update_analysis_panel(layout):
+    # While an agent is generating, show the tail of its output as plain text;
+    # only this panel is rebuilt per repaint, the rest of the layout is untouched
+    token_stream = message_buffer.token_stream
+    if token_stream.node:
+        layout["analysis"].update(
+            Panel(
+                Text(token_stream.tail(), overflow="fold"),
+                title=f"{token_stream.node} (streaming)",
+                border_style="yellow",
+                padding=(1, 2),
+            )
+        )
+    elif message_buffer.current_report:
+        layout["analysis"].update(
+            Panel(
+                Markdown(message_buffer.current_report),
+                title="Current Report",
+                border_style="green",
+                padding=(1, 2),
+            )
+        )
+    else:
+        layout["analysis"].update(
+            Panel(
+                "[italic]Waiting for analysis report...[/italic]",
+                title="Current Report",
+                border_style="green",
+                padding=(1, 2),
+            )
+        )
+
+
 def get_user_selections():
     """Get all user selections before starting the analysis display."""
     # Display ASCII art welcome message
@@ -839,11 +858,20 @@ def run_analysis():
         init_agent_state = graph.propagator.create_initial_state(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+        args = graph.propagator.get_graph_args(stream_tokens=True)
 
         # Stream the analysis
         trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
+        for mode, chunk in graph.stream(init_agent_state, **args):
+            if mode == "messages":
+                # Token from an agent that is still generating
+                if message_buffer.token_stream.feed(chunk):
+                    update_analysis_panel(layout)
+                continue
+
+            # A node finished and its output is now in the state
+            message_buffer.token_stream.finish()
+
             if len(chunk["messages"]) > 0:
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
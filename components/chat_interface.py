@@ -7,6 +7,7 @@ import streamlit as st
 from langchain_openai import ChatOpenAI
 from tradingagents.agents.trader.chat_trader import create_chat_trader
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.http_clients import openai_chat_http_kwargs
 
 
 def render_chat_interface(state_mgr, openai_api_key: str):
@@ -66,7 +67,8 @@ def render_chat_interface(state_mgr, openai_api_key: str):
                 model=llm_config["deep_think_llm"],
                 temperature=0.7,
                 openai_api_key=openai_api_key,
-                base_url=llm_config["backend_url"]  # 使用OpenRouter URL
+                base_url=llm_config["backend_url"],  # 使用OpenRouter URL
+                **openai_chat_http_kwargs(llm_config["backend_url"], openai_api_key),
             )
 
             # 创建聊天交易员
@@ -3,8 +3,12 @@
 执行单资产和多资产的市场分析
 """
 
+import asyncio
+
 import streamlit as st
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.registry import get_trading_graph
+from tradingagents.graph.event_loop import iter_sync
+from tradingagents.graph.streaming import TokenStream
 from tradingagents.default_config import DEFAULT_CONFIG
 from utils.asset_classifier import AssetClassifier
 
@@ -64,6 +68,10 @@ class AnalysisExecutor:
         """
         asset_type = self.asset_classifier.detect_asset_type(ticker)
 
+        # 实时显示正在生成的智能体输出，只重绘这一个占位区域
+        live_title = st.empty()
+        live_output = st.empty()
+
         with st.spinner(f"AI智能体团队正在分析 {ticker} ({asset_type})... 这可能需要几分钟。"):
             try:
                 config = self.build_trading_config(
@@ -72,10 +80,21 @@ class AnalysisExecutor:
 
                 # 根据资产类型选择分析师
                 selected_analysts = self.asset_classifier.get_analysts_for_asset(asset_type)
-                ta = TradingAgentsGraph(debug=False, config=config, selected_analysts=selected_analysts)
-
-                state, decision = ta.propagate(ticker, analysis_date)
-
+                ta = get_trading_graph(selected_analysts, debug=False, config=config)
+
+                token_stream = TokenStream()
+                state = decision = None
+                for event in ta.propagate_stream(ticker, analysis_date):
+                    if event[0] == "result":
+                        _, state, decision = event
+                        continue
+                    _, node, text = event
+                    if token_stream.add(node, text):
+                        live_title.caption(f"正在生成：{node}")
+                        live_output.markdown(token_stream.tail())
+
+                live_title.empty()
+                live_output.empty()
                 st.success(f"{ticker} ({asset_type}) 分析完成。")
 
                 return {
@@ -111,35 +130,54 @@ class AnalysisExecutor:
         progress_bar = st.progress(0)
         status_text = st.empty()
 
-        for i, ticker in enumerate(tickers):
+        config = self.build_trading_config(
+            llm_provider, deep_think_llm, quick_think_llm, max_debate_rounds=1
+        )
+
+        # 按分析师组合分组，每组只构建一次图，组内资产并发执行
+        asset_types = {}
+        groups = {}
+        for ticker in tickers:
             asset_type = self.asset_classifier.detect_asset_type(ticker)
-            status_text.text(f"正在分析 {ticker} ({asset_type})... {i+1}/{len(tickers)}")
+            asset_types[ticker] = asset_type
+            selected_analysts = tuple(self.asset_classifier.get_analysts_for_asset(asset_type))
+            groups.setdefault(selected_analysts, []).append(ticker)
 
+        batches = []
+        for selected_analysts, group_tickers in groups.items():
             try:
-                config = self.build_trading_config(
-                    llm_provider, deep_think_llm, quick_think_llm, max_debate_rounds=1
-                )
-
-                # 根据资产类型选择分析师
-                selected_analysts = self.asset_classifier.get_analysts_for_asset(asset_type)
-                ta = TradingAgentsGraph(debug=False, config=config, selected_analysts=selected_analysts)
-
-                state, decision = ta.propagate(ticker, analysis_date)
+                ta = get_trading_graph(list(selected_analysts), debug=False, config=config)
+                batches.append((ta, group_tickers))
+            except Exception as e:
+                for ticker in group_tickers:
+                    results[ticker] = {
+                        "asset_type": asset_types[ticker],
+                        "error": str(e),
+                        "status": "error"
+                    }
+
+        status_text.text(f"正在并发分析 {len(tickers)} 个资产...")
+        for result in iter_sync(self._astream_batches(batches, analysis_date)):
+            ticker = result["ticker"]
+            if result["status"] == "success":
                 results[ticker] = {
-                    "asset_type": asset_type,
-                    "state": state,
-                    "decision": decision,
+                    "asset_type": asset_types[ticker],
+                    "state": result["state"],
+                    "decision": result["decision"],
                     "status": "success"
                 }
-
-            except Exception as e:
+            else:
                 results[ticker] = {
-                    "asset_type": asset_type,
-                    "error": str(e),
+                    "asset_type": asset_types[ticker],
+                    "error": result["error"],
                     "status": "error"
                 }
 
-            progress_bar.progress((i + 1) / len(tickers))
+            status_text.text(f"{ticker} ({asset_types[ticker]}) 分析完成 {len(results)}/{len(tickers)}")
+            progress_bar.progress(len(results) / len(tickers))
+
+        # 按输入顺序整理结果
+        results = {ticker: results[ticker] for ticker in tickers if ticker in results}
 
         status_text.text("多资产分析完成！")
 
@@ -151,6 +189,28 @@ class AnalysisExecutor:
 
         return results
 
+    async def _astream_batches(self, batches: list, analysis_date: str):
+        """
+        并发执行所有分组的批量分析，按完成顺序产出结果
+
+        Args:
+            batches: (TradingAgentsGraph, 资产代码列表) 元组列表
+            analysis_date: 分析日期
+        """
+        queue = asyncio.Queue()
+
+        async def drain(ta, group_tickers):
+            async for result in ta.apropagate_batch(group_tickers, analysis_date):
+                await queue.put(result)
+
+        tasks = [asyncio.create_task(drain(ta, group_tickers)) for ta, group_tickers in batches]
+        try:
+            for _ in range(sum(len(group_tickers) for _, group_tickers in batches)):
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def _render_multi_analysis_summary(self, results: dict):
         """渲染多资产分析摘要"""
         st.subheader("📊 决策摘要")
@@ -172,56 +172,31 @@ class LearningRecordManager:
             预览结果字典，包含每个collection将删除的记录信息
         """
         try:
-            from tradingagents.agents.utils.memory import FinancialSituationMemory
-            import chromadb
-            from chromadb.config import Settings
-
-            # 获取ChromaDB客户端
-            persist_directory = config.get("memory_persist_dir",
-                                          Path(config.get("project_dir", ".")) / "memory_db")
-            chroma_client = chromadb.PersistentClient(
-                path=str(persist_directory),
-                settings=Settings(allow_reset=True)
-            )
-
-            memory_components = [
-                "bull_memory",
-                "bear_memory",
-                "trader_memory",
-                "invest_judge_memory",
-                "risk_manager_memory"
-            ]
+            from tradingagents.agents.utils.memory_store import get_memory_store
 
-            preview_results = {}
+            # 与交易图共享同一个 ChromaDB 客户端
+            found = get_memory_store(config).get_where({"decision_id": decision_id})
 
-            for memory_name in memory_components:
-                try:
-                    collection = chroma_client.get_collection(name=memory_name)
-
-                    # 通过decision_id查询记录
-                    results = collection.get(
-                        where={"decision_id": decision_id},
-                        include=["metadatas", "documents"]
-                    )
-
-                    if results and results['ids']:
-                        preview_results[memory_name] = {
-                            "count": len(results['ids']),
-                            "ids": results['ids'],
-                            "sample_text": results['documents'][0][:200] + "..." if results['documents'] else ""
-                        }
-                    else:
-                        preview_results[memory_name] = {
-                            "count": 0,
-                            "ids": [],
-                            "sample_text": ""
-                        }
+            preview_results = {}
 
-                except Exception as e:
+            for memory_name, results in found.items():
+                if "error" in results:
                     preview_results[memory_name] = {
                         "count": 0,
                         "ids": [],
-                        "error": str(e)
+                        "error": results["error"]
+                    }
+                elif results['ids']:
+                    preview_results[memory_name] = {
+                        "count": len(results['ids']),
+                        "ids": results['ids'],
+                        "sample_text": results['documents'][0][:200] + "..." if results['documents'] else ""
+                    }
+                else:
+                    preview_results[memory_name] = {
+                        "count": 0,
+                        "ids": [],
+                        "sample_text": ""
                     }
 
             return {
@@ -249,58 +224,11 @@ class LearningRecordManager:
             删除结果字典
         """
         try:
-            import chromadb
-            from chromadb.config import Settings
-
-            # 获取ChromaDB客户端
-            persist_directory = config.get("memory_persist_dir",
-                                          Path(config.get("project_dir", ".")) / "memory_db")
-            chroma_client = chromadb.PersistentClient(
-                path=str(persist_directory),
-                settings=Settings(allow_reset=True)
-            )
-
-            memory_components = [
-                "bull_memory",
-                "bear_memory",
-                "trader_memory",
-                "invest_judge_memory",
-                "risk_manager_memory"
-            ]
-
-            deletion_results = {}
-            total_deleted = 0
-
-            for memory_name in memory_components:
-                try:
-                    collection = chroma_client.get_collection(name=memory_name)
-
-                    # 通过decision_id查询记录
-                    results = collection.get(
-                        where={"decision_id": decision_id}
-                    )
-
-                    if results and results['ids']:
-                        # 删除找到的记录
-                        collection.delete(ids=results['ids'])
-                        deleted_count = len(results['ids'])
-                        total_deleted += deleted_count
-
-                        deletion_results[memory_name] = {
-                            "deleted": deleted_count,
-                            "ids": results['ids']
-                        }
-                    else:
-                        deletion_results[memory_name] = {
-                            "deleted": 0,
-                            "ids": []
-                        }
+            from tradingagents.agents.utils.memory_store import get_memory_store
 
-                except Exception as e:
-                    deletion_results[memory_name] = {
-                        "deleted": 0,
-                        "error": str(e)
-                    }
+            # 一次遍历删除所有角色集合中该决策的记录
+            deletion_results = get_memory_store(config).delete_where({"decision_id": decision_id})
+            total_deleted = sum(r.get("deleted", 0) for r in deletion_results.values())
 
             return {
                 "success": True,
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TradingAgentsGraph Throughput Benchmark
+
+Runs propagate end-to-end against the offline mock LLM backend
+(llm_provider "mock", see tradingagents/graph/mock_llm.py) and reports runs/sec
+and the orchestration overhead of every node: node wall time minus the time
+spent inside its (simulated) LLM and tool calls, i.e. state copying, prompt
+building, tool dispatch, memory lookups and logging.
+
+With the default zero latency the numbers are pure framework overhead; pass
+--latency-mean/--tool-latency-mean to see how it behaves under realistic waits.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to sys.path to allow imports from tradingagents
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def latency_spec(distribution: str, mean: float, stddev: float) -> Dict[str, Any]:
+    if distribution == "uniform":
+        return {"distribution": "uniform", "min": max(0.0, mean - stddev), "max": mean + stddev}
+    return {"distribution": distribution, "mean": mean, "stddev": stddev}
+
+
+def node_overheads(timeline: Dict[str, Any]) -> Dict[str, List[float]]:
+    """Per node path, the wall time of each node span not spent in LLM or tool calls."""
+    spans = timeline.get("spans", [])
+    # LLM and tool spans carry the namespace and superstep of the node they ran in
+    node_ids = {
+        (span["ns"], span["step"], span["node"]): span["id"]
+        for span in spans if span["kind"] == "node"
+    }
+    waited: Dict[str, float] = {}
+    for span in spans:
+        if span["kind"] not in ("llm", "tool") or span.get("duration") is None:
+            continue
+        node_id = node_ids.get((span["ns"], span["step"], span["node"]))
+        if node_id is not None:
+            waited[node_id] = waited.get(node_id, 0.0) + span["duration"]
+
+    overheads: Dict[str, List[float]] = {}
+    for span in spans:
+        if span["kind"] != "node" or span.get("duration") is None:
+            continue
+        path = span.get("path") or span["name"]
+        overhead = max(0.0, span["duration"] - waited.get(span["id"], 0.0))
+        overheads.setdefault(path, []).append(overhead)
+    return overheads
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    work_dir = Path(tempfile.mkdtemp(prefix="tradingagents_bench_"))
+    # Run logs and timelines are written relative to the working directory
+    os.chdir(work_dir)
+
+    config = DEFAULT_CONFIG.copy()
+    config.update({
+        "llm_provider": "mock",
+        "memory_persist_dir": str(work_dir / "memory_db"),
+        "data_cache_dir": str(work_dir / "data_cache"),
+        "parallel_analysts": args.parallel_analysts,
+        "max_debate_rounds": args.debate_rounds,
+        "max_risk_discuss_rounds": args.debate_rounds,
+        "timeline_enabled": True,
+        "mock_llm": {
+            "latency": latency_spec(args.latency_distribution, args.latency_mean, args.latency_stddev),
+            "tool_latency": latency_spec(args.latency_distribution, args.tool_latency_mean, args.tool_latency_stddev),
+            "tool_calls_per_turn": args.tool_calls_per_turn,
+            "seed": args.seed,
+        },
+    })
+    graph = TradingAgentsGraph(args.analysts.split(","), config=config)
+
+    # Warm-up run: imports, prompt templates, Chroma collections
+    graph.propagate(f"{args.ticker}WARM", args.date)
+
+    # Distinct tickers so every run keeps its own timeline file
+    tickers = [f"{args.ticker}{i:03d}" for i in range(args.runs)]
+    started = time.perf_counter()
+    results = list(graph.propagate_batch(tickers, args.date, max_concurrency=args.concurrency))
+    wall = time.perf_counter() - started
+    failed = [r for r in results if r["status"] != "success"]
+
+    run_durations = []
+    overheads: Dict[str, List[float]] = {}
+    durations: Dict[str, List[float]] = {}
+    totals = {"llm_calls": 0, "tool_calls": 0}
+    for ticker in tickers:
+        path = work_dir / "eval_results" / ticker / "TradingAgentsStrategy_logs" / f"timeline_{args.date}.json"
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            timeline = json.load(f)
+        run_durations.append(timeline["duration"])
+        for key in totals:
+            totals[key] += timeline["summary"]["totals"][key]
+        for node, values in node_overheads(timeline).items():
+            overheads.setdefault(node, []).extend(values)
+        for span in timeline["spans"]:
+            if span["kind"] == "node" and span.get("duration") is not None:
+                durations.setdefault(span.get("path") or span["name"], []).append(span["duration"])
+
+    nodes = {
+        node: {
+            "calls": len(values),
+            "mean_duration": statistics.mean(durations.get(node, [0.0])),
+            "mean_overhead": statistics.mean(values),
+            "p95_overhead": percentile(values, 95),
+            "total_overhead": sum(values),
+        }
+        for node, values in overheads.items()
+    }
+    return {
+        "runs": len(results),
+        "failed": len(failed),
+        "concurrency": args.concurrency,
+        "wall_seconds": wall,
+        "runs_per_sec": len(results) / wall if wall else 0.0,
+        "p50_run_seconds": percentile(run_durations, 50),
+        "p95_run_seconds": percentile(run_durations, 95),
+        "llm_calls_per_run": totals["llm_calls"] / max(1, len(run_durations)),
+        "tool_calls_per_run": totals["tool_calls"] / max(1, len(run_durations)),
+        "overhead_per_run": sum(n["total_overhead"] for n in nodes.values()) / max(1, len(run_durations)),
+        "nodes": nodes,
+        "work_dir": str(work_dir),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 78)
+    print("TradingAgentsGraph benchmark (mock LLM backend)")
+    print("=" * 78)
+    print(f"Runs:              {report['runs']} ({report['failed']} failed), concurrency {report['concurrency']}")
+    print(f"Wall time:         {report['wall_seconds']:.2f}s")
+    print(f"Throughput:        {report['runs_per_sec']:.2f} runs/sec")
+    print(f"Run latency:       p50 {report['p50_run_seconds']:.3f}s, p95 {report['p95_run_seconds']:.3f}s")
+    print(f"Calls per run:     {report['llm_calls_per_run']:.1f} LLM, {report['tool_calls_per_run']:.1f} tool")
+    print(f"Overhead per run:  {report['overhead_per_run'] * 1000:.1f}ms summed over nodes")
+    print("-" * 78)
+    print(f"{'Node':<44}{'calls':>6}{'mean ms':>10}{'ovh ms':>9}{'p95 ovh':>9}")
+    ordered = sorted(report["nodes"].items(), key=lambda item: -item[1]["total_overhead"])
+    for node, stats in ordered:
+        print(
+            f"{node[:43]:<44}{stats['calls']:>6}{stats['mean_duration'] * 1000:>10.1f}"
+            f"{stats['mean_overhead'] * 1000:>9.1f}{stats['p95_overhead'] * 1000:>9.1f}"
+        )
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TradingAgentsGraph orchestration overhead offline")
+    parser.add_argument("--runs", type=int, default=10, help="Number of measured runs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Runs in flight at once")
+    parser.add_argument("--analysts", default="market,social,news,fundamentals",
+                        help="Comma-separated analysts to include")
+    parser.add_argument("--ticker", default="MOCK", help="Ticker prefix for the runs")
+    parser.add_argument("--date", default="2024-05-10", help="Trade date")
+    parser.add_argument("--debate-rounds", type=int, default=1, help="Investment and risk debate rounds")
+    parser.add_argument("--parallel-analysts", action="store_true", help="Run the analysts concurrently")
+    parser.add_argument("--latency-distribution", default="fixed",
+                        choices=["fixed", "uniform", "normal", "lognormal"],
+                        help="Distribution of simulated LLM and tool latency")
+    parser.add_argument("--latency-mean", type=float, default=0.0, help="Mean LLM latency (seconds)")
+    parser.add_argument("--latency-stddev", type=float, default=0.0, help="LLM latency stddev (seconds)")
+    parser.add_argument("--tool-latency-mean", type=float, default=0.0, help="Mean tool latency (seconds)")
+    parser.add_argument("--tool-latency-stddev", type=float, default=0.0, help="Tool latency stddev (seconds)")
+    parser.add_argument("--tool-calls-per-turn", type=int, default=1, help="Tool calls per analyst turn")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the scripted outputs and latencies")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+
+    args = parser.parse_args()
+    if args.json_path:
+        args.json_path = os.path.abspath(args.json_path)
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"[INFO] Report written to {args.json_path}")
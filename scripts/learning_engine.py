@@ -28,7 +28,7 @@ from dotenv import load_dotenv
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.registry import get_trading_graph
 from tradingagents.agents.utils.paradex_tools import ParadexDataManager
 
 # --- Configuration ---
@@ -115,7 +115,7 @@ async def main():
 
         # 4. Instantiate the Agent Graph for its components
         print("\n[STEP 3] Initializing Agent components (Reflector & Memory)...")
-        trading_agents_graph = TradingAgentsGraph()
+        trading_agents_graph = get_trading_graph()
         print("[SUCCESS] Agent components initialized.")
 
         # 5. Process Each New Fill
@@ -232,7 +232,7 @@ async def manual_learning(decision_log_path: str, pnl_value: float, user_notes:
 
         # Initialize trading graph
         print("\n[STEP 1] Initializing Agent components...")
-        trading_agents_graph = TradingAgentsGraph()
+        trading_agents_graph = get_trading_graph()
         print("[SUCCESS] Agent components initialized.")
 
         # Execute reflection
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chunk-Index Stored Memories
+
+Situations stored before chunked memory indexing (memory_chunking_enabled) are
+only matched by their whole-situation vector. This script embeds their chunks
+and adds them to each role's <role>_chunks collection, once, instead of doing it
+whenever a TradingAgentsGraph is built (memory_chunk_reindex_on_start).
+
+Situations whose chunks cannot be embedded stay unindexed; run the script again
+to retry them. The exit status is 1 while any situation is still unindexed.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from tradingagents
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory_store import MEMORY_ROLES
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+def migrate(config, roles=MEMORY_ROLES) -> int:
+    """Chunk-index every role's unindexed situations and return how many remain."""
+    remaining = 0
+    for role in roles:
+        memory = FinancialSituationMemory(role, config)
+
+        def progress(done, total, role=role):
+            print(f"\r  {role}: embedded {done}/{total} chunks", end="", flush=True)
+
+        left = memory.build_chunk_index(progress=progress)
+        print(f"\r  {role}: {left} situation(s) still unindexed" + " " * 20)
+        remaining += left
+    return remaining
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunk-index situations stored before chunked memory indexing")
+    parser.add_argument("--memory-dir", help="Memory persist directory (default: config memory_persist_dir)")
+    parser.add_argument("--roles", default=",".join(MEMORY_ROLES), help="Comma-separated memory collections")
+    args = parser.parse_args()
+
+    config = dict(DEFAULT_CONFIG)
+    if args.memory_dir:
+        config["memory_persist_dir"] = args.memory_dir
+    if not config.get("memory_chunking_enabled", True):
+        print("memory_chunking_enabled is off; nothing to do")
+        sys.exit(0)
+
+    roles = [role.strip() for role in args.roles.split(",") if role.strip()]
+    sys.exit(1 if migrate(config, roles) else 0)
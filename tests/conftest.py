@@ -0,0 +1,43 @@
+import pytest
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.mock_llm import MockChatModel
+
+
+@pytest.fixture
+def mock_config(tmp_path, monkeypatch):
+    """Offline config for the in-repo mock LLM provider, with all stores and caches under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    config = dict(DEFAULT_CONFIG)
+    config.update(
+        llm_provider="mock",
+        mock_llm={
+            "latency": {"distribution": "fixed", "mean": 0.0},
+            "tool_latency": None,
+            "report_chars": 400,
+            "tool_output_chars": 400,
+        },
+        results_dir=str(tmp_path / "results"),
+        data_cache_dir=str(tmp_path / "data_cache"),
+        memory_persist_dir=str(tmp_path / "memory_db"),
+        checkpoint_db_path=str(tmp_path / "checkpoints.sqlite"),
+        embedding_cache_path=None,
+    )
+    return config
+
+
+@pytest.fixture
+def mock_llm_calls(monkeypatch):
+    """Count mock LLM calls, record their prompts and fail the call numbered ``calls["fail_at"]``."""
+    calls = {"count": 0, "prompts": [], "fail_at": None}
+    reply = MockChatModel._reply
+
+    def counted(self, messages, rng, tools):
+        calls["count"] += 1
+        calls["prompts"].append("\n\n".join(str(message.content) for message in messages))
+        if calls["count"] == calls["fail_at"]:
+            raise RuntimeError("provider outage")
+        return reply(self, messages, rng, tools)
+
+    monkeypatch.setattr(MockChatModel, "_reply", counted)
+    return calls
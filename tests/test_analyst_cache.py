@@ -0,0 +1,70 @@
+import json
+import os
+import time
+
+from tradingagents.agents.utils.analyst_cache import AnalystReportCache
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def _totals(ticker, trade_date):
+    path = f"eval_results/{ticker}/TradingAgentsStrategy_logs/timeline_{trade_date}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["summary"]["totals"]
+
+
+def test_key_covers_model_and_prompt_version():
+    key = AnalystReportCache.make_key("news", "btcusdt", "2024-05-10", "gpt-4o-mini", "v1")
+    assert key == AnalystReportCache.make_key("news", "BTCUSDT", "2024-05-10", "gpt-4o-mini", "v1")
+    assert key != AnalystReportCache.make_key("news", "BTCUSDT", "2024-05-10", "gpt-4o", "v1")
+    assert key != AnalystReportCache.make_key("news", "BTCUSDT", "2024-05-10", "gpt-4o-mini", "v2")
+    assert key != AnalystReportCache.make_key("news", "BTCUSDT", "2024-05-11", "gpt-4o-mini", "v1")
+    assert key != AnalystReportCache.make_key("market", "BTCUSDT", "2024-05-10", "gpt-4o-mini", "v1")
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = AnalystReportCache(str(tmp_path), ttl={"news": 60})
+    cache.put("news", "fresh", "report", [])
+    cache.put("news", "old", "report", [])
+    path = os.path.join(str(tmp_path), "news", "old.json")
+    with open(path, encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["created_at"] = time.time() - 120
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    past = time.time() - 120
+    os.utime(path, (past, past))
+
+    assert cache.get("news", "fresh")["report"] == "report"
+    assert not cache.contains("news", "old")
+    assert cache.get("news", "old") is None
+    assert not os.path.exists(path)
+    assert cache.stats == {"hits": 1, "misses": 0, "stale": 1}
+
+
+def test_second_run_reuses_analyst_reports(mock_config):
+    config = {**mock_config, "analyst_cache_enabled": True}
+    graph = TradingAgentsGraph(["market", "news"], config=config)
+
+    first, _ = graph.propagate("BTCUSDT", "2024-05-10")
+    first_totals = _totals("BTCUSDT", "2024-05-10")
+    second, decision = graph.propagate("BTCUSDT", "2024-05-10")
+    second_totals = _totals("BTCUSDT", "2024-05-10")
+
+    assert decision == "LONG"
+    assert second["market_report"] == first["market_report"]
+    assert second["news_report"] == first["news_report"]
+    assert graph.graph_setup.analyst_cache.stats["hits"] == 2
+    # Neither analyst called its LLM or its tools again
+    assert second_totals["tool_calls"] == 0
+    assert second_totals["llm_calls"] < first_totals["llm_calls"]
+
+
+def test_cache_misses_for_another_model(mock_config):
+    config = {**mock_config, "analyst_cache_enabled": True}
+    TradingAgentsGraph(["news"], config=config).propagate("BTCUSDT", "2024-05-10")
+
+    graph = TradingAgentsGraph(["news"], config={**config, "quick_think_llm": "other-mini"})
+    graph.propagate("BTCUSDT", "2024-05-10")
+
+    assert graph.graph_setup.analyst_cache.stats["hits"] == 0
+    assert _totals("BTCUSDT", "2024-05-10")["tool_calls"] > 0
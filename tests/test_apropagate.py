@@ -0,0 +1,50 @@
+import asyncio
+import json
+from datetime import datetime
+
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+TICKERS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def _timeline(ticker, trade_date):
+    path = f"eval_results/{ticker}/TradingAgentsStrategy_logs/timeline_{trade_date}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_concurrent_runs_keep_their_own_state(mock_config):
+    config = {
+        **mock_config,
+        "mock_llm": {**mock_config["mock_llm"], "latency": {"distribution": "fixed", "mean": 0.02}},
+    }
+    graph = TradingAgentsGraph(["market", "news"], config=config)
+
+    async def run_all():
+        return await asyncio.gather(*(graph.apropagate(ticker, "2024-05-10") for ticker in TICKERS))
+
+    results = asyncio.run(run_all())
+
+    for ticker, (state, decision) in zip(TICKERS, results):
+        assert decision == "LONG"
+        assert state["company_of_interest"] == ticker
+        assert state["market_report"] and state["news_report"]
+        assert state["final_trade_decision"]
+        with open(f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_2024-05-10.json") as f:
+            assert json.load(f)["company_of_interest"] == ticker
+
+    # The runs overlapped on the loop instead of running one after another
+    windows = []
+    for ticker in TICKERS:
+        timeline = _timeline(ticker, "2024-05-10")
+        start = datetime.fromisoformat(timeline["started_at"]).timestamp()
+        windows.append((start, start + timeline["duration"]))
+    assert max(start for start, _ in windows) < min(end for _, end in windows)
+
+
+def test_propagate_reuses_the_shared_loop(mock_config):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    for ticker in TICKERS[:2]:
+        state, decision = graph.propagate(ticker, "2024-05-10")
+        assert decision == "LONG"
+        assert state["company_of_interest"] == ticker
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from tradingagents.graph.checkpointing import RUN_COMPLETED, RUN_FAILED, get_checkpoint_store
+from tradingagents.graph.event_loop import run_sync
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+@pytest.fixture
+def checkpoint_config(mock_config):
+    return {**mock_config, "checkpoint_enabled": True}
+
+
+def test_failed_run_resumes_from_last_checkpoint(checkpoint_config, mock_llm_calls):
+    graph = TradingAgentsGraph(["market"], config=checkpoint_config)
+    graph.propagate("BTCUSDT", "2024-05-10")
+    full_run_calls = mock_llm_calls["count"]
+
+    mock_llm_calls.update(count=0, fail_at=full_run_calls - 2)
+    with pytest.raises(RuntimeError, match="provider outage"):
+        graph.propagate("ETHUSDT", "2024-05-10")
+    decision_id = graph.last_decision_id
+    run = run_sync(graph.checkpoint_store.aget_run(decision_id))
+    assert run["status"] == RUN_FAILED
+    assert run["ticker"] == "ETHUSDT"
+
+    mock_llm_calls.update(count=0, fail_at=None)
+    state, decision = graph.resume(decision_id)
+
+    assert decision == "LONG"
+    assert state["company_of_interest"] == "ETHUSDT"
+    assert state["market_report"]
+    # Only the failed node and the ones after it were run again
+    assert mock_llm_calls["count"] <= 3
+    assert run_sync(graph.checkpoint_store.aget_run(decision_id))["status"] == RUN_COMPLETED
+    with pytest.raises(ValueError, match="already completed"):
+        graph.resume(decision_id)
+
+
+def test_resume_errors(mock_config, checkpoint_config):
+    with pytest.raises(RuntimeError, match="Checkpointing is disabled"):
+        TradingAgentsGraph(["market"], config=mock_config).resume("missing")
+    with pytest.raises(ValueError, match="No checkpointed run"):
+        TradingAgentsGraph(["market"], config=checkpoint_config).resume("missing")
+
+
+def test_prune_by_age_and_count(checkpoint_config):
+    store = get_checkpoint_store(checkpoint_config)
+
+    async def record(decision_ids, updated_at):
+        for decision_id in decision_ids:
+            await store.astart_run(decision_id, "BTCUSDT", "2024-05-10")
+            async with store.saver.lock:
+                await store.saver.conn.execute(
+                    "UPDATE propagate_runs SET updated_at = ? WHERE decision_id = ?",
+                    (updated_at, decision_id),
+                )
+                await store.saver.conn.commit()
+
+    async def setup():
+        await record(["old"], time.time() - 10 * 86400)
+        for offset, decision_id in enumerate(["a", "b", "c"]):
+            await record([decision_id], time.time() - 60 + offset)
+
+    run_sync(setup())
+    assert store.prune(retention_days=7, max_runs=2) == 2
+    remaining = {run["decision_id"] for run in store.list_runs()}
+    assert remaining == {"b", "c"}
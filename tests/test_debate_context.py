@@ -0,0 +1,66 @@
+import asyncio
+
+from tradingagents.agents.utils.debate_context import DebateContext, estimate_tokens, split_turns
+from tradingagents.graph.mock_llm import MockChatModel
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def _history(n_turns, words=20):
+    speakers = ["Bullish Analyst", "Bearish Analyst"]
+    return "".join(
+        f"\n{speakers[i % 2]}: turn {i} " + " ".join(["argument"] * words) for i in range(n_turns)
+    )
+
+
+def _render(context, history, reserved_tokens=0):
+    return asyncio.run(context.arender(history, reserved_tokens))
+
+
+def test_short_history_is_kept_verbatim(mock_llm_calls):
+    context = DebateContext(MockChatModel(report_chars=200), keep_turns=4)
+    history = _history(4)
+    assert _render(context, history) == history
+    assert mock_llm_calls["count"] == 0
+
+
+def test_older_turns_are_summarized_incrementally(mock_llm_calls):
+    context = DebateContext(MockChatModel(report_chars=200), keep_turns=4)
+
+    rendered = _render(context, _history(8))
+    turns = split_turns(_history(8))
+    assert rendered.startswith("【此前辩论摘要】")
+    assert rendered.endswith("\n".join(turns[4:]))
+    assert turns[3] not in rendered
+    assert mock_llm_calls["count"] == 1
+
+    # One more turn only merges the newly evicted turn into the cached summary
+    _render(context, _history(9))
+    assert mock_llm_calls["count"] == 2
+    prompt = mock_llm_calls["prompts"][-1]
+    assert "turn 4 " in prompt and "turn 3 " not in prompt
+
+    # The same history again is served from the summary cache
+    _render(context, _history(9))
+    assert mock_llm_calls["count"] == 2
+
+
+def test_history_fits_the_token_budget(mock_llm_calls):
+    context = DebateContext(
+        MockChatModel(report_chars=200), keep_turns=4, token_budget=1000, min_history_tokens=150
+    )
+    history = _history(8, words=40)
+    assert estimate_tokens(history) > 150
+
+    rendered = _render(context, history, reserved_tokens=900)
+    assert estimate_tokens(rendered) <= 150
+    # Turns were moved into the summary until the rest fit, newest turn last
+    assert rendered.endswith(split_turns(history)[-1])
+
+
+def test_graph_summarizes_long_debates(mock_config, mock_llm_calls):
+    config = {**mock_config, "max_debate_rounds": 3, "debate_context_enabled": True, "debate_keep_turns": 2}
+    state, decision = TradingAgentsGraph(["market"], config=config).propagate("BTCUSDT", "2024-05-10")
+
+    assert decision == "LONG"
+    assert state["investment_debate_state"]["count"] == 6
+    assert any(prompt.startswith("请将辩论内容压缩为简明的要点摘要") for prompt in mock_llm_calls["prompts"])
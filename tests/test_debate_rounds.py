@@ -0,0 +1,23 @@
+import pytest
+
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+@pytest.mark.parametrize("parallel_risk_opening", [False, True])
+def test_configured_debate_rounds_are_run(mock_config, parallel_risk_opening):
+    config = {
+        **mock_config,
+        "max_debate_rounds": 2,
+        "max_risk_discuss_rounds": 2,
+        "parallel_risk_opening": parallel_risk_opening,
+    }
+    graph = TradingAgentsGraph(["market"], config=config)
+    assert graph.conditional_logic.max_debate_rounds == 2
+    assert graph.conditional_logic.max_risk_discuss_rounds == 2
+
+    state, _ = graph.propagate("BTCUSDT", "2024-05-10")
+    debate = state["investment_debate_state"]
+    assert debate["count"] == 4
+    assert debate["bull_history"].count("Bullish Analyst:") == 2
+    assert debate["bear_history"].count("Bearish Analyst:") == 2
+    assert state["risk_debate_state"]["count"] == 6
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from tradingagents.agents.utils.embedding_cache import EmbeddingCache
+
+
+def _vector(text):
+    return [float(len(text)), 1.0]
+
+
+def test_concurrent_batches_embed_each_text_once():
+    cache = EmbeddingCache()
+    release = threading.Event()
+    requested = []
+    lock = threading.Lock()
+
+    def embed(texts):
+        with lock:
+            requested.extend(texts)
+        release.wait(5)
+        return [_vector(text) for text in texts]
+
+    texts = ["alpha", "beta", "gamma"]
+    results = []
+
+    def call():
+        results.append(cache.get_or_embed_many("model", texts, embed))
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while cache.stats["shared"] < 5 * len(texts):
+        assert time.time() < deadline, "waiters never joined the flight"
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(requested) == sorted(texts)
+    assert results == [[_vector(text) for text in texts]] * 6
+
+
+def test_duplicates_in_one_batch_share_the_request():
+    cache = EmbeddingCache()
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [_vector(text) for text in texts]
+
+    assert cache.get_or_embed_many("model", ["a", "bb", "a"], embed) == [_vector("a"), _vector("bb"), _vector("a")]
+    assert calls == [["a", "bb"]]
+    cache.get_or_embed_many("model", ["bb", "ccc"], embed)
+    assert calls[-1] == ["ccc"]
+
+
+def test_failed_vectors_are_not_cached_and_waiters_get_none():
+    cache = EmbeddingCache()
+    assert cache.get_or_embed_many("model", ["a", "b"], lambda texts: [None, _vector("b")]) == [None, _vector("b")]
+    assert cache.get_or_embed_many("model", ["a"], lambda texts: [_vector("a")]) == [_vector("a")]
+
+
+def test_embed_error_releases_waiters():
+    cache = EmbeddingCache()
+
+    def embed(texts):
+        raise RuntimeError("embedding service down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_embed_many("model", ["a"], embed)
+    assert not cache._inflight
+    assert cache.get_or_embed_many("model", ["a"], lambda texts: [_vector("a")]) == [_vector("a")]
+
+
+def test_namespaces_are_separate_and_lru_evicts():
+    cache = EmbeddingCache(max_entries=2)
+    cache.get_or_embed_many("m1", ["a", "b"], lambda texts: [[1.0], [2.0]])
+    assert cache.get_or_embed_many("m2", ["a"], lambda texts: [[9.0]]) == [[9.0]]
+    # m1:a 最久未使用，已被淘汰
+    assert cache.get_or_embed_many("m1", ["a"], lambda texts: [[3.0]]) == [[3.0]]
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    EmbeddingCache(path=path).get_or_embed("model", "alpha", lambda: [0.25, -1.5])
+
+    reopened = EmbeddingCache(path=path)
+    assert reopened.get_or_embed("model", "alpha", lambda: None) == [0.25, -1.5]
+    assert reopened.stats["disk_hits"] == 1
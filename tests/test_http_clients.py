@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+import pytest
+
+from tradingagents.dataflows.http_clients import (
+    LoopLocalAsyncClient,
+    close_http_clients,
+    get_async_http_client,
+    get_http_client,
+    get_openai_client,
+    openai_chat_http_kwargs,
+)
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+BASE_URL = "https://api.example.com/v1"
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    close_http_clients()
+    yield
+    close_http_clients()
+
+
+def test_clients_are_shared_per_url_and_key():
+    client = get_http_client(BASE_URL, "key-a")
+    assert get_http_client(BASE_URL, "key-a") is client
+    assert get_http_client(BASE_URL, "key-b") is not client
+    assert get_http_client("https://other.example.com/v1", "key-a") is not client
+    assert get_async_http_client(BASE_URL, "key-a") is get_async_http_client(BASE_URL, "key-a")
+
+
+def test_openai_client_uses_the_environment_key_pool(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "env-key")
+    client = get_openai_client(BASE_URL)
+    assert client is get_openai_client(BASE_URL, "env-key")
+    assert client._client is get_http_client(BASE_URL, "env-key")
+
+    monkeypatch.setenv("OPENAI_API_KEY", "rotated-key")
+    assert get_openai_client(BASE_URL) is not client
+
+
+def test_chat_models_share_the_embedding_pool(mock_config, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "env-key")
+    kwargs = openai_chat_http_kwargs(BASE_URL)
+    assert kwargs["http_client"] is get_openai_client(BASE_URL)._client
+
+    config = {**mock_config, "llm_provider": "openai", "backend_url": BASE_URL}
+    graph = TradingAgentsGraph(["market"], config=config)
+    assert graph.quick_thinking_llm.root_client._client is kwargs["http_client"]
+    assert graph.deep_thinking_llm.root_async_client._client is kwargs["http_async_client"]
+
+
+def test_async_client_keeps_a_pool_per_event_loop():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"ok": True})
+
+    client = LoopLocalAsyncClient(transport=httpx.MockTransport(handler))
+
+    async def fetch():
+        response = await client.get(f"{BASE_URL}/models")
+        return response.json(), client._client_for_loop()
+
+    # Each asyncio.run is a new loop; the pool of the first loop is not reused on the second
+    first_result, first_pool = asyncio.run(fetch())
+    second_result, second_pool = asyncio.run(fetch())
+    assert first_result == second_result == {"ok": True}
+    assert first_pool is not second_pool
+    assert requests == ["/v1/models", "/v1/models"]
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+import tradingagents.agents.utils.paradex_tools as paradex_tools
+from tradingagents.agents.utils.judge_cascade import (
+    JudgeCascade,
+    paradex_position_stakes,
+    parse_confidence,
+)
+
+
+class _Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, prompt, config=None):
+        self.calls += 1
+        return _Reply(self.content)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("决策：做多\n置信度：0.9", 0.9),
+        ("Confidence: 85%", 0.85),
+        ("**置信度**: 80", 0.8),
+        ("confidence: 1.5", 0.015),
+        ("置信度：0.2 ... 修正后 置信度：0.7", 0.7),
+        ("没有给出置信度", None),
+        ("", None),
+    ],
+)
+def test_parse_confidence(text, expected):
+    if expected is None:
+        assert parse_confidence(text) is None
+    else:
+        assert parse_confidence(text) == pytest.approx(expected)
+
+
+def _run(cascade, ticker="BTCUSDT"):
+    return asyncio.run(cascade.ainvoke("research_manager", "prompt", ticker))
+
+
+def _cascade(draft, stakes_fn=None):
+    quick, deep = _FakeLLM(draft), _FakeLLM("deep decision")
+    cascade = JudgeCascade(
+        quick, deep, min_confidence=0.75, max_position_usd=10000, max_leverage=5, stakes_fn=stakes_fn
+    )
+    return cascade, quick, deep
+
+
+def test_confident_draft_is_kept():
+    cascade, quick, deep = _cascade("做多\n置信度：0.9", stakes_fn=lambda ticker: None)
+    assert _run(cascade).content.startswith("做多")
+    assert (quick.calls, deep.calls) == (1, 0)
+    assert cascade.stats["escalations"] == 0
+
+
+@pytest.mark.parametrize("draft", ["做多\n置信度：0.5", "做多"])
+def test_low_or_missing_confidence_escalates(draft):
+    cascade, _, deep = _cascade(draft)
+    assert _run(cascade).content == "deep decision"
+    assert deep.calls == 1
+
+
+@pytest.mark.parametrize(
+    "stakes",
+    [{"notional": 50000.0, "leverage": 2.0}, {"notional": 100.0, "leverage": 10.0}],
+)
+def test_risky_position_escalates(stakes):
+    cascade, _, deep = _cascade("做多\n置信度：0.9", stakes_fn=lambda ticker: stakes)
+    _run(cascade)
+    assert deep.calls == 1
+
+
+class _UnusedManager:
+    def get_positions_summary(self):
+        raise AssertionError("Paradex should not be queried")
+
+
+@pytest.mark.parametrize("ticker, configured", [("BTCUSDT", False), ("AAPL", True)])
+def test_no_stakes_check_without_paradex_or_for_non_crypto(monkeypatch, ticker, configured):
+    monkeypatch.setattr(paradex_tools, "paradex_configured", lambda: configured)
+    monkeypatch.setattr(paradex_tools, "get_paradex_manager", lambda: _UnusedManager())
+    assert paradex_position_stakes(ticker) is None
+
+    cascade, _, deep = _cascade("做多\n置信度：0.9", stakes_fn=paradex_position_stakes)
+    _run(cascade, ticker)
+    assert deep.calls == 0
+
+
+def test_paradex_configured_requires_credentials(monkeypatch):
+    monkeypatch.setattr(paradex_tools, "_paradex_py_available", True)
+    monkeypatch.setenv("PARADEX_ADDR", "0xabc")
+    monkeypatch.delenv("PARADEX_KEY", raising=False)
+    assert not paradex_tools.paradex_configured()
+    monkeypatch.setenv("PARADEX_KEY", "0xkey")
+    assert paradex_tools.paradex_configured()
+    monkeypatch.setattr(paradex_tools, "_paradex_py_available", False)
+    assert not paradex_tools.paradex_configured()
+
+
+def test_failed_position_lookup_escalates(monkeypatch):
+    class _DownManager:
+        def get_positions_summary(self):
+            return {"error": "获取持仓信息失败: timeout"}
+
+    monkeypatch.setattr(paradex_tools, "paradex_configured", lambda: True)
+    monkeypatch.setattr(paradex_tools, "get_paradex_manager", lambda: _DownManager())
+    with pytest.raises(RuntimeError):
+        paradex_position_stakes("BTCUSDT")
+
+    cascade, _, deep = _cascade("做多\n置信度：0.9", stakes_fn=paradex_position_stakes)
+    _run(cascade)
+    assert deep.calls == 1
+
+
+def test_position_stakes_for_matching_market(monkeypatch):
+    class _Manager:
+        def get_positions_summary(self):
+            return {
+                "success": True,
+                "positions": [
+                    {"market": "BTC-USD-PERP", "size": "-0.5", "mark_price": "60000", "leverage": "3"},
+                    {"market": "ETH-USD-PERP", "size": "10", "mark_price": "3000", "leverage": "8"},
+                ],
+            }
+
+    monkeypatch.setattr(paradex_tools, "paradex_configured", lambda: True)
+    monkeypatch.setattr(paradex_tools, "get_paradex_manager", lambda: _Manager())
+    assert paradex_position_stakes("BTCUSDT") == {"notional": 30000.0, "leverage": 3.0}
+    assert paradex_position_stakes("SOLUSDT") is None
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from tradingagents.dataflows.llm_cache import LLMCacheMissError, SQLiteLLMCache, get_llm_cache
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite"), max_bytes=350)
+    for key in ("a", "b", "c"):
+        cache.put_text(key, "x" * 100)
+        time.sleep(0.01)
+    assert cache.get_text("a") is not None
+    time.sleep(0.01)
+
+    cache.put_text("d", "x" * 100)
+
+    assert cache.stats["evicted"] == 1
+    assert cache.get_text("b") is None
+    assert all(cache.get_text(key) is not None for key in ("a", "c", "d"))
+    assert cache.size_bytes() == 300
+
+
+def test_replay_miss_raises(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    SQLiteLLMCache(path).put_text("known", "cached")
+
+    cache = SQLiteLLMCache(path, replay=True)
+    assert cache.get_text("known") == "cached"
+    with pytest.raises(LLMCacheMissError):
+        cache.get_text("unknown")
+
+
+def test_graph_replays_cached_responses(mock_config, mock_llm_calls):
+    config = {**mock_config, "llm_cache_enabled": True}
+    first, _ = TradingAgentsGraph(["market"], config=config).propagate("BTCUSDT", "2024-05-10")
+    recorded = mock_llm_calls["count"]
+    assert recorded > 0
+
+    replay_config = {**config, "llm_cache_replay": True}
+    second, decision = TradingAgentsGraph(["market"], config=replay_config).propagate("BTCUSDT", "2024-05-10")
+
+    assert mock_llm_calls["count"] == recorded
+    assert decision == "LONG"
+    assert second["final_trade_decision"] == first["final_trade_decision"]
+    assert get_llm_cache(replay_config).stats["misses"] == 0
+
+    with pytest.raises(LLMCacheMissError):
+        TradingAgentsGraph(["market"], config=replay_config).propagate("BTCUSDT", "2024-05-11")
+    assert mock_llm_calls["count"] == recorded
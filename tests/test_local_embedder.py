@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils.local_embedder import HashingEmbedder, get_local_embedder
+
+
+@pytest.fixture
+def embedder():
+    return HashingEmbedder(dimensions=256)
+
+
+def test_vectors_are_unit_length(embedder):
+    vectors = np.asarray(embedder.embed(["BTC 突破 70000 美元", "Fed holds rates steady"]))
+    assert vectors.shape == (2, 256)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+
+def test_empty_and_short_texts_give_zero_vectors(embedder):
+    vectors = np.asarray(embedder.embed(["", "   ", "a"]))
+    assert vectors.shape == (3, 256)
+    assert not vectors[:2].any()
+    # 单个字符没有字符 n-gram，但仍有词特征
+    assert np.isclose(np.linalg.norm(vectors[2]), 1.0, atol=1e-5)
+
+
+def test_empty_batch(embedder):
+    assert embedder.embed([]) == []
+
+
+def test_deterministic_and_batch_independent(embedder):
+    texts = ["ETH funding rate turns negative", "RSI 超买，成交量萎缩", "eth FUNDING   rate turns negative"]
+    batch = embedder.embed(texts)
+    assert batch == [embedder.embed([text])[0] for text in texts]
+    # 大小写和空白归一化
+    assert np.allclose(batch[0], batch[2])
+    assert HashingEmbedder(dimensions=256).embed(texts) == batch
+
+
+def test_similar_texts_score_higher(embedder):
+    query, near, far = embedder.embed([
+        "Bitcoin rallies as ETF inflows accelerate",
+        "Bitcoin rallies on strong ETF inflows",
+        "Oil prices slump after OPEC meeting",
+    ])
+    assert np.dot(query, near) > np.dot(query, far)
+
+
+def test_get_local_embedder_shares_instances():
+    config = {"embedding_backend": "hashing", "embedding_local_dimensions": 128}
+    assert get_local_embedder(config) is get_local_embedder(dict(config))
+    assert get_local_embedder(config).dimensions == 128
+    assert get_local_embedder({"embedding_backend": "remote"}) is None
+    with pytest.raises(ValueError):
+        get_local_embedder({"embedding_backend": "onnx"})
@@ -0,0 +1,176 @@
+import pytest
+
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory_store import MEMORY_ROLES, MemoryStore, get_memory_store
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        **DEFAULT_CONFIG,
+        "embedding_backend": "hashing",
+        "embedding_cache_enabled": False,
+        "memory_persist_dir": str(tmp_path / "memory_db"),
+    }
+
+
+@pytest.fixture
+def store(config):
+    return MemoryStore(config["memory_persist_dir"])
+
+
+def test_ids_are_not_reused_after_deletion(config, store):
+    memory = FinancialSituationMemory("bull_memory", config, store)
+    assert memory.add_situations([("situation A", "advice A")], extra_metadata={"decision_id": "d1"}) == 1
+    assert memory.add_situations([("situation B", "advice B")], extra_metadata={"decision_id": "d2"}) == 1
+    store.delete_where({"decision_id": "d1"}, roles=["bull_memory"])
+
+    assert memory.add_situations([("situation C", "advice C")], extra_metadata={"decision_id": "d3"}) == 1
+    stored = memory.situation_collection.get(include=["metadatas"])
+    assert sorted(m["recommendation"] for m in stored["metadatas"]) == ["advice B", "advice C"]
+
+
+def test_situations_without_embedding_are_not_counted(config, store):
+    memory = FinancialSituationMemory("bear_memory", config, store)
+    assert memory.add_situations([("situation A", "advice A"), ("   ", "advice B")]) == 1
+    assert memory.situation_collection.count() == 1
+
+
+def _legacy_memory(config, store, name="trader_memory"):
+    legacy = FinancialSituationMemory(name, {**config, "memory_chunking_enabled": False}, store)
+    legacy.add_situations([
+        ("Bitcoin funding negative, shorts crowded, liquidations rising", "short squeeze risk"),
+        ("Emerging market currency stress and a strong dollar", "hedge fx"),
+    ])
+    return FinancialSituationMemory(name, config, store)
+
+
+def test_unindexed_situations_are_recalled_when_migration_fails(config, store):
+    memory = _legacy_memory(config, store)
+    memory._request_embeddings = lambda texts: [None] * len(texts)
+    assert memory.build_chunk_index() == 2
+    del memory._request_embeddings
+
+    matches = memory.get_memories("Bitcoin shorts crowded, liquidations rising", n_matches=1)
+    assert [m["recommendation"] for m in matches] == ["short squeeze risk"]
+    # A later migration step retries the failed situations
+    assert memory.build_chunk_index() == 0
+    assert memory._chunk_collection().count() == 2
+
+
+def test_queries_do_not_run_the_migration(config, store):
+    memory = _legacy_memory(config, store, name="risk_manager_memory")
+    memory.get_memories("strong dollar", n_matches=2)
+    assert memory._chunk_collection().count() == 0
+    assert len(memory.get_memories("strong dollar", n_matches=2)) == 2
+
+
+def test_mixed_indexed_and_unindexed_situations(config, store):
+    memory = _legacy_memory(config, store, name="invest_judge_memory")
+    memory.add_situations([("Tech sector volatility with institutional selling", "reduce tech")])
+    matches = memory.get_memories("institutional selling in tech", n_matches=3)
+    assert {m["recommendation"] for m in matches} == {"reduce tech", "short squeeze risk", "hedge fx"}
+    assert matches[0]["recommendation"] == "reduce tech"
+
+
+@pytest.mark.parametrize("pooling, expected", [("mean", "moderate everywhere"), ("max", "strong once")])
+def test_chunk_pooling_scores_every_query_chunk(config, store, pooling, expected):
+    config = {**config, "memory_chunk_chars": 5, "memory_chunk_overlap": 0,
+              "memory_chunk_candidates": 1, "memory_chunk_pooling": pooling}
+    third = 3 ** -0.5
+    vectors = {
+        "qa": [1.0, 0.0, 0.0], "qb": [0.0, 1.0, 0.0], "qc": [0.0, 0.0, 1.0],
+        "sa": [1.0, 0.0, 0.0],
+        "mm": [third, third, third],
+    }
+    memory = FinancialSituationMemory("bull_memory", config, store)
+    memory._request_embeddings = lambda texts: [vectors[text] for text in texts]
+    memory.add_situations([("sa", "strong once"), ("mm", "moderate everywhere")])
+
+    # "strong once" is the only top hit of qa, "moderate everywhere" of qb and qc; pooling
+    # over just those hits would score "strong once" 1.0 under either mode
+    matches = memory.get_memories("qa\n\nqb\n\nqc", n_matches=1)
+    assert [m["recommendation"] for m in matches] == [expected]
+    expected_score = {"mean": 2 * third - 1, "max": 1.0}[pooling]
+    assert matches[0]["similarity_score"] == pytest.approx(expected_score, abs=1e-5)
+
+
+def test_graph_build_does_not_reindex_by_default(mock_config, monkeypatch):
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    def fail(self, progress=None):
+        raise AssertionError("chunk index built in the constructor")
+
+    monkeypatch.setattr(FinancialSituationMemory, "build_chunk_index", fail)
+    TradingAgentsGraph(["market"], config=mock_config)
+
+
+def test_switching_to_another_vector_size_fails_clearly(config, store):
+    FinancialSituationMemory("bull_memory", config, store).add_situations([("situation A", "advice A")])
+
+    with pytest.raises(ValueError, match="512-dimensional.*separate memory_persist_dir"):
+        FinancialSituationMemory("bull_memory", {**config, "embedding_local_dimensions": 256}, store)
+
+
+def test_backend_without_known_size_is_checked_on_first_vector(config, store):
+    FinancialSituationMemory("bear_memory", config, store).add_situations([("situation A", "advice A")])
+    remote = FinancialSituationMemory("bear_memory", {**config, "embedding_backend": "remote", "embedding_api_key": "test"}, store)
+    remote._request_embedding = lambda text: [0.1] * 1024
+    remote._request_embeddings = lambda texts: [[0.1] * 1024 for _ in texts]
+
+    for query in (lambda: remote.get_memories("situation A"),
+                  lambda: remote.add_situations([("situation B", "advice B")])):
+        with pytest.raises(ValueError, match="1024-dimensional"):
+            query()
+    assert remote.situation_collection.count() == 1
+
+
+def test_deleted_unindexed_situations_are_not_queried(config, store):
+    legacy = FinancialSituationMemory("trader_memory", {**config, "memory_chunking_enabled": False}, store)
+    legacy.add_situations([("Bitcoin shorts crowded", "short squeeze risk")], extra_metadata={"decision_id": "d1"})
+    legacy.add_situations([("Strong dollar, weak emerging markets", "hedge fx")], extra_metadata={"decision_id": "d2"})
+    memory = FinancialSituationMemory("trader_memory", config, store)
+    assert len(memory.get_memories("Bitcoin shorts", n_matches=2)) == 2
+
+    result = store.delete_where({"decision_id": "d1"}, roles=["trader_memory"])
+    assert result["trader_memory"]["deleted"] == 1
+    assert result["trader_memory"]["ids"][0] not in memory._unindexed_ids()
+
+    matches = memory.get_memories("Bitcoin shorts", n_matches=2)
+    assert [m["recommendation"] for m in matches] == ["hedge fx"]
+    assert memory.build_chunk_index() == 0
+
+
+def test_memories_share_one_store_per_directory(config, tmp_path):
+    first = FinancialSituationMemory("bull_memory", config)
+    second = FinancialSituationMemory("bear_memory", config)
+    assert first.store is second.store is get_memory_store(config)
+    assert first.chroma_client is second.chroma_client
+
+    other = {**config, "memory_persist_dir": str(tmp_path / "other_db")}
+    assert FinancialSituationMemory("bull_memory", other).store is not first.store
+
+
+def test_delete_where_spans_roles_and_chunks(config, store):
+    memories = {role: FinancialSituationMemory(role, config, store) for role in MEMORY_ROLES[:3]}
+    for role, memory in memories.items():
+        memory.add_situations(
+            [("Bitcoin funding negative, shorts crowded. Liquidations rising.", f"{role} lesson")],
+            extra_metadata={"decision_id": "d1"},
+        )
+        memory.add_situations([("Strong dollar, weak emerging markets", "hedge fx")], extra_metadata={"decision_id": "d2"})
+    assert memories["bull_memory"]._chunk_collection().get(where={"decision_id": "d1"})["ids"]
+
+    result = store.delete_where({"decision_id": "d1"}, roles=MEMORY_ROLES)
+
+    for role, memory in memories.items():
+        assert result[role]["deleted"] == 1
+        assert result[role]["chunks_deleted"] >= 1
+        assert not memory._chunk_collection().get(where={"decision_id": "d1"})["ids"]
+        matches = memory.get_memories("Bitcoin shorts crowded", n_matches=2)
+        assert [m["recommendation"] for m in matches] == ["hedge fx"]
+    # Roles that never stored anything report an error instead of creating a collection
+    for role in MEMORY_ROLES[3:]:
+        assert result[role]["deleted"] == 0 and "error" in result[role]
+    assert store.get_where({"decision_id": "d2"}, roles=MEMORY_ROLES[:3])["bear_memory"]["ids"]
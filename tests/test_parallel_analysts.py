@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+REPORTS = ["market_report", "sentiment_report", "news_report", "fundamentals_report"]
+BRANCHES = ["Market Analyst", "Social Analyst", "News Analyst", "Fundamentals Analyst"]
+
+
+def _timeline(ticker, trade_date):
+    path = f"eval_results/{ticker}/TradingAgentsStrategy_logs/timeline_{trade_date}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("parallel_analysts", [False, True])
+def test_every_analyst_report_is_merged(mock_config, parallel_analysts):
+    config = {**mock_config, "parallel_analysts": parallel_analysts}
+    graph = TradingAgentsGraph(ANALYSTS, config=config)
+
+    state, decision = graph.propagate("BTCUSDT", "2024-05-10")
+
+    assert decision == "LONG"
+    for report in REPORTS:
+        assert state[report].strip()
+    assert len({state[report] for report in REPORTS}) == len(REPORTS)
+
+
+def test_analyst_branches_run_concurrently(mock_config):
+    config = {
+        **mock_config,
+        "parallel_analysts": True,
+        "mock_llm": {**mock_config["mock_llm"], "latency": {"distribution": "fixed", "mean": 0.05}},
+    }
+    graph = TradingAgentsGraph(ANALYSTS, config=config)
+    graph.propagate("BTCUSDT", "2024-05-10")
+
+    spans = {
+        span["path"]: span
+        for span in _timeline("BTCUSDT", "2024-05-10")["spans"]
+        if span["kind"] == "node" and span["path"] in BRANCHES
+    }
+    assert set(spans) == set(BRANCHES)
+    # Every branch starts before any of them has finished
+    assert max(span["start"] for span in spans.values()) < min(span["end"] for span in spans.values())
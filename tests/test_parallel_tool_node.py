@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from tradingagents.agents.utils import tool_monitor
+from tradingagents.agents.utils.tool_executor import ParallelToolNode
+from tradingagents.agents.utils.tool_monitor import ToolMonitor
+
+
+@tool
+async def fast_quote(symbol: str) -> str:
+    """Return a quote."""
+    await asyncio.sleep(0.05)
+    return f"{symbol} 100"
+
+
+@tool
+async def slow_news(symbol: str) -> str:
+    """Return news after a long wait."""
+    await asyncio.sleep(5)
+    return "late news"
+
+
+@tool
+def blocking_depth(symbol: str) -> str:
+    """Return order book depth from a blocking client."""
+    time.sleep(0.15)
+    return f"{symbol} depth"
+
+
+@tool
+def broken_feed(symbol: str) -> str:
+    """Fail like a data source that is down."""
+    raise ValueError("feed down")
+
+
+TOOLS = [fast_quote, slow_news, blocking_depth, broken_feed]
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monitor = ToolMonitor(str(tmp_path / "tool_logs"))
+    monkeypatch.setattr(tool_monitor, "_global_monitor", monitor)
+    return monitor
+
+
+def _turn(*names):
+    return {
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": {"symbol": "BTCUSDT"}, "id": f"call_{index}", "type": "tool_call"}
+                    for index, name in enumerate(names)
+                ],
+            )
+        ]
+    }
+
+
+def test_tool_calls_of_a_turn_run_concurrently(monitor):
+    node = ParallelToolNode(TOOLS, timeout=2)
+    started = time.perf_counter()
+    result = asyncio.run(node.ainvoke(_turn("fast_quote", "blocking_depth", "blocking_depth", "blocking_depth")))
+    elapsed = time.perf_counter() - started
+
+    contents = [message.content for message in result["messages"]]
+    assert contents == ["BTCUSDT 100", "BTCUSDT depth", "BTCUSDT depth", "BTCUSDT depth"]
+    assert elapsed < 0.4
+    assert monitor.get_stats("blocking_depth")["successful_calls"] == 3
+
+
+def test_slow_tool_times_out_without_failing_the_turn(monitor):
+    node = ParallelToolNode(TOOLS, timeout=0.3)
+    started = time.perf_counter()
+    result = asyncio.run(node.ainvoke(_turn("fast_quote", "slow_news")))
+    elapsed = time.perf_counter() - started
+
+    quote, news = result["messages"]
+    assert quote.content == "BTCUSDT 100" and quote.status == "success"
+    assert news.status == "error" and "timed out" in news.content
+    assert news.tool_call_id == "call_1"
+    assert elapsed < 1
+
+    stats = monitor.get_stats("slow_news")
+    assert stats["failed_calls"] == 1
+    assert "timed out" in stats["error_messages"][-1]["message"]
+    assert monitor.get_stats("fast_quote")["successful_calls"] == 1
+
+
+def test_tool_errors_are_recorded(monitor):
+    node = ParallelToolNode(TOOLS, timeout=1)
+    (message,) = asyncio.run(node.ainvoke(_turn("broken_feed")))["messages"]
+    assert message.status == "error"
+    assert monitor.get_stats("broken_feed")["failed_calls"] == 1
+
+    # The sync path records calls too
+    (message,) = node.invoke(_turn("blocking_depth"))["messages"]
+    assert message.content == "BTCUSDT depth"
+    assert monitor.get_stats("blocking_depth")["total_calls"] == 1
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from tradingagents.agents.managers.risk_manager import RISK_MANAGER_INSTRUCTIONS
+from tradingagents.agents.researchers.bear_researcher import BEAR_RESEARCHER_INSTRUCTIONS
+from tradingagents.agents.researchers.bull_researcher import BULL_RESEARCHER_INSTRUCTIONS
+from tradingagents.agents.risk_mgmt.aggresive_debator import RISKY_DEBATOR_INSTRUCTIONS
+from tradingagents.agents.risk_mgmt.conservative_debator import SAFE_DEBATOR_INSTRUCTIONS
+from tradingagents.agents.risk_mgmt.neutral_debator import NEUTRAL_DEBATOR_INSTRUCTIONS
+from tradingagents.agents.trader.trader import TRADER_INSTRUCTIONS
+from tradingagents.agents.utils.agent_utils import compose_prompt
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+INSTRUCTIONS = [
+    BULL_RESEARCHER_INSTRUCTIONS,
+    BEAR_RESEARCHER_INSTRUCTIONS,
+    TRADER_INSTRUCTIONS,
+    RISKY_DEBATOR_INSTRUCTIONS,
+    SAFE_DEBATOR_INSTRUCTIONS,
+    NEUTRAL_DEBATOR_INSTRUCTIONS,
+    RISK_MANAGER_INSTRUCTIONS,
+]
+
+
+def test_compose_prompt_puts_instructions_first():
+    assert compose_prompt("static", "BTCUSDT data") == "static\n\nBTCUSDT data"
+
+
+@pytest.fixture
+def prompts_by_ticker(mock_config, mock_llm_calls):
+    graph = TradingAgentsGraph(["market", "news"], config=mock_config)
+    prompts = {}
+    for ticker in ("BTCUSDT", "ETHUSDT"):
+        mock_llm_calls["prompts"].clear()
+        graph.propagate(ticker, "2024-05-10")
+        prompts[ticker] = list(mock_llm_calls["prompts"])
+    return prompts
+
+
+@pytest.mark.parametrize("instructions", INSTRUCTIONS)
+def test_agent_prompts_start_with_static_instructions(prompts_by_ticker, instructions):
+    assert "BTCUSDT" not in instructions and "2024-05-10" not in instructions
+    for prompts in prompts_by_ticker.values():
+        assert any(prompt.startswith(instructions + "\n\n") for prompt in prompts)
+
+
+def test_prompts_share_a_prefix_across_tickers(prompts_by_ticker):
+    btc, eth = prompts_by_ticker["BTCUSDT"], prompts_by_ticker["ETHUSDT"]
+    assert len(btc) == len(eth)
+    for first, second in zip(btc, eth):
+        prefix = os.path.commonprefix([first, second])
+        assert "BTCUSDT" not in prefix
+        # Every call, analysts included, starts with a sizeable byte-identical prefix
+        assert len(prefix) >= 200
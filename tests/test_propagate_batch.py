@@ -0,0 +1,61 @@
+import asyncio
+
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+TICKERS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"]
+
+
+def test_batch_bounds_runs_in_flight(mock_config, monkeypatch):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    in_flight, peak = 0, 0
+
+    async def fake_apropagate(ticker, trade_date, on_token=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return {"company_of_interest": ticker}, "LONG"
+
+    monkeypatch.setattr(graph, "apropagate", fake_apropagate)
+    results = list(graph.propagate_batch(TICKERS, "2024-05-10", max_concurrency=2))
+
+    assert peak == 2
+    assert sorted(result["ticker"] for result in results) == sorted(TICKERS)
+    assert all(result["status"] == "success" for result in results)
+
+
+def test_batch_reports_failed_tickers_and_keeps_going(mock_config, monkeypatch):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    run = graph.apropagate
+
+    async def flaky_apropagate(ticker, trade_date, on_token=None):
+        if ticker == "ETHUSDT":
+            raise RuntimeError("data source down")
+        return await run(ticker, trade_date)
+
+    monkeypatch.setattr(graph, "apropagate", flaky_apropagate)
+    results = {result["ticker"]: result for result in graph.propagate_batch(TICKERS[:3], "2024-05-10")}
+
+    assert results["ETHUSDT"] == {"ticker": "ETHUSDT", "status": "error", "error": "data source down"}
+    for ticker in ("BTCUSDT", "SOLUSDT"):
+        assert results[ticker]["status"] == "success"
+        assert results[ticker]["decision"] == "LONG"
+        assert results[ticker]["state"]["company_of_interest"] == ticker
+
+
+def test_batch_uses_configured_concurrency(mock_config, monkeypatch):
+    graph = TradingAgentsGraph(["market"], config={**mock_config, "batch_max_concurrency": 3})
+    in_flight, peak = 0, 0
+
+    async def fake_apropagate(ticker, trade_date, on_token=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return {}, "LONG"
+
+    monkeypatch.setattr(graph, "apropagate", fake_apropagate)
+    assert len(list(graph.propagate_batch(TICKERS, "2024-05-10"))) == len(TICKERS)
+    assert peak == 3
@@ -0,0 +1,102 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from tradingagents.dataflows.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    LLMScheduler,
+    ProviderLimiter,
+    backoff_delay,
+    get_llm_scheduler,
+    llm_priority,
+    retry_after_seconds,
+)
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+class _Response:
+    def __init__(self, status_code=429, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _APIError(Exception):
+    def __init__(self, status_code=429, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers)
+
+
+def _flaky(failures, error):
+    calls = {"count": 0}
+
+    def func():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise error
+        return "ok"
+
+    return func, calls
+
+
+def test_retry_after_header_formats():
+    assert retry_after_seconds(_APIError(headers={"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(_APIError(headers={"retry-after-ms": "250"})) == 0.25
+    http_date = formatdate(time.time() + 30, usegmt=True)
+    assert 25 < retry_after_seconds(_APIError(headers={"retry-after": http_date})) <= 30
+    assert retry_after_seconds(_APIError()) is None
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(6):
+        assert 0 <= backoff_delay(attempt, base_delay=0.5, max_delay=4) <= min(4, 0.5 * 2 ** attempt)
+    assert 2 <= backoff_delay(0, retry_after=2, base_delay=0.1) <= 2.1
+    assert backoff_delay(0, retry_after=600, base_delay=0.1, max_delay=5) <= 5.1
+
+
+def test_rate_limited_call_waits_for_retry_after_and_retries():
+    scheduler = LLMScheduler(max_retries=3, base_delay=0.01)
+    func, calls = _flaky(2, _APIError(headers={"retry-after": "0.1"}))
+
+    started = time.monotonic()
+    assert scheduler.call("api.example.com", func) == "ok"
+    elapsed = time.monotonic() - started
+
+    assert calls["count"] == 3
+    assert elapsed >= 0.2
+    assert scheduler.stats()["api.example.com"]["throttled"] == 2
+
+
+def test_other_errors_and_exhausted_retries_are_raised():
+    scheduler = LLMScheduler(max_retries=1, base_delay=0.01)
+
+    func, calls = _flaky(1, _APIError(status_code=500))
+    with pytest.raises(_APIError):
+        scheduler.call("api.example.com", func)
+    assert calls["count"] == 1
+
+    func, calls = _flaky(5, _APIError(headers={"retry-after-ms": "10"}))
+    with pytest.raises(_APIError):
+        scheduler.call("api.example.com", func)
+    assert calls["count"] == 2
+
+
+def test_background_requests_yield_to_waiting_interactive_ones():
+    limiter = ProviderLimiter("api.example.com", check_every=0.05)
+    limiter._set_waiting(INTERACTIVE, 1)
+    with llm_priority(BACKGROUND):
+        assert not limiter.acquire(blocking=False)
+    assert limiter.acquire(blocking=False)
+    limiter._set_waiting(INTERACTIVE, -1)
+    with llm_priority(BACKGROUND):
+        assert limiter.acquire(blocking=False)
+
+
+def test_graph_requests_go_through_the_provider_limiter(mock_config, mock_llm_calls):
+    config = {**mock_config, "rate_limit_enabled": True, "rate_limits": {"default": {"requests_per_minute": 6000}}}
+    TradingAgentsGraph(["market"], config=config).propagate("BTCUSDT", "2024-05-10")
+
+    stats = get_llm_scheduler(config).stats()["default"]
+    assert stats["requests"] == mock_llm_calls["count"]
+    assert stats["tokens"] > 0
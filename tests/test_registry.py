@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from tradingagents.graph import registry
+from tradingagents.graph.registry import GraphRegistry
+
+
+@pytest.fixture
+def counted_builds(monkeypatch):
+    """Record every graph build; builds for a config with "block_build" wait on its event."""
+    builds = []
+    real_graph = registry.TradingAgentsGraph
+
+    def build(selected_analysts, debug=False, config=None):
+        builds.append(config)
+        gate = config.get("block_build")
+        if gate is not None:
+            gate.wait(5)
+        return real_graph(selected_analysts, debug=debug, config=config)
+
+    monkeypatch.setattr(registry, "TradingAgentsGraph", build)
+    return builds
+
+
+def test_warm_hit_reuses_graph(mock_config, counted_builds):
+    graphs = GraphRegistry()
+    first = graphs.get(["market"], config=mock_config)
+    assert graphs.get(["market"], config=dict(mock_config)) is first
+    assert graphs.get(["news"], config=mock_config) is not first
+    assert len(counted_builds) == 2
+
+
+def test_api_key_change_rebuilds_and_drops_stale_graph(mock_config, counted_builds, monkeypatch):
+    graphs = GraphRegistry()
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-old")
+    old = graphs.get(["market"], config=mock_config)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-new")
+    new = graphs.get(["market"], config=mock_config)
+    assert new is not old
+    assert len(graphs) == 1
+    assert graphs.get(["market"], config=mock_config) is new
+    assert len(counted_builds) == 2
+
+
+def test_slow_build_does_not_block_other_graphs(mock_config, counted_builds):
+    graphs = GraphRegistry()
+    warm = graphs.get(["market"], config=mock_config)
+
+    gate = threading.Event()
+    slow_config = {**mock_config, "max_debate_rounds": 2, "block_build": gate}
+    results = []
+    builders = [
+        threading.Thread(target=lambda: results.append(graphs.get(["market"], config=slow_config)))
+        for _ in range(3)
+    ]
+    for thread in builders:
+        thread.start()
+    try:
+        deadline = time.time() + 5
+        while len(counted_builds) < 2:
+            assert time.time() < deadline, "slow build never started"
+            time.sleep(0.005)
+        # The slow build holds no registry lock, so the warm graph is still served
+        started = time.perf_counter()
+        assert graphs.get(["market"], config=mock_config) is warm
+        assert time.perf_counter() - started < 1
+    finally:
+        gate.set()
+        for thread in builders:
+            thread.join()
+
+    # Concurrent misses on one key share a single build
+    assert len(counted_builds) == 2
+    assert len(results) == 3 and all(graph is results[0] for graph in results)
+
+
+def test_failed_build_is_not_cached(mock_config, monkeypatch):
+    graphs = GraphRegistry()
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("build failed")
+
+    monkeypatch.setattr(registry, "TradingAgentsGraph", broken)
+    with pytest.raises(RuntimeError):
+        graphs.get(["market"], config=mock_config)
+    assert len(graphs) == 0 and not graphs._building
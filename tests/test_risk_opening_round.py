@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from tradingagents.agents.risk_mgmt.opening_round import create_risk_opening_round
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def _debater(name, field, delay):
+    async def node(state, config=None):
+        await asyncio.sleep(delay)
+        debate = state["risk_debate_state"]
+        argument = f"{name} Analyst: {name.lower()} view"
+        return {
+            "risk_debate_state": {
+                **debate,
+                f"{field}_history": debate.get(f"{field}_history", "") + "\n" + argument,
+                f"current_{field}_response": argument,
+                "latest_speaker": name,
+                "count": debate["count"] + 1,
+            }
+        }
+
+    return node
+
+
+def test_opening_round_merges_concurrent_arguments_in_turn_order():
+    # Neutral finishes first and Risky last; the merged history is still in turn order
+    node = create_risk_opening_round(
+        _debater("Risky", "risky", 0.15),
+        _debater("Safe", "safe", 0.1),
+        _debater("Neutral", "neutral", 0.05),
+    )
+    state = {"risk_debate_state": {"history": "", "count": 0}}
+
+    started = time.perf_counter()
+    result = asyncio.run(node(state))["risk_debate_state"]
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.25
+    assert result["history"] == "\nRisky Analyst: risky view\nSafe Analyst: safe view\nNeutral Analyst: neutral view"
+    assert result["risky_history"] == "\nRisky Analyst: risky view"
+    assert result["safe_history"] == "\nSafe Analyst: safe view"
+    assert result["neutral_history"] == "\nNeutral Analyst: neutral view"
+    assert result["current_risky_response"] == "Risky Analyst: risky view"
+    assert result["latest_speaker"] == "Neutral"
+    assert result["count"] == 3
+
+
+def test_parallel_opening_matches_sequential_shape(mock_config):
+    states = {}
+    for parallel in (False, True):
+        graph = TradingAgentsGraph(["market"], config={**mock_config, "parallel_risk_opening": parallel})
+        states[parallel], decision = graph.propagate("BTCUSDT", "2024-05-10")
+        assert decision == "LONG"
+
+    for state in states.values():
+        debate = state["risk_debate_state"]
+        assert debate["count"] == 3
+        history = debate["history"]
+        assert history.index("Aggressive Analyst:") < history.index("Conservative Analyst:") < history.index("Neutral Analyst:")
+        assert state["final_trade_decision"]
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows.search_cache import GLOBAL_SCOPE, SearchResultCache
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _run_concurrently(cache, fetch, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(cache.get_or_fetch("global_news", GLOBAL_SCOPE, "2024-05-10", "model", fetch))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_fetch(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "news"
+
+    threads, results, errors = _run_concurrently(cache, fetch, 8)
+    _wait_for(lambda: cache.stats["shared"] == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["news"] * 8 and not errors
+    assert cache.get_or_fetch("global_news", GLOBAL_SCOPE, "2024-05-10", "model", fetch) == "news"
+    assert len(calls) == 1 and cache.stats["hits"] == 1
+
+
+def test_fetch_error_reaches_waiters_and_is_not_cached(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    release = threading.Event()
+
+    def failing_fetch():
+        release.wait(5)
+        raise RuntimeError("search down")
+
+    threads, results, errors = _run_concurrently(cache, failing_fetch, 4)
+    _wait_for(lambda: cache.stats["shared"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not results
+    assert len(errors) == 4 and all(str(e) == "search down" for e in errors)
+    assert cache.get_or_fetch("global_news", GLOBAL_SCOPE, "2024-05-10", "model", lambda: "news") == "news"
+
+
+def test_empty_result_is_not_cached(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    assert cache.get_or_fetch("news", "BTCUSDT", "2024-05-10", "model", lambda: "") == ""
+    assert cache.get_or_fetch("news", "BTCUSDT", "2024-05-10", "model", lambda: "fresh") == "fresh"
+
+
+def test_entries_persist_and_expire(tmp_path, monkeypatch):
+    SearchResultCache(str(tmp_path)).get_or_fetch("news", "BTCUSDT", "2024-05-10", "model", lambda: "old")
+
+    reopened = SearchResultCache(str(tmp_path), ttl=60)
+    assert reopened.get_or_fetch("news", "BTCUSDT", "2024-05-10", "model", lambda: pytest.fail("fetched")) == "old"
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert reopened.get_or_fetch("news", "BTCUSDT", "2024-05-10", "model", lambda: "new") == "new"
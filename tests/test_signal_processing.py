@@ -0,0 +1,66 @@
+import pytest
+
+from tradingagents.graph.signal_processing import _DECISION_MARKER, extract_decision
+
+
+@pytest.mark.parametrize(
+    "text, token",
+    [
+        ("FINAL TRADING PROPOSAL: **LONG**", "LONG"),
+        ("Final Trade Decision：short", "short"),
+        ("最终交易建议：做多", "做多"),
+        ("**最终决策**: 【观望】", "观望"),
+    ],
+)
+def test_marker_captures_token(text, token):
+    match = _DECISION_MARKER.search(text)
+    assert match is not None
+    assert match.group("token") == token
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("FINAL TRADING PROPOSAL: **LONG**", "LONG"),
+        ("FINAL TRADING PROPOSAL: **SELL**", "SHORT"),
+        ("最终交易建议：做空", "SHORT"),
+        ("最终决策：持有", "NEUTRAL"),
+        ("分析……\n最终交易建议：做多\nFINAL TRADING PROPOSAL: **BUY**", "LONG"),
+    ],
+)
+def test_plain_decisions(text, expected):
+    assert extract_decision(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "最终交易建议：暂不做多",
+        "最终交易建议：不做空",
+        "最终决策：避免做多",
+        "最终交易建议：无需做空",
+        "最终建议：谨慎做多",
+        "最终交易建议：不建议做多",
+    ],
+)
+def test_negated_and_hedged_tokens_fall_back(text):
+    assert extract_decision(text) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "最终交易建议：做多或做空",
+        "最终交易建议：做多\nFINAL TRADING PROPOSAL: **SHORT**",
+        "FINAL TRADING PROPOSAL: **NOT** long",
+        "no decision line here",
+        "",
+    ],
+)
+def test_mixed_or_missing_tokens_fall_back(text):
+    assert extract_decision(text) is None
+
+
+def test_template_echo_is_skipped():
+    text = "Answer with FINAL TRADING PROPOSAL: **LONG/NEUTRAL/SHORT**\n\nFINAL TRADING PROPOSAL: **SHORT**"
+    assert extract_decision(text) == "SHORT"
@@ -0,0 +1,31 @@
+from tradingagents.agents.utils.memory import split_situation
+
+
+def test_short_text_is_one_chunk():
+    assert split_situation("market report", max_chars=100) == ["market report"]
+
+
+def test_empty_text_has_no_chunks():
+    assert split_situation("") == []
+    assert split_situation(None) == []
+    assert split_situation("\n\n  \n\n") == []
+
+
+def test_paragraphs_are_packed_up_to_the_limit():
+    paragraphs = ["a" * 40, "b" * 40, "c" * 40]
+    chunks = split_situation("\n\n".join(paragraphs), max_chars=90, overlap=0)
+    assert chunks == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+
+
+def test_long_paragraph_is_windowed_with_overlap():
+    text = "".join(str(i % 10) for i in range(250))
+    chunks = split_situation(text, max_chars=100, overlap=20)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert [len(chunk) for chunk in chunks] == [100, 100, 90]
+    assert chunks[0][-20:] == chunks[1][:20]
+    assert chunks[-1].endswith(text[-10:])
+
+
+def test_long_paragraph_flushes_pending_chunk():
+    chunks = split_situation("short\n\n" + "x" * 150, max_chars=100, overlap=0)
+    assert chunks == ["short", "x" * 100, "x" * 50]
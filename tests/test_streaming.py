@@ -0,0 +1,39 @@
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from tradingagents.graph.streaming import TokenStream, stream_token
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def test_stream_token_extracts_visible_text():
+    metadata = {"langgraph_node": "Trader"}
+    assert stream_token((AIMessageChunk(content="buy"), metadata)) == ("Trader", "buy")
+    blocks = [{"type": "text", "text": "hold"}, {"type": "tool_use", "id": "t", "name": "x", "input": {}}]
+    assert stream_token((AIMessage(content=blocks), metadata)) == ("Trader", "hold")
+    assert stream_token((AIMessageChunk(content=""), metadata)) is None
+    assert stream_token((ToolMessage(content="data", tool_call_id="t"), metadata)) is None
+
+
+def test_token_stream_throttles_repaints():
+    stream = TokenStream(min_interval=60)
+    assert stream.add("Trader", "a")
+    assert not stream.add("Trader", "b")
+    assert stream.text() == "ab"
+    assert stream.tail(1) == "…b"
+    stream.finish()
+    assert stream.node is None and stream.text("Trader") == ""
+
+
+def test_propagate_stream_yields_tokens_then_result(mock_config):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    events = list(graph.propagate_stream("BTCUSDT", "2024-05-10"))
+
+    kind, state, decision = events[-1]
+    assert kind == "result" and decision == "LONG"
+    tokens = events[:-1]
+    assert tokens and all(event[0] == "token" for event in tokens)
+
+    text = {}
+    for _, node, chunk in tokens:
+        text[node] = text.get(node, "") + chunk
+    assert {"Market Analyst", "Bull Researcher", "Trader", "Risk Judge"} <= set(text)
+    assert text["Risk Judge"] == state["final_trade_decision"]
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from tradingagents.graph.timeline import aggregate_timelines
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+def _timeline(ticker, trade_date):
+    path = f"eval_results/{ticker}/TradingAgentsStrategy_logs/timeline_{trade_date}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_run_writes_timeline(mock_config, mock_llm_calls):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    graph.propagate("BTCUSDT", "2024-05-10")
+    timeline = _timeline("BTCUSDT", "2024-05-10")
+
+    assert timeline["decision_id"] == graph.last_decision_id
+    assert timeline["status"] == "success"
+    totals = timeline["summary"]["totals"]
+    assert totals["llm_calls"] == mock_llm_calls["count"]
+    assert totals["tool_calls"] > 0
+    assert totals["prompt_tokens"] > 0 and totals["errors"] == 0
+
+    nodes = timeline["summary"]["nodes"]
+    for node in ("Market Analyst", "Bull Researcher", "Trader", "Risk Judge"):
+        assert nodes[node]["runs"] >= 1
+    assert sum(stats["llm_calls"] for stats in nodes.values()) == totals["llm_calls"]
+    for span in timeline["spans"]:
+        assert span["status"] == "success"
+        assert 0 <= span["start"] <= span["end"] <= timeline["duration"]
+
+
+def test_failed_run_writes_error_timeline(mock_config, mock_llm_calls):
+    mock_llm_calls["fail_at"] = 3
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    with pytest.raises(RuntimeError):
+        graph.propagate("BTCUSDT", "2024-05-10")
+    timeline = _timeline("BTCUSDT", "2024-05-10")
+
+    assert timeline["status"] == "error"
+    assert timeline["summary"]["totals"]["errors"] >= 1
+    assert any("provider outage" in span.get("error", "") for span in timeline["spans"])
+
+
+def test_aggregate_timelines_across_runs(mock_config):
+    graph = TradingAgentsGraph(["market"], config=mock_config)
+    for ticker, trade_date in [("BTCUSDT", "2024-05-10"), ("BTCUSDT", "2024-05-11"), ("ETHUSDT", "2024-05-10")]:
+        graph.propagate(ticker, trade_date)
+    single = _timeline("ETHUSDT", "2024-05-10")["summary"]["totals"]
+
+    report = aggregate_timelines("eval_results")
+    assert report["runs"] == 3
+    assert report["totals"]["llm_calls"] == 3 * single["llm_calls"]
+    assert report["nodes"]["Trader"]["runs"] == 3
+    assert report["nodes"]["Trader"]["p95_duration"] >= report["nodes"]["Trader"]["p50_duration"]
+
+    btc = aggregate_timelines("eval_results", ticker="BTCUSDT")
+    assert btc["runs"] == 2
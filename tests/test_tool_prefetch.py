@@ -0,0 +1,54 @@
+import asyncio
+
+from tradingagents.agents.utils.agent_utils import CryptoAwareToolkit
+from tradingagents.agents.utils.analyst_cache import (
+    AnalystReportCache,
+    create_cache_probe,
+    prompt_version,
+)
+from tradingagents.agents.utils.tool_prefetch import create_prefetch_node, prefetch_tool_calls
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+class _FailingToolNode:
+    async def ainvoke(self, *args, **kwargs):
+        raise AssertionError("prefetch should have been skipped")
+
+
+def _market_analyst(state, config=None):
+    return {}
+
+
+def test_prefetch_skipped_when_report_cached(tmp_path):
+    cache = AnalystReportCache(str(tmp_path))
+    probe = create_cache_probe("market", _market_analyst, cache, "model")
+    state = {"company_of_interest": "BTCUSDT", "trade_date": "2024-05-10", "messages": []}
+    assert not probe(state)
+
+    key = cache.make_key("market", "BTCUSDT", "2024-05-10", "model", prompt_version(_market_analyst))
+    cache.put("market", key, "cached report", [])
+    assert probe(state)
+
+    node = create_prefetch_node("market", toolkit=None, tool_node=_FailingToolNode(), skip=probe)
+    assert asyncio.run(node(state)) == {}
+    # The probe does not count as a cache lookup
+    assert cache.stats["hits"] == 0
+
+
+def test_expired_report_is_not_reported_as_cached(tmp_path):
+    cache = AnalystReportCache(str(tmp_path), ttl={"market": -1})
+    probe = create_cache_probe("market", _market_analyst, cache, "model")
+    key = cache.make_key("market", "AAPL", "2024-05-10", "model", prompt_version(_market_analyst))
+    cache.put("market", key, "old report", [])
+    assert not probe({"company_of_interest": "AAPL", "trade_date": "2024-05-10"})
+
+
+def test_prefetch_call_ids_are_stable():
+    toolkit = CryptoAwareToolkit(config=DEFAULT_CONFIG)
+    first = prefetch_tool_calls("market", "BTCUSDT", "2024-05-10", toolkit)
+    second = prefetch_tool_calls("market", "BTCUSDT", "2024-05-10", toolkit)
+
+    assert first
+    # Identical requests give identical prompts, so response and prefix caches can hit
+    assert [call["id"] for call in first] == [call["id"] for call in second]
+    assert len({call["id"] for call in first}) == len(first)
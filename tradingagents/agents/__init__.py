@@ -13,6 +13,7 @@ from .researchers.bull_researcher import create_bull_researcher
 from .risk_mgmt.aggresive_debator import create_risky_debator
 from .risk_mgmt.conservative_debator import create_safe_debator
 from .risk_mgmt.neutral_debator import create_neutral_debator
+from .risk_mgmt.opening_round import create_risk_opening_round
 
 from .managers.research_manager import create_research_manager
 from .managers.risk_manager import create_risk_manager
@@ -35,6 +36,7 @@ __all__ = [
     "create_neutral_debator",
     "create_news_analyst",
     "create_risky_debator",
+    "create_risk_opening_round",
     "create_risk_manager",
     "create_safe_debator",
     "create_social_media_analyst",
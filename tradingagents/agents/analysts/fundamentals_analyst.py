@@ -4,7 +4,7 @@ import json
 
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    async def fundamentals_analyst_node(state, config=None):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -116,8 +116,9 @@ def create_fundamentals_analyst(llm, toolkit):
                     " 将在您停下的地方提供帮助。执行您能做的以取得进展。"
                     " 如果您或任何其他助手有最终交易建议：**买入/持有/卖出**或可交付成果，"
                     " 请在您的回复前加上 最终交易建议：**买入/持有/卖出**，以便团队知道停止。"
-                    " 您可以访问以下工具：{tool_names}。\n{system_message}"
-                    "供您参考，当前日期是 {current_date}。我们要检查的公司是 {ticker}。",
+                    # 工具列表、日期和标的放在固定指令之后（见 compose_prompt）
+                    "\n{system_message}\n"
+                    "您可以访问以下工具：{tool_names}。供您参考，当前日期是 {current_date}。我们要检查的公司是 {ticker}。",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
             ]
@@ -130,7 +131,7 @@ def create_fundamentals_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config)
 
         report = ""
 
@@ -5,7 +5,7 @@ import json
 
 def create_market_analyst(llm, toolkit):
 
-    def market_analyst_node(state):
+    async def market_analyst_node(state, config=None):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -79,6 +79,7 @@ def create_market_analyst(llm, toolkit):
       - symbol={ticker}
       - source="funding"
 4. 如果某个工具调用失败，记录失败原因但继续执行其他分析
+5. 如果对话中已经有上述工具的结果（系统预取），直接使用这些结果，不要重复调用
 
 **时间范围设定**：
 - 默认使用7天历史数据进行技术分析（加密货币市场变化快速）
@@ -165,6 +166,7 @@ def create_market_analyst(llm, toolkit):
       - atr（波动性）
       - vwma或mfi（成交量相关）
 3. 如果某个工具调用失败，继续执行其他分析，不要停止
+4. 如果对话中已经有上述工具的结果（系统预取），直接使用这些结果，不要重复调用
 
 **时间范围设定**：
 - 默认使用30天历史数据进行技术分析（结束日期：当前交易日期；开始日期：当前日期前30天）。
@@ -295,8 +297,9 @@ def create_market_analyst(llm, toolkit):
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRADING PROPOSAL: **LONG/NEUTRAL/SHORT** or deliverable,"
                     " prefix your response with FINAL TRADING PROPOSAL: **LONG/NEUTRAL/SHORT** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
-                    "For your reference, the current date is {current_date}. The company we want to examine is {ticker}",
+                    # 工具列表、日期和标的放在固定指令之后（见 compose_prompt）
+                    "\n{system_message}\n"
+                    "You have access to the following tools: {tool_names}. For your reference, the current date is {current_date}. The company we want to examine is {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
             ]
@@ -309,7 +312,7 @@ def create_market_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config)
 
         report = ""
 
@@ -4,7 +4,7 @@ import json
 
 
 def create_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+    async def news_analyst_node(state, config=None):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -101,8 +101,9 @@ def create_news_analyst(llm, toolkit):
                     " will help where you left off. Execute what you can to make progress."
                     " If you or any other assistant has the FINAL TRADING PROPOSAL: **LONG/NEUTRAL/SHORT** or deliverable,"
                     " prefix your response with FINAL TRADING PROPOSAL: **LONG/NEUTRAL/SHORT** so the team knows to stop."
-                    " You have access to the following tools: {tool_names}.\n{system_message}"
-                    "For your reference, the current date is {current_date}. We are examining the company {ticker}",
+                    # 工具列表、日期和标的放在固定指令之后（见 compose_prompt）
+                    "\n{system_message}\n"
+                    "You have access to the following tools: {tool_names}. For your reference, the current date is {current_date}. We are examining the company {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
             ]
@@ -114,7 +115,7 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = await chain.ainvoke(state["messages"], config)
 
         report = ""
 
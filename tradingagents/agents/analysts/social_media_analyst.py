@@ -4,7 +4,7 @@ import json
 
 
 def create_social_media_analyst(llm, toolkit):
-    def social_media_analyst_node(state):
+    async def social_media_analyst_node(state, config=None):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -215,8 +215,9 @@ def create_social_media_analyst(llm, toolkit):
                     " 执行你能做的，以取得进展。"
                     " 如果你或任何其他助手有最终交易建议：**买入/持有/卖出**或可交付成果，"
                     " 请在你的回复前加上 最终交易建议：**买入/持有/卖出**，以便团队知道可以停止。"
-                    " 你可以访问以下工具：{tool_names}。\n{system_message}"
-                    "供你参考，当前日期是 {current_date}。我们要分析的当前公司是 {ticker}",
+                    # 工具列表、日期和标的放在固定指令之后（见 compose_prompt）
+                    "\n{system_message}\n"
+                    "你可以访问以下工具：{tool_names}。供你参考，当前日期是 {current_date}。我们要分析的当前公司是 {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
             ]
@@ -230,7 +231,7 @@ def create_social_media_analyst(llm, toolkit):
         chain = prompt | llm.bind_tools(tools)
 
         try:
-            result = chain.invoke(state["messages"])
+            result = await chain.ainvoke(state["messages"], config)
             report = ""
             
             # 处理工具调用结果
@@ -1,9 +1,10 @@
+import asyncio
 import time
 import json
 
 
-def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
+def create_research_manager(llm, memory, cascade=None):
+    async def research_manager_node(state, config=None) -> dict:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -13,7 +14,9 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(
+            memory.get_memories, curr_situation, n_matches=2
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -38,7 +41,13 @@ def create_research_manager(llm, memory):
 以下是辩论内容：
 辩论历史：
 {history}"""
-        response = llm.invoke(prompt)
+        if cascade is not None:
+            # 快速模型起草，置信度不足或持仓风险高时交给深度模型
+            response = await cascade.ainvoke(
+                "Research Manager", prompt, state["company_of_interest"], config
+            )
+        else:
+            response = await llm.ainvoke(prompt, config)
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -1,10 +1,35 @@
 from langchain_core.messages import AIMessage
+import asyncio
 import time
 import json
 
+from ..utils.debate_context import estimate_tokens
+from ..utils.agent_utils import compose_prompt
 
-def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
+
+BEAR_RESEARCHER_INSTRUCTIONS = """**重要提示**：务必使用中文回答，所有分析、报告和决策均应使用中文。
+
+您是一个看跌分析师，负责为不建议建立多头仓位的资产提出充分的反对理由。您的目标是以充分的风险、挑战和负面指标为基础，展示该资产的潜在下行风险，强有力地反驳看涨分析师的观点。
+
+## 重点分析内容：
+
+- **风险与挑战**：突出市场饱和、金融不稳定或宏观经济威胁等因素，强调这些因素可能影响资产表现。
+- **竞争劣势**：分析市场定位较弱、创新能力下降或来自竞争对手的威胁。
+- **负面指标**：基于财务数据、市场趋势或近期的不利新闻提供证据支持。
+- **反驳看涨观点**：批判性地分析看涨分析师的论据，使用具体数据和合理推理，揭示其弱点或过于乐观的假设。
+- **互动辩论**：与看涨分析师的观点进行互动辩论，而不仅仅是列举事实，形成具有说服力的反驳。
+
+## 交易建议格式：
+
+基于下方提供的资源进行分析，得出明确的交易建议，并选择以下之一：
+
+- **做空（SHORT）**：建议做空该资产。
+- **中性（NEUTRAL）**：建议保持中性，不建立仓位。
+- **做多（LONG）**：建议做多该资产（尽管作为看跌分析师，极少给出此建议）。"""
+
+
+def create_bear_researcher(llm, memory, context=None):
+    async def bear_node(state, config=None) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
         bear_history = investment_debate_state.get("bear_history", "")
@@ -16,48 +41,47 @@ def create_bear_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(
+            memory.get_memories, curr_situation, n_matches=2
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""
-
-**重要提示**：务必使用中文回答，所有分析、报告和决策均应使用中文。
-
-您是一个看跌分析师，负责为不建议建立多头仓位的资产提出充分的反对理由。您的目标是以充分的风险、挑战和负面指标为基础，展示该资产的潜在下行风险，强有力地反驳看涨分析师的观点。
-
-## 重点分析内容：
-
-- **风险与挑战**：突出市场饱和、金融不稳定或宏观经济威胁等因素，强调这些因素可能影响资产表现。
-- **竞争劣势**：分析市场定位较弱、创新能力下降或来自竞争对手的威胁。
-- **负面指标**：基于财务数据、市场趋势或近期的不利新闻提供证据支持。
-- **反驳看涨观点**：批判性地分析看涨分析师的论据，使用具体数据和合理推理，揭示其弱点或过于乐观的假设。
-- **互动辩论**：与看涨分析师的观点进行互动辩论，而不仅仅是列举事实，形成具有说服力的反驳。
-
-## 可用资源：
+        # 深度辩论时只保留最近几轮发言原文，更早的发言以摘要形式提供
+        debate_history = history
+        if context is not None:
+            debate_history = await context.arender(
+                history,
+                reserved_tokens=sum(
+                    estimate_tokens(text)
+                    for text in (
+                        market_research_report,
+                        sentiment_report,
+                        news_report,
+                        fundamentals_report,
+                        current_response,
+                        past_memory_str,
+                    )
+                ),
+                config=config,
+            )
+
+        prompt = compose_prompt(
+            BEAR_RESEARCHER_INSTRUCTIONS,
+            f"""## 可用资源：
 
 - 市场研究报告：{market_research_report}
 - 社交媒体情绪报告：{sentiment_report}
 - 最新新闻与全球时事：{news_report}
 - 公司基本面报告：{fundamentals_report}
-- 辩论历史：{history}
-- 最新看涨观点：{current_response}
 - 以往经验教训：{past_memory_str}
+- 辩论历史：{debate_history}
+- 最新看涨观点：{current_response}""",
+        )
 
-## 交易建议格式：
-
-基于您的分析，得出明确的交易建议，并选择以下之一：
-
-- **做空（SHORT）**：建议做空该资产。
-- **中性（NEUTRAL）**：建议保持中性，不建立仓位。
-- **做多（LONG）**：建议做多该资产（尽管作为看跌分析师，极少给出此建议）。
-
-
-"""
-
-        response = llm.invoke(prompt)
+        response = await llm.ainvoke(prompt, config)
 
         argument = f"Bearish Analyst: {response.content}"
 
@@ -1,10 +1,35 @@
 from langchain_core.messages import AIMessage
+import asyncio
 import time
 import json
 
+from ..utils.debate_context import estimate_tokens
+from ..utils.agent_utils import compose_prompt
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+
+BULL_RESEARCHER_INSTRUCTIONS = """**重要提示**：务必使用中文回答，所有分析、报告和决策均应使用中文。
+
+您是一个看涨分析师，主张建立该资产的多头仓位。您的任务是基于增长潜力、竞争优势和积极的市场指标，构建强有力的论据来支持做多，并有效地反驳看跌分析师的观点。
+
+## 重点分析内容：
+
+- **增长潜力**：突出公司市场机会、收入预测和可扩展性。
+- **竞争优势**：强调独特产品、强大品牌或市场主导地位等优势。
+- **积极指标**：利用财务健康状况、行业趋势和近期积极新闻作为证据支持。
+- **反驳看跌观点**：批判性地分析看跌分析师的论点，结合具体数据和有力推理，逐一回应其关切，展示看涨观点更有力的依据。
+- **互动辩论**：通过与看跌分析师的观点进行互动辩论，强化看涨立场，而不仅仅是列举数据。
+
+## 交易建议格式：
+
+基于下方提供的资源进行分析，得出明确的交易建议，选择以下之一：
+
+- **做多（LONG）**：建议做多该资产。
+- **中性（NEUTRAL）**：建议保持中性，不建立仓位。
+- **做空（SHORT）**：建议做空该资产（尽管作为看涨分析师，极少给出此建议）。"""
+
+
+def create_bull_researcher(llm, memory, context=None):
+    async def bull_node(state, config=None) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
         bull_history = investment_debate_state.get("bull_history", "")
@@ -16,48 +41,47 @@ def create_bull_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(
+            memory.get_memories, curr_situation, n_matches=2
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""
-
-**重要提示**：务必使用中文回答，所有分析、报告和决策均应使用中文。
-
-您是一个看涨分析师，主张建立该资产的多头仓位。您的任务是基于增长潜力、竞争优势和积极的市场指标，构建强有力的论据来支持做多，并有效地反驳看跌分析师的观点。
-
-## 重点分析内容：
-
-- **增长潜力**：突出公司市场机会、收入预测和可扩展性。
-- **竞争优势**：强调独特产品、强大品牌或市场主导地位等优势。
-- **积极指标**：利用财务健康状况、行业趋势和近期积极新闻作为证据支持。
-- **反驳看跌观点**：批判性地分析看跌分析师的论点，结合具体数据和有力推理，逐一回应其关切，展示看涨观点更有力的依据。
-- **互动辩论**：通过与看跌分析师的观点进行互动辩论，强化看涨立场，而不仅仅是列举数据。
-
-## 可用资源：
+        # 深度辩论时只保留最近几轮发言原文，更早的发言以摘要形式提供
+        debate_history = history
+        if context is not None:
+            debate_history = await context.arender(
+                history,
+                reserved_tokens=sum(
+                    estimate_tokens(text)
+                    for text in (
+                        market_research_report,
+                        sentiment_report,
+                        news_report,
+                        fundamentals_report,
+                        current_response,
+                        past_memory_str,
+                    )
+                ),
+                config=config,
+            )
+
+        prompt = compose_prompt(
+            BULL_RESEARCHER_INSTRUCTIONS,
+            f"""## 可用资源：
 
 - 市场研究报告：{market_research_report}
 - 社交媒体情绪报告：{sentiment_report}
 - 最新新闻与全球时事：{news_report}
 - 公司基本面报告：{fundamentals_report}
-- 辩论历史：{history}
-- 最新看跌观点：{current_response}
 - 以往经验教训：{past_memory_str}
+- 辩论历史：{debate_history}
+- 最新看跌观点：{current_response}""",
+        )
 
-## 交易建议格式：
-
-基于您的分析，得出明确的交易建议，选择以下之一：
-
-- **做多（LONG）**：建议做多该资产。
-- **中性（NEUTRAL）**：建议保持中性，不建立仓位。
-- **做空（SHORT）**：建议做空该资产（尽管作为看涨分析师，极少给出此建议）。
-
-
-"""
-
-        response = llm.invoke(prompt)
+        response = await llm.ainvoke(prompt, config)
 
         argument = f"Bullish Analyst: {response.content}"
 
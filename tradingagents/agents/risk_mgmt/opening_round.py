@@ -0,0 +1,43 @@
+import asyncio
+
+
+def create_risk_opening_round(risky_node, safe_node, neutral_node):
+    """Run the first round of the risk debate with all three debaters at once.
+
+    In round one nobody has spoken yet, so each debater only needs the trader's plan.
+    The three positions are generated concurrently from the same state and merged
+    as if Risky, Safe and Neutral had spoken in turn, so later rounds continue with
+    the usual turn-taking over the merged history.
+    """
+
+    async def risk_opening_round_node(state, config=None) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+
+        risky, safe, neutral = await asyncio.gather(
+            risky_node(state, config),
+            safe_node(state, config),
+            neutral_node(state, config),
+        )
+        risky_argument = risky["risk_debate_state"]["current_risky_response"]
+        safe_argument = safe["risk_debate_state"]["current_safe_response"]
+        neutral_argument = neutral["risk_debate_state"]["current_neutral_response"]
+
+        history = risk_debate_state.get("history", "")
+        for argument in (risky_argument, safe_argument, neutral_argument):
+            history = history + "\n" + argument
+
+        new_risk_debate_state = {
+            "history": history,
+            "risky_history": risky["risk_debate_state"]["risky_history"],
+            "safe_history": safe["risk_debate_state"]["safe_history"],
+            "neutral_history": neutral["risk_debate_state"]["neutral_history"],
+            "latest_speaker": "Neutral",
+            "current_risky_response": risky_argument,
+            "current_safe_response": safe_argument,
+            "current_neutral_response": neutral_argument,
+            "count": risk_debate_state["count"] + 3,
+        }
+
+        return {"risk_debate_state": new_risk_debate_state}
+
+    return risk_opening_round_node
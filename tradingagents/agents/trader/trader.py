@@ -1,6 +1,9 @@
+import asyncio
 import functools
+import logging
 import time
 import json
+from ..utils.agent_utils import compose_prompt
 from ..utils.paradex_tools import (
     get_paradex_manager, 
     format_positions_for_trader,
@@ -8,9 +11,71 @@ from ..utils.paradex_tools import (
     format_portfolio_insights_for_trader
 )
 
+logger = logging.getLogger(__name__)
 
-def create_trader(llm, memory):
-    def trader_node(state, name):
+
+TRADER_INSTRUCTIONS = """重要提示：务必用中文回复！ 您是一名交易员，负责分析市场数据并做出交易决策。基于您的分析，提供具体的交易建议——做多、做空或中性。做出明确的决策，并在最后使用"FINAL TRADING PROPOSAL: LONG/NEUTRAL/SHORT"确认您的建议。
+
+**决策指导原则：**
+1. 首先考虑当前持仓情况和风险敞口（见下方 Paradex 实际交易数据）
+2. 结合历史交易模式和盈亏情况
+3. 评估新建议与现有投资组合的协同效应
+4. 考虑仓位管理和风险分散
+5. 如果已有相关品种持仓，重点考虑加仓/减仓/平仓策略
+
+同时，回顾过往决策中的经验和教训，从中学习。"""
+
+
+def load_paradex_data() -> str:
+    """获取 Paradex 实时交易数据并格式化为交易员上下文（阻塞调用）"""
+    try:
+        paradex_manager = get_paradex_manager()
+        if paradex_manager is None:
+            raise ValueError("Paradex manager 初始化失败")
+
+        portfolio_overview = paradex_manager.get_portfolio_overview()
+        if not portfolio_overview or not isinstance(portfolio_overview, dict):
+            raise ValueError("获取投资组合数据失败或数据格式错误")
+
+        # 安全地获取各个部分的数据
+        positions_summary = portfolio_overview.get("positions_summary")
+        trading_summary = portfolio_overview.get("trading_summary")
+
+        if positions_summary is None:
+            positions_summary = {}
+            logger.warning("Paradex positions_summary 为空，使用默认值")
+
+        if trading_summary is None:
+            trading_summary = {}
+            logger.warning("Paradex trading_summary 为空，使用默认值")
+
+        positions_text = format_positions_for_trader(positions_summary)
+        history_text = format_trading_history_for_trader(trading_summary)
+        insights_text = format_portfolio_insights_for_trader(portfolio_overview)
+
+        return f"""
+=== 🔴 PARADEX 实际交易数据 ===
+{positions_text}
+
+{history_text}
+
+{insights_text}
+"""
+    except Exception as e:
+        logger.error(f"获取Paradex数据失败: {e}", exc_info=True)
+        return f"\n⚠️ Paradex 数据获取失败: {str(e)}\n请检查：\n1. Paradex API配置是否正确\n2. 网络连接是否正常\n3. API密钥是否有效\n"
+
+
+# 离线（mock）运行时代替 Paradex 数据的交易员上下文
+OFFLINE_PARADEX_DATA = "\n=== PARADEX 实际交易数据 ===\n离线运行，未查询 Paradex 持仓和交易记录。\n"
+
+
+def create_trader(llm, memory, load_portfolio=load_paradex_data):
+    """
+    Args:
+        load_portfolio: 返回 Paradex 交易数据文本的阻塞函数，None 表示离线运行、不查询 Paradex
+    """
+    async def trader_node(state, name, config=None):
         company_name = state.get("company_of_interest", "Unknown")
         investment_plan = state.get("investment_plan", "No plan available")
         market_research_report = state.get("market_report", "")
@@ -19,7 +84,9 @@ def create_trader(llm, memory):
         fundamentals_report = state.get("fundamentals_report", "")
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = await asyncio.to_thread(
+            memory.get_memories, curr_situation, n_matches=2
+        )
 
         past_memory_str = ""
         if past_memories:
@@ -29,43 +96,10 @@ def create_trader(llm, memory):
             past_memory_str = "No past memories found."
         
         # 获取 Paradex 实时交易数据
-        paradex_data_str = ""
-        try:
-            paradex_manager = get_paradex_manager()
-            if paradex_manager is None:
-                raise ValueError("Paradex manager 初始化失败")
-
-            portfolio_overview = paradex_manager.get_portfolio_overview()
-            if not portfolio_overview or not isinstance(portfolio_overview, dict):
-                raise ValueError("获取投资组合数据失败或数据格式错误")
-
-            # 安全地获取各个部分的数据
-            positions_summary = portfolio_overview.get("positions_summary")
-            trading_summary = portfolio_overview.get("trading_summary")
-
-            if positions_summary is None:
-                positions_summary = {}
-                logger.warning("Paradex positions_summary 为空，使用默认值")
-
-            if trading_summary is None:
-                trading_summary = {}
-                logger.warning("Paradex trading_summary 为空，使用默认值")
-
-            positions_text = format_positions_for_trader(positions_summary)
-            history_text = format_trading_history_for_trader(trading_summary)
-            insights_text = format_portfolio_insights_for_trader(portfolio_overview)
-
-            paradex_data_str = f"""
-=== 🔴 PARADEX 实际交易数据 ===
-{positions_text}
-
-{history_text}
-
-{insights_text}
-"""
-        except Exception as e:
-            logger.error(f"获取Paradex数据失败: {e}", exc_info=True)
-            paradex_data_str = f"\n⚠️ Paradex 数据获取失败: {str(e)}\n请检查：\n1. Paradex API配置是否正确\n2. 网络连接是否正常\n3. API密钥是否有效\n"
+        if load_portfolio is None:
+            paradex_data_str = OFFLINE_PARADEX_DATA
+        else:
+            paradex_data_str = await asyncio.to_thread(load_portfolio)
 
         context = {
             "role": "user",
@@ -75,24 +109,18 @@ def create_trader(llm, memory):
         messages = [
             {
                 "role": "system",
-                "content": f"""重要提示：务必用中文回复！ 您是一名交易员，负责分析市场数据并做出交易决策。基于您的分析，提供具体的交易建议——做多、做空或中性。做出明确的决策，并在最后使用"FINAL TRADING PROPOSAL: LONG/NEUTRAL/SHORT"确认您的建议。
-
-🔴 **重要：必须结合用户实际 Paradex 交易情况**
+                "content": compose_prompt(
+                    TRADER_INSTRUCTIONS,
+                    f"""🔴 **重要：必须结合用户实际 Paradex 交易情况**
 {paradex_data_str}
 
-**决策指导原则：**
-1. 首先考虑当前持仓情况和风险敞口
-2. 结合历史交易模式和盈亏情况
-3. 评估新建议与现有投资组合的协同效应
-4. 考虑仓位管理和风险分散
-5. 如果已有相关品种持仓，重点考虑加仓/减仓/平仓策略
-
-同时，回顾过往决策中的经验和教训，从中学习。以下是类似情形的反思和教训：{past_memory_str}""",
+以下是类似情形的反思和教训：{past_memory_str}""",
+                ),
             },
             context,
         ]
 
-        result = llm.invoke(messages)
+        result = await llm.ainvoke(messages, config)
 
         return {
             "messages": [result],
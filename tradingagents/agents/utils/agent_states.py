@@ -7,6 +7,15 @@ from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
 
 
+# State field each analyst writes its report to
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+
 # Researcher team state
 class InvestDebateState(TypedDict):
     bull_history: Annotated[
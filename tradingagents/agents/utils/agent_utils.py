@@ -60,6 +60,24 @@ def create_msg_delete():
     return delete_messages
 
 
+def compose_prompt(instructions: str, data: str) -> str:
+    """
+    拼接提示词：静态指令在前，本次运行的数据在后
+
+    服务商的提示词前缀缓存（OpenAI、OpenRouter、DeepSeek、Gemini 等）只能命中逐字节相同的前缀，
+    因此 instructions 应为不含任何运行数据的模块级常量，标的、日期、报告和辩论历史等全部放在 data 中；
+    data 内部也按变化频率排列（报告在前，辩论历史在后），使同一角色的多轮发言能复用更长的前缀。
+
+    Args:
+        instructions: 静态指令
+        data: 本次调用的数据部分
+
+    Returns:
+        str: 完整提示词
+    """
+    return f"{instructions}\n\n{data}"
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
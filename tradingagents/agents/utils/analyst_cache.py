@@ -0,0 +1,285 @@
+"""
+分析师报告缓存
+相同标的、日期、模型和提示词版本的分析师报告直接复用，跳过整个工具调用循环
+"""
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from .agent_states import ANALYST_REPORT_FIELDS
+from .tool_prefetch import is_prefetch_message
+
+logger = logging.getLogger(__name__)
+
+# 各类分析师报告的默认有效期（秒）：新闻和情绪变化快，基本面变化慢
+DEFAULT_ANALYST_CACHE_TTL = {
+    "market": 4 * 3600,
+    "social": 2 * 3600,
+    "news": 1 * 3600,
+    "fundamentals": 24 * 3600,
+}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_version(analyst_node) -> str:
+    """提示词版本：分析师节点所在源文件的哈希，修改提示词后旧缓存自动失效"""
+    try:
+        source = inspect.getsource(inspect.getmodule(analyst_node))
+    except (OSError, TypeError):
+        return "unknown"
+    return _digest(source)[:16]
+
+
+class AnalystReportCache:
+    """分析师报告磁盘缓存
+
+    每条缓存是 cache_dir/<analyst_type>/<key>.json，key 由分析师类型、标的、交易日期、
+    快速思考模型和提示词版本组成。条目同时记录生成报告时的工具调用及其输出摘要，
+    开启 revalidate 时会重新执行这些工具调用（不调用 LLM），输出有变化则视为未命中。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: Optional[Dict[str, float]] = None,
+        revalidate: bool = False,
+    ):
+        """
+        初始化分析师报告缓存
+
+        Args:
+            cache_dir: 缓存目录
+            ttl: 各分析师类型的有效期（秒），未列出的类型使用默认值
+            revalidate: 命中时是否重新执行工具并比对输出摘要
+        """
+        self.cache_dir = cache_dir
+        self.ttl = {**DEFAULT_ANALYST_CACHE_TTL, **(ttl or {})}
+        self.revalidate = revalidate
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    @staticmethod
+    def make_key(analyst_type: str, ticker: str, trade_date: str, model: str, version: str) -> str:
+        payload = json.dumps(
+            [analyst_type, ticker.upper(), str(trade_date), model, version]
+        )
+        return _digest(payload)
+
+    def _path(self, analyst_type: str, key: str) -> str:
+        return os.path.join(self.cache_dir, analyst_type, f"{key}.json")
+
+    def get(self, analyst_type: str, key: str) -> Optional[Dict[str, Any]]:
+        """读取未过期的缓存条目，不存在或已过期返回 None"""
+        path = self._path(analyst_type, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable analyst cache entry {path}: {e}")
+            self._count("misses")
+            return None
+
+        ttl = self.ttl.get(analyst_type)
+        if ttl is not None and time.time() - entry.get("created_at", 0) > ttl:
+            self._count("stale")
+            self._remove(path)
+            return None
+
+        self._count("hits")
+        return entry
+
+    def contains(self, analyst_type: str, key: str) -> bool:
+        """是否有未过期的缓存条目（不计入命中统计，也不删除过期条目）"""
+        path = self._path(analyst_type, key)
+        try:
+            created_at = os.path.getmtime(path)
+        except OSError:
+            return False
+        ttl = self.ttl.get(analyst_type)
+        return ttl is None or time.time() - created_at <= ttl
+
+    def put(
+        self,
+        analyst_type: str,
+        key: str,
+        report: str,
+        tool_calls: List[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        """写入缓存条目（先写临时文件再替换，避免并发读到半个文件）"""
+        path = self._path(analyst_type, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "analyst_type": analyst_type,
+            "report": report,
+            "tool_calls": tool_calls,
+            "created_at": time.time(),
+            **(meta or {}),
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, analyst_type: str, key: str):
+        self._remove(self._path(analyst_type, key))
+
+    def clear(self, analyst_type: Optional[str] = None) -> int:
+        """删除缓存条目，返回删除数量"""
+        types = [analyst_type] if analyst_type else list(ANALYST_REPORT_FIELDS)
+        removed = 0
+        for t in types:
+            directory = os.path.join(self.cache_dir, t)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(".json"):
+                    self._remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def create_analyst_cache(config: Dict[str, Any]) -> Optional[AnalystReportCache]:
+    """根据配置创建分析师报告缓存，未启用时返回 None"""
+    if not config.get("analyst_cache_enabled", False):
+        return None
+    return AnalystReportCache(
+        config.get("analyst_cache_dir")
+        or os.path.join(config["data_cache_dir"], "analyst_reports"),
+        ttl=config.get("analyst_cache_ttl"),
+        revalidate=config.get("analyst_cache_revalidate", False),
+    )
+
+
+def _collect_tool_calls(messages) -> List[Dict[str, Any]]:
+    """从分析师的消息记录中提取工具调用及其输出摘要"""
+    outputs = {
+        m.tool_call_id: m.content for m in messages if isinstance(m, ToolMessage)
+    }
+    calls = []
+    for m in messages:
+        if not isinstance(m, AIMessage):
+            continue
+        for call in m.tool_calls:
+            output = outputs.get(call["id"])
+            calls.append(
+                {
+                    "name": call["name"],
+                    "args": call["args"],
+                    "digest": _digest(str(output)) if output is not None else None,
+                }
+            )
+    return calls
+
+
+async def _tool_outputs_unchanged(tool_node, tool_calls: List[Dict[str, Any]], config=None) -> bool:
+    tools = getattr(tool_node, "tools_by_name", {})
+    for call in tool_calls:
+        tool = tools.get(call["name"])
+        if tool is None or call["digest"] is None:
+            return False
+        try:
+            output = await tool.ainvoke(call["args"], config)
+        except Exception as e:
+            logger.warning(f"Revalidating {call['name']} failed: {e}")
+            return False
+        if _digest(str(output)) != call["digest"]:
+            return False
+    return True
+
+
+def create_cache_probe(analyst_type, analyst_node, cache: AnalystReportCache, model: str):
+    """返回判断某个状态下分析师报告是否已缓存的函数（key 与 create_cached_analyst 相同）
+
+    预取节点据此在缓存命中时跳过预取；开启 revalidate 时命中仍可能在分析师节点中失效，
+    此时分析师按原流程自行调用工具。
+    """
+    version = prompt_version(analyst_node)
+
+    def probe(state) -> bool:
+        key = cache.make_key(
+            analyst_type, state["company_of_interest"], state["trade_date"], model, version
+        )
+        return cache.contains(analyst_type, key)
+
+    return probe
+
+
+def create_cached_analyst(analyst_type, analyst_node, cache: AnalystReportCache, model: str, tool_node=None):
+    """包装分析师节点：首轮先查缓存，命中则直接返回报告；生成最终报告时写入缓存
+
+    命中时返回一条不含工具调用的 AIMessage，条件边因此直接走向消息清理节点，
+    整个工具循环被跳过。
+    """
+    report_field = ANALYST_REPORT_FIELDS[analyst_type]
+    version = prompt_version(analyst_node)
+
+    async def cached_analyst_node(state, config=None):
+        messages = state["messages"]
+        key = cache.make_key(
+            analyst_type, state["company_of_interest"], state["trade_date"], model, version
+        )
+        # 预取节点写入的工具调用不算分析师的轮次
+        first_turn = not any(
+            isinstance(m, AIMessage) and not is_prefetch_message(m) for m in messages
+        )
+
+        if first_turn:
+            entry = cache.get(analyst_type, key)
+            if entry is not None and cache.revalidate and not await _tool_outputs_unchanged(
+                tool_node, entry["tool_calls"], config
+            ):
+                cache.invalidate(analyst_type, key)
+                entry = None
+            if entry is not None:
+                logger.info(
+                    f"Analyst cache hit: {analyst_type} {state['company_of_interest']} {state['trade_date']}"
+                )
+                return {
+                    "messages": [AIMessage(content=entry["report"])],
+                    report_field: entry["report"],
+                }
+
+        result = await analyst_node(state, config)
+
+        final_message = result["messages"][-1]
+        report = result.get(report_field, "")
+        if report and not getattr(final_message, "tool_calls", None):
+            cache.put(
+                analyst_type,
+                key,
+                report,
+                _collect_tool_calls(messages),
+                meta={
+                    "ticker": state["company_of_interest"],
+                    "trade_date": str(state["trade_date"]),
+                    "model": model,
+                    "prompt_version": version,
+                },
+            )
+        return result
+
+    return cached_analyst_node
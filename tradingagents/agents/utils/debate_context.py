@@ -0,0 +1,164 @@
+"""
+辩论上下文管理
+保留最近 K 轮发言原文，更早的发言压缩为增量更新的摘要，并按节点 token 预算裁剪
+"""
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langgraph.constants import TAG_NOSTREAM
+
+logger = logging.getLogger(__name__)
+
+# 辩论历史中每轮发言的前缀，例如 "Bullish Analyst: ..."
+_TURN_SPLIT = re.compile(
+    r"\n(?=(?:Bullish|Bearish|Aggressive|Conservative|Neutral) Analyst: )"
+)
+_CJK = re.compile(r"[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中文字符约 1 token/字，其余约 4 字符/token"""
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def split_turns(history: str) -> List[str]:
+    """把拼接的辩论历史拆成逐轮发言"""
+    return [turn.strip() for turn in _TURN_SPLIT.split(history or "") if turn.strip()]
+
+
+def _digest(turns: List[str]) -> str:
+    return hashlib.sha256("\n".join(turns).encode("utf-8")).hexdigest()
+
+
+class DebateContext:
+    """为辩论节点生成有界的历史上下文
+
+    较早的发言被压缩为摘要，摘要按历史前缀的内容哈希缓存；历史每增加一轮，只需把
+    新移出窗口的发言合并进已有摘要，而不是重新总结全部历史。
+    """
+
+    def __init__(
+        self,
+        llm,
+        keep_turns: int = 4,
+        token_budget: int = 24000,
+        min_history_tokens: int = 2000,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            llm: 用于生成摘要的模型（建议使用快速思考模型）
+            keep_turns: 原文保留的最近发言轮数
+            token_budget: 单个节点提示词的 token 预算
+            min_history_tokens: 其余内容已接近预算时，仍留给辩论历史的最少 token 数
+            cache_size: 缓存的摘要数量上限
+        """
+        self.llm = llm
+        self.keep_turns = max(1, keep_turns)
+        self.token_budget = token_budget
+        self.min_history_tokens = min_history_tokens
+        self.cache_size = cache_size
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+
+    async def arender(self, history: str, reserved_tokens: int = 0, config=None) -> str:
+        """返回放入提示词的辩论历史
+
+        Args:
+            history: 完整的辩论历史
+            reserved_tokens: 提示词中其余内容（报告、指令等）已占用的 token 数
+            config: 调用节点的 RunnableConfig，用于传递回调
+        """
+        budget = max(self.min_history_tokens, self.token_budget - reserved_tokens)
+        turns = split_turns(history)
+        if len(turns) <= self.keep_turns and estimate_tokens(history) <= budget:
+            return history
+
+        split = max(0, len(turns) - self.keep_turns)
+        while True:
+            summary = await self._asummarize(turns[:split], config) if split else ""
+            rendered = self._format(summary, turns[split:])
+            if estimate_tokens(rendered) <= budget or split >= len(turns) - 1:
+                break
+            # 超出预算时，把最早的原文发言也并入摘要
+            split += 1
+
+        if estimate_tokens(rendered) > budget:
+            # 单轮发言本身就超出预算，只保留末尾（截断标记也计入预算）
+            marker = "……（已截断）"
+            tail_budget = max(1, budget - estimate_tokens(marker))
+            rendered = marker + rendered[-self._chars_for(rendered, tail_budget):]
+        return rendered
+
+    def _format(self, summary: str, recent_turns: List[str]) -> str:
+        parts = []
+        if summary:
+            parts.append(f"【此前辩论摘要】\n{summary}")
+        if recent_turns:
+            parts.append("【最近发言】\n" + "\n".join(recent_turns))
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _chars_for(text: str, budget: int) -> int:
+        tokens = estimate_tokens(text)
+        return max(1, int(len(text) * budget / tokens))
+
+    async def _asummarize(self, turns: List[str], config=None) -> str:
+        key = _digest(turns)
+        cached = self._summaries.get(key)
+        if cached is not None:
+            self._summaries.move_to_end(key)
+            return cached
+
+        # 找到最长的已摘要前缀，只合并之后新增的发言
+        base_summary, start = "", 0
+        for n in range(len(turns) - 1, 0, -1):
+            prefix_summary = self._summaries.get(_digest(turns[:n]))
+            if prefix_summary is not None:
+                base_summary, start = prefix_summary, n
+                break
+
+        try:
+            summary = await self._aupdate_summary(base_summary, turns[start:], config)
+        except Exception as e:
+            logger.warning(f"Debate summarization failed, keeping turns verbatim: {e}")
+            return "\n".join(([base_summary] if base_summary else []) + turns[start:])
+
+        self._summaries[key] = summary
+        while len(self._summaries) > self.cache_size:
+            self._summaries.popitem(last=False)
+        return summary
+
+    async def _aupdate_summary(self, summary: str, new_turns: List[str], config=None) -> str:
+        prompt = f"""请将辩论内容压缩为简明的要点摘要，供后续辩论参考。
+
+要求：
+- 按发言方分别列出核心论点、关键数据和对对方的主要反驳
+- 保留具体数字、价位和结论，删除重复和修饰性内容
+- 只输出更新后的摘要，使用中文
+
+已有摘要：
+{summary or "（无）"}
+
+新增发言：
+{chr(10).join(new_turns)}
+"""
+        # 摘要是内部步骤，不推送到界面的 token 流
+        response = await self.llm.with_config(tags=[TAG_NOSTREAM]).ainvoke(prompt, config)
+        return response.content
+
+
+def create_debate_context(llm, config: Dict[str, Any]) -> Optional[DebateContext]:
+    """根据配置创建辩论上下文管理器，未启用时返回 None"""
+    if not config.get("debate_context_enabled", False):
+        return None
+    return DebateContext(
+        llm,
+        keep_turns=config.get("debate_keep_turns", 4),
+        token_budget=config.get("debate_token_budget", 24000),
+    )
@@ -0,0 +1,216 @@
+"""
+Embedding 缓存
+按 (embedding 服务, 模型, 文本内容) 的哈希缓存向量，进程内所有 FinancialSituationMemory 共享：
+研究员、经理、交易员在同一次运行中构建的同一段 curr_situation 只请求一次 embedding；
+内存层按 LRU 淘汰，可选的 SQLite 磁盘层跨进程和跨运行复用；同一文本的并发请求只发出一次（single-flight）
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """一次进行中的 embedding 请求"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[List[float]] = None
+
+
+class EmbeddingCache:
+    """内存 LRU + 可选 SQLite 磁盘层的 embedding 缓存"""
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        """
+        初始化 embedding 缓存
+
+        Args:
+            max_entries: 内存中保留的向量数，超出后淘汰最久未使用的
+            path: SQLite 文件路径，None 表示只使用内存
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "shared": 0}
+
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        payload = "\x1f".join([namespace, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[List[float]]:
+        """读取缓存的向量（先内存后磁盘），未命中返回 None；调用方需持有 _lock"""
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self.stats["hits"] += 1
+            return vector
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        vector = array("d", row[0]).tolist()
+        self._remember(key, vector)
+        self.stats["disk_hits"] += 1
+        return vector
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def store(self, key: str, vector: List[float]):
+        """写入内存层和磁盘层；调用方需持有 _lock"""
+        self._remember(key, vector)
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                (key, array("d", vector).tobytes(), time.time()),
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist embedding {key[:12]}: {e}")
+
+    def get_or_embed_many(self, namespace: str, texts: List[str],
+                          embed: Callable[[List[str]], List[Optional[List[float]]]]) -> List[Optional[List[float]]]:
+        """
+        批量版 get_or_embed：未命中且没有其他调用在请求的文本交给一次 embed 调用，
+        其余文本等待进行中的请求
+
+        Args:
+            namespace: embedding 服务和模型标识
+            texts: 被 embedding 的文本
+            embed: 按输入顺序返回向量列表的函数，失败的位置为 None（不缓存）
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        leading: List[tuple] = []
+        waiting: List[tuple] = []
+        with self._lock:
+            for index, text in enumerate(texts):
+                key = self.make_key(namespace, text)
+                vector = self.lookup(key)
+                if vector is not None:
+                    results[index] = vector
+                    continue
+                flight = self._inflight.get(key)
+                if flight is None:
+                    flight = _Flight()
+                    self._inflight[key] = flight
+                    leading.append((index, key, flight))
+                    self.stats["misses"] += 1
+                else:
+                    # 包括同一批中重复的文本
+                    waiting.append((index, flight))
+                    self.stats["shared"] += 1
+
+        if leading:
+            try:
+                vectors = embed([texts[index] for index, _, _ in leading])
+                with self._lock:
+                    for (index, key, flight), vector in zip(leading, vectors):
+                        if vector is not None:
+                            self.store(key, vector)
+                        flight.result = vector
+                        results[index] = vector
+            finally:
+                with self._lock:
+                    for _, key, flight in leading:
+                        self._inflight.pop(key, None)
+                        flight.event.set()
+
+        for index, flight in waiting:
+            flight.event.wait()
+            results[index] = flight.result
+        return results
+
+    def get_or_embed(self, namespace: str, text: str,
+                     embed: Callable[[], Optional[List[float]]]) -> Optional[List[float]]:
+        """
+        返回缓存的向量，未命中时调用 embed；同一文本同时只有一个调用真正请求
+
+        Args:
+            namespace: embedding 服务和模型标识，不同模型的向量互不复用
+            text: 被 embedding 的文本
+            embed: 实际请求 embedding 的无参函数，失败时返回 None（不缓存）
+        """
+        key = self.make_key(namespace, text)
+        with self._lock:
+            vector = self.lookup(key)
+            if vector is not None:
+                return vector
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.stats["misses"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            flight.event.wait()
+            return flight.result
+
+        try:
+            vector = embed()
+            if vector is not None:
+                with self._lock:
+                    self.store(key, vector)
+            flight.result = vector
+            return vector
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+
+# 全局 embedding 缓存实例（按磁盘路径共享）
+_global_caches: Dict[Optional[str], EmbeddingCache] = {}
+_global_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(config: Dict[str, Any]) -> Optional[EmbeddingCache]:
+    """根据配置返回共享的 embedding 缓存，未启用时返回 None"""
+    if not config.get("embedding_cache_enabled", True):
+        return None
+
+    path = config.get("embedding_cache_path")
+    path = os.path.abspath(path) if path else None
+    with _global_caches_lock:
+        cache = _global_caches.get(path)
+        if cache is None:
+            cache = EmbeddingCache(config.get("embedding_cache_size", 1024), path)
+            _global_caches[path] = cache
+    return cache
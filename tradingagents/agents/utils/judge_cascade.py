@@ -0,0 +1,203 @@
+"""
+裁判模型级联
+研究经理和风险经理先由快速模型起草决策并自评置信度，只有置信度不足或高风险（已有大额 Paradex 持仓、
+高杠杆）的情况才交给深度模型重新决策；每次判断的升级原因和节省的时间记录到运行时间线
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.callbacks import adispatch_custom_event
+
+logger = logging.getLogger(__name__)
+
+CONFIDENCE_INSTRUCTION = (
+    "\n\n在回答的最后单独一行给出你对上述决策的置信度（0 到 1 之间的小数），格式为：置信度：0.xx"
+)
+
+_CONFIDENCE_PATTERN = re.compile(
+    r"(?:置信度|confidence)[\s*_]*[:：][\s*_]*(\d+(?:\.\d+)?)\s*(%)?", re.IGNORECASE
+)
+
+# 时间线中的事件名
+CASCADE_EVENT = "judge_cascade"
+
+
+def parse_confidence(text: str) -> Optional[float]:
+    """读取回答中最后一个置信度，支持小数和百分比，没有时返回 None"""
+    matches = _CONFIDENCE_PATTERN.findall(text or "")
+    if not matches:
+        return None
+    value, percent = matches[-1]
+    confidence = float(value)
+    if percent or confidence > 1:
+        confidence /= 100
+    return max(0.0, min(1.0, confidence))
+
+
+def _base_asset(symbol: str) -> str:
+    symbol = symbol.upper()
+    for suffix in ("-USD-PERP", "-PERP", "-USDT", "-USDC", "-USD", "-EUR", "USDT", "USDC", "USD"):
+        if symbol.endswith(suffix) and len(symbol) > len(suffix):
+            return symbol[: -len(suffix)]
+    return symbol.split("-")[0]
+
+
+def paradex_position_stakes(ticker: str) -> Optional[Dict[str, float]]:
+    """该标的在 Paradex 上的持仓名义价值和杠杆（阻塞调用），无持仓时返回 None
+
+    非加密货币标的或未配置 Paradex（SDK 不可用、没有凭证）时不检查持仓，返回 None；
+    已配置但获取失败时抛出 RuntimeError，由级联按持仓未知（position_unknown）升级，而不是当作无持仓
+    """
+    from .agent_utils import detect_asset_type
+    from .paradex_tools import get_paradex_manager, paradex_configured
+
+    if detect_asset_type(ticker) != "crypto" or not paradex_configured():
+        return None
+    summary = get_paradex_manager().get_positions_summary()
+    if not summary.get("success"):
+        raise RuntimeError(summary.get("error") or "Paradex positions summary unavailable")
+    asset = _base_asset(ticker)
+    notional = 0.0
+    leverage = 0.0
+    for position in summary.get("positions", []):
+        if _base_asset(position.get("market", "")) != asset:
+            continue
+        try:
+            size = abs(float(position.get("size", 0) or 0))
+            price = float(position.get("mark_price") or position.get("entry_price") or 0)
+            notional += size * price
+            leverage = max(leverage, float(position.get("leverage") or 0))
+        except (TypeError, ValueError):
+            continue
+    if not notional:
+        return None
+    return {"notional": notional, "leverage": leverage}
+
+
+class JudgeCascade:
+    """快速模型起草、按置信度和风险升级到深度模型的裁判调用"""
+
+    def __init__(
+        self,
+        quick_llm,
+        deep_llm,
+        min_confidence: float = 0.75,
+        max_position_usd: Optional[float] = None,
+        max_leverage: Optional[float] = None,
+        stakes_fn: Optional[Callable[[str], Optional[Dict[str, float]]]] = paradex_position_stakes,
+    ):
+        """
+        Args:
+            quick_llm: 起草决策的快速模型
+            deep_llm: 升级时使用的深度模型
+            min_confidence: 低于该置信度时升级
+            max_position_usd: 该标的已有持仓名义价值超过该值时升级，None 表示不检查
+            max_leverage: 该标的持仓杠杆超过该值时升级，None 表示不检查
+            stakes_fn: 返回标的持仓 {"notional", "leverage"} 的函数（阻塞调用，在线程中执行）
+        """
+        self.quick_llm = quick_llm
+        self.deep_llm = deep_llm
+        self.min_confidence = min_confidence
+        self.max_position_usd = max_position_usd
+        self.max_leverage = max_leverage
+        self.stakes_fn = stakes_fn
+        self._lock = threading.Lock()
+        # 深度模型的平均耗时，用于估算未升级时节省的时间
+        self._deep_seconds: Optional[float] = None
+        self.stats = {"decisions": 0, "escalations": 0, "saved_seconds": 0.0}
+
+    async def _stakes_reason(self, ticker: str) -> Optional[str]:
+        if self.stakes_fn is None or (self.max_position_usd is None and self.max_leverage is None):
+            return None
+        try:
+            stakes = await asyncio.to_thread(self.stakes_fn, ticker)
+        except Exception as e:
+            logger.warning(f"Position lookup for judge cascade failed, escalating: {e}")
+            return "position_unknown"
+        if not stakes:
+            return None
+        if self.max_position_usd is not None and stakes.get("notional", 0) > self.max_position_usd:
+            return "large_position"
+        if self.max_leverage is not None and stakes.get("leverage", 0) > self.max_leverage:
+            return "high_leverage"
+        return None
+
+    def _record_deep_seconds(self, seconds: float):
+        with self._lock:
+            if self._deep_seconds is None:
+                self._deep_seconds = seconds
+            else:
+                self._deep_seconds = 0.8 * self._deep_seconds + 0.2 * seconds
+
+    async def ainvoke(self, judge: str, prompt: str, ticker: str, config=None):
+        """起草并在需要时升级，返回最终采用的回复
+
+        Args:
+            judge: 裁判名（记录到时间线）
+            prompt: 裁判提示词
+            ticker: 标的代码，用于检查持仓风险
+            config: LangGraph 传入的运行配置
+        """
+        started = time.perf_counter()
+        draft = await self.quick_llm.ainvoke(prompt + CONFIDENCE_INSTRUCTION, config)
+        draft_seconds = time.perf_counter() - started
+        confidence = parse_confidence(draft.content)
+
+        if confidence is None:
+            reason = "no_confidence"
+        elif confidence < self.min_confidence:
+            reason = "low_confidence"
+        else:
+            reason = await self._stakes_reason(ticker)
+
+        event = {
+            "judge": judge,
+            "confidence": confidence,
+            "escalated": reason is not None,
+            "reason": reason,
+            "draft_seconds": round(draft_seconds, 4),
+        }
+        if reason is None:
+            response = draft
+            # 没有深度模型耗时的观测值时不估算
+            saved = (self._deep_seconds - draft_seconds) if self._deep_seconds is not None else 0.0
+        else:
+            logger.info(f"{judge} escalated to the deep model ({reason}, confidence {confidence})")
+            deep_started = time.perf_counter()
+            response = await self.deep_llm.ainvoke(prompt, config)
+            deep_seconds = time.perf_counter() - deep_started
+            self._record_deep_seconds(deep_seconds)
+            event["deep_seconds"] = round(deep_seconds, 4)
+            # 升级时起草的时间是额外开销
+            saved = -draft_seconds
+        event["saved_seconds"] = round(saved, 4)
+
+        with self._lock:
+            self.stats["decisions"] += 1
+            self.stats["escalations"] += int(reason is not None)
+            self.stats["saved_seconds"] += saved
+        try:
+            await adispatch_custom_event(CASCADE_EVENT, event, config=config)
+        except Exception as e:
+            # 不在可运行对象上下文中（如单独调用）时没有回调可分发
+            logger.debug(f"Judge cascade event not dispatched: {e}")
+        return response
+
+
+def create_judge_cascade(quick_llm, deep_llm, config: Dict[str, Any]) -> Optional[JudgeCascade]:
+    """根据配置创建裁判级联，未启用时返回 None；mock 后端离线运行，不查询 Paradex 持仓"""
+    if not config.get("judge_cascade_enabled", False):
+        return None
+    offline = (config.get("llm_provider") or "").lower() == "mock"
+    return JudgeCascade(
+        quick_llm,
+        deep_llm,
+        min_confidence=config.get("judge_cascade_min_confidence", 0.75),
+        max_position_usd=config.get("judge_cascade_max_position_usd"),
+        max_leverage=config.get("judge_cascade_max_leverage"),
+        stakes_fn=None if offline else paradex_position_stakes,
+    )
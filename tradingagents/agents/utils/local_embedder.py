@@ -0,0 +1,169 @@
+"""
+本地 embedding 后端
+在进程内用 CPU 计算向量，不依赖网络，供 FinancialSituationMemory 在 embedding 服务不可用或离线回测时使用：
+- hashing: 字符 n-gram 和词 n-gram 哈希投影（次线性词频加权、L2 归一化），无需模型文件
+- onnx: 从本地路径加载的小型 ONNX 句向量模型（如 bge-small），均值池化
+由配置 embedding_backend 选择，两种后端都按批次向量化计算
+"""
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+LOCAL_BACKENDS = ("hashing", "onnx")
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """字符 n-gram + 词 n-gram 的哈希投影 embedding"""
+
+    # 向量计算只需微秒级，缓存反而更慢
+    cacheable = False
+
+    def __init__(self, dimensions: int = 512, char_ngrams=(3, 5), word_ngrams=(1, 2)):
+        """
+        Args:
+            dimensions: 向量维度（哈希桶数）
+            char_ngrams: 字符 n-gram 长度范围（含两端）
+            word_ngrams: 词 n-gram 长度范围（含两端）
+        """
+        self.dimensions = dimensions
+        self.char_ngrams = tuple(char_ngrams)
+        self.word_ngrams = tuple(word_ngrams)
+        self.name = (
+            f"local:hashing:{dimensions}:c{self.char_ngrams[0]}-{self.char_ngrams[1]}"
+            f":w{self.word_ngrams[0]}-{self.word_ngrams[1]}"
+        )
+
+    def _features(self, text: str) -> List[str]:
+        text = " ".join(text.lower().split())
+        features = []
+        low, high = self.char_ngrams
+        for n in range(low, high + 1):
+            features.extend(text[i:i + n] for i in range(max(0, len(text) - n + 1)))
+        words = _WORD_PATTERN.findall(text)
+        low, high = self.word_ngrams
+        for n in range(low, high + 1):
+            features.extend("w:" + " ".join(words[i:i + n]) for i in range(max(0, len(words) - n + 1)))
+        return features
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """计算一批文本的向量（L2 归一化）"""
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            rows.extend([row] * len(features))
+            hashes.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if hashes:
+            hashes = np.asarray(hashes, dtype=np.uint32)
+            columns = (hashes % self.dimensions).astype(np.int64)
+            # 最高位决定符号，减少哈希冲突带来的偏差
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix, (np.asarray(rows, dtype=np.int64), columns), signs)
+            # 次线性词频：保留符号，对绝对值取 log
+            matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+
+class OnnxEmbedder:
+    """从本地路径加载的 ONNX 句向量模型"""
+
+    cacheable = True
+
+    def __init__(self, model_path: str, tokenizer_path: Optional[str] = None,
+                 max_length: int = 512, threads: Optional[int] = None):
+        """
+        Args:
+            model_path: .onnx 文件路径，或包含 model.onnx 的目录
+            tokenizer_path: tokenizer.json 路径，默认取模型所在目录下的 tokenizer.json
+            max_length: 输入截断的 token 数
+            threads: ONNX Runtime 算子内线程数，None 使用默认值
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError("The onnx embedding backend requires onnxruntime and tokenizers")
+
+        if os.path.isdir(model_path):
+            model_path = os.path.join(model_path, "model.onnx")
+        tokenizer_path = tokenizer_path or os.path.join(os.path.dirname(model_path), "tokenizer.json")
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self.name = f"local:onnx:{os.path.abspath(model_path)}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """计算一批文本的向量（按注意力掩码均值池化后 L2 归一化）"""
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.asarray([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.asarray([e.type_ids for e in encodings], dtype=np.int64)
+        feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+
+        hidden = self.session.run(None, feeds)[0]
+        if hidden.ndim == 3:
+            mask = attention_mask[..., None].astype(hidden.dtype)
+            hidden = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(hidden, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (hidden / norms).astype(np.float32).tolist()
+
+
+# 全局本地 embedding 实例（按后端参数共享，ONNX 模型只加载一次）
+_global_embedders: Dict[tuple, Any] = {}
+_global_embedders_lock = threading.Lock()
+
+
+def get_local_embedder(config: Dict[str, Any]):
+    """根据配置返回共享的本地 embedding 后端，使用远程服务时返回 None"""
+    backend = (config.get("embedding_backend") or "remote").lower()
+    if backend not in LOCAL_BACKENDS:
+        return None
+
+    if backend == "hashing":
+        key = (backend, config.get("embedding_local_dimensions", 512))
+    else:
+        model_path = config.get("embedding_onnx_path")
+        if not model_path:
+            raise ValueError("embedding_backend 'onnx' requires embedding_onnx_path")
+        key = (backend, os.path.abspath(model_path), config.get("embedding_onnx_tokenizer_path"),
+               config.get("embedding_onnx_max_length", 512))
+
+    with _global_embedders_lock:
+        embedder = _global_embedders.get(key)
+        if embedder is None:
+            if backend == "hashing":
+                embedder = HashingEmbedder(dimensions=key[1])
+            else:
+                embedder = OnnxEmbedder(key[1], tokenizer_path=key[2], max_length=key[3])
+            logger.info(f"Using local embedding backend {embedder.name}")
+            _global_embedders[key] = embedder
+    return embedder
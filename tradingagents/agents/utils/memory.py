@@ -1,59 +1,138 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
-import os
+import re
+import threading
+import uuid
+
+import numpy as np
+
+from tradingagents.dataflows.http_clients import get_openai_client
+from tradingagents.dataflows.rate_limiter import scheduled_call
+
+from .embedding_cache import get_embedding_cache
+from .local_embedder import get_local_embedder
+from .memory_store import chunk_collection_name, get_memory_store
+
+
+def split_situation(text, max_chars=1500, overlap=200):
+    """Split a situation into chunks of at most max_chars characters
+
+    Paragraphs (the analyst reports are joined by blank lines) are packed together
+    up to max_chars; longer paragraphs are cut into windows overlapping by overlap
+    characters.
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+    step = max(1, max_chars - overlap)
+    chunks = []
+    current = ""
+    for paragraph in paragraphs:
+        if len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            for start in range(0, len(paragraph), step):
+                chunks.append(paragraph[start:start + max_chars])
+                if start + max_chars >= len(paragraph):
+                    break
+            continue
+        candidate = f"{current}\n\n{paragraph}" if current else paragraph
+        if len(candidate) > max_chars:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class FinancialSituationMemory:
-    def __init__(self, name, config):
+    def __init__(self, name, config, store=None):
         # 设置 embedding 模型
         if config.get("embedding_url", config["backend_url"]) == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
         else:
             self.embedding = config.get("embedding_model", "BAAI/bge-m3")
         
-        # 为主 LLM 创建 client
-        self.client = OpenAI(base_url=config["backend_url"])
-        
-        # 为 embedding 创建独立的 client
+        # embedding client 使用进程内共享的连接池
         embedding_url = config.get("embedding_url", config["backend_url"])
-        embedding_api_key = config.get("embedding_api_key", None)
-        
-        if embedding_api_key:
-            self.embedding_client = OpenAI(
-                base_url=embedding_url,
-                api_key=embedding_api_key
-            )
-        else:
-            self.embedding_client = OpenAI(base_url=embedding_url)
-        
-        # 设置持久化目录路径
-        persist_directory = config.get("memory_persist_dir", 
-                                      os.path.join(config.get("project_dir", "."), "memory_db"))
-        
-        # 确保目录存在
-        os.makedirs(persist_directory, exist_ok=True)
-        
-        # 使用 PersistentClient 实现持久化存储
-        self.chroma_client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(allow_reset=True)
+        self.config = config
+        self.embedding_url = embedding_url
+        self.mock = config.get("llm_provider", "").lower() == "mock"
+        # 本地后端（embedding_backend 为 hashing/onnx）在进程内计算向量，不访问网络
+        self.local_embedder = None if self.mock else get_local_embedder(config)
+        self.embedding_client = None if self.mock or self.local_embedder else get_openai_client(
+            embedding_url, config.get("embedding_api_key", None), config
         )
-        
-        try:
-            self.situation_collection = self.chroma_client.create_collection(name=name)
-        except Exception:
-            # 如果集合已存在，获取它而不是创建
-            self.situation_collection = self.chroma_client.get_collection(name=name)
+        # 所有记忆实例共享的 embedding 缓存，同一段情境文本只请求一次
+        self.embedding_cache = get_embedding_cache(config)
+        self.embedding_namespace = "mock" if self.mock else f"{embedding_url}|{self.embedding}"
+        if self.local_embedder is not None:
+            self.embedding_namespace = self.local_embedder.name
+            if not self.local_embedder.cacheable:
+                self.embedding_cache = None
+
+        # 同一持久化目录的所有记忆共享一个 PersistentClient
+        self.store = store or get_memory_store(config)
+        self.chroma_client = self.store.client
+        self.situation_collection = self.store.collection(name)
+
+        # 长情境按段落分块，每块一个向量存放在 <name>_chunks 集合中
+        self.chunking = config.get("memory_chunking_enabled", True)
+        # 尚未分块的旧记录 id，首次使用时列出（None 表示还未列出）
+        self._unindexed = None
+        self._chunk_index_lock = threading.Lock()
+        self.store.add_delete_listener(name, self._forget_deleted)
+
+        # 已存储向量的维度（集合为空时为 None）；换用维度不同的 embedding 后端时 Chroma 查询会直接报错，
+        # 维度事先已知的后端在此检查，其余后端在得到第一个向量时检查
+        self._stored_dimension = self._peek_dimension()
+        if self.mock:
+            from tradingagents.graph.mock_llm import mock_embedding
+            self._check_dimension(len(mock_embedding("dimension")))
+        elif getattr(self.local_embedder, "dimensions", None):
+            self._check_dimension(self.local_embedder.dimensions)
     
     def reset_collection(self):
         """Resetea la colección de memoria si es necesario"""
         try:
-            self.chroma_client.delete_collection(name=self.situation_collection.name)
-            self.situation_collection = self.chroma_client.create_collection(name=self.situation_collection.name)
+            self.situation_collection = self.store.reset_collection(self.situation_collection.name)
+            self.store.reset_collection(chunk_collection_name(self.situation_collection.name))
+            self._unindexed = set()
+            self._stored_dimension = None
         except Exception:
             pass
 
+    def _forget_deleted(self, ids):
+        """Drop records deleted through the store from the unindexed set, so queries skip them"""
+        with self._chunk_index_lock:
+            if self._unindexed is not None:
+                self._unindexed -= set(ids)
+
+    def _peek_dimension(self):
+        """Dimension of the vectors already stored in the collection, None when it is empty"""
+        peek = self.situation_collection.get(limit=1, include=["embeddings"])
+        if not len(peek["ids"]):
+            return None
+        return len(peek["embeddings"][0])
+
+    def _check_dimension(self, dimension):
+        """Raise a ValueError when the embedding backend's vectors do not fit the stored ones"""
+        if self._stored_dimension is None:
+            return
+        if dimension != self._stored_dimension:
+            raise ValueError(
+                f"Memory collection '{self.situation_collection.name}' in {self.store.persist_directory} "
+                f"holds {self._stored_dimension}-dimensional vectors, but the embedding backend "
+                f"'{self.embedding_namespace}' produces {dimension}-dimensional vectors. Use a separate "
+                f"memory_persist_dir for each embedding backend (or reset the collection and re-add the situations)."
+            )
+
+    def _checked(self, vectors):
+        for vector in vectors:
+            if vector is not None:
+                self._check_dimension(len(vector))
+                break
+        return vectors
+
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
         import logging
@@ -68,9 +147,34 @@ class FinancialSituationMemory:
             logger.warning("Empty text cannot create embedding")
             return None
 
+        if self.embedding_cache is None:
+            vector = self._request_embedding(text)
+        else:
+            vector = self.embedding_cache.get_or_embed(
+                self.embedding_namespace, text, lambda: self._request_embedding(text)
+            )
+        return self._checked([vector])[0]
+
+    def _request_embedding(self, text):
+        """Request the embedding of a validated text (None on failure)"""
+        import logging
+        logger = logging.getLogger(__name__)
+
+        # 离线基准测试使用确定性的哈希向量
+        if self.mock:
+            from tradingagents.graph.mock_llm import mock_embedding
+            return mock_embedding(text)
+
+        if self.local_embedder is not None:
+            return self._request_embeddings([text])[0]
+
         try:
-            response = self.embedding_client.embeddings.create(
-                model=self.embedding, input=text
+            response = scheduled_call(
+                self.config,
+                self.embedding_url,
+                lambda: self.embedding_client.embeddings.create(
+                    model=self.embedding, input=text
+                ),
             )
 
             # 验证响应
@@ -88,49 +192,442 @@ class FinancialSituationMemory:
             logger.exception(f"Failed to create embedding: {e}")
             return None
 
-    def add_situations(self, situations_and_advice, extra_metadata=None):
+    def _request_embeddings(self, texts):
+        """Request the embeddings of a batch of validated texts in one call
+
+        Returns:
+            List in input order, None for every item the response did not cover
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        if self.mock:
+            from tradingagents.graph.mock_llm import mock_embedding
+            return [mock_embedding(text) for text in texts]
+
+        if self.local_embedder is not None:
+            try:
+                return self.local_embedder.embed(texts)
+            except Exception as e:
+                logger.exception(f"Local embedding of {len(texts)} texts failed: {e}")
+                return [None] * len(texts)
+
+        try:
+            response = scheduled_call(
+                self.config,
+                self.embedding_url,
+                lambda: self.embedding_client.embeddings.create(
+                    model=self.embedding, input=list(texts)
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Embedding batch of {len(texts)} failed: {e}")
+            return [None] * len(texts)
+
+        vectors = [None] * len(texts)
+        for position, item in enumerate(getattr(response, "data", None) or []):
+            # 按返回的 index 对齐，服务端可能乱序或缺少部分条目
+            index = getattr(item, "index", None)
+            index = position if index is None else index
+            if 0 <= index < len(texts):
+                vectors[index] = item.embedding
+        return vectors
+
+    def _embed_batched(self, texts, batch_size, max_concurrency, progress):
+        """Embed distinct, validated texts in concurrent batches, retrying only failed items"""
+        import logging
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        logger = logging.getLogger(__name__)
+
+        max_retries = self.config.get("embedding_max_retries", 2)
+        total = len(texts)
+        done = 0
+        vectors = {}
+        if progress and total:
+            progress(done, total)
+
+        pending = list(texts)
+        attempt = 0
+        while pending:
+            batches = [pending[k:k + batch_size] for k in range(0, len(pending), batch_size)]
+            failed = []
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+                futures = {executor.submit(self._request_embeddings, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    for text, vector in zip(batch, future.result()):
+                        if vector is None:
+                            failed.append(text)
+                        else:
+                            vectors[text] = vector
+                            done += 1
+                    if progress:
+                        progress(done, total)
+
+            if not failed or attempt >= max_retries:
+                if failed:
+                    logger.error(f"{len(failed)} of {total} embeddings failed after {attempt} retries")
+                break
+            # 只重试失败的条目；批次减半，避免个别超长输入拖累整批
+            attempt += 1
+            batch_size = max(1, batch_size // 2)
+            logger.warning(f"Retrying {len(failed)} failed embeddings (attempt {attempt}/{max_retries})")
+            pending = failed
+
+        return [vectors.get(text) for text in texts]
+
+    def get_embeddings(self, texts, batch_size=None, max_concurrency=None, progress=None):
+        """Get embeddings for many texts with batched, concurrent requests
+
+        Args:
+            texts: List of texts
+            batch_size: Inputs per embeddings request (default: config "embedding_batch_size")
+            max_concurrency: Requests in flight at once (default: config "embedding_max_concurrency")
+            progress: Optional callback progress(done, total) over the texts that need a request
+
+        Returns:
+            List of embeddings in input order; None for invalid texts and for items
+            that still failed after config "embedding_max_retries" retries
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        batch_size = max(1, batch_size or self.config.get("embedding_batch_size", 64))
+        max_concurrency = max(1, max_concurrency or self.config.get("embedding_max_concurrency", 4))
+
+        valid = [isinstance(text, str) and bool(text.strip()) for text in texts]
+        if not all(valid):
+            logger.warning(f"Skipping {valid.count(False)} empty or invalid texts for embedding")
+
+        # 相同文本只请求一次；已缓存或其他调用正在请求的文本不再请求
+        distinct = list(dict.fromkeys(text for text, ok in zip(texts, valid) if ok))
+
+        def embed(batch):
+            return self._embed_batched(batch, batch_size, max_concurrency, progress)
+
+        if self.embedding_cache is None:
+            vectors = embed(distinct) if distinct else []
+        else:
+            vectors = self.embedding_cache.get_or_embed_many(self.embedding_namespace, distinct, embed)
+        by_text = dict(zip(distinct, self._checked(vectors)))
+        return [by_text.get(text) if ok else None for text, ok in zip(texts, valid)]
+
+    def _chunk_collection(self):
+        return self.store.collection(chunk_collection_name(self.situation_collection.name))
+
+    def _add_chunks(self, parent_ids, metadatas, chunk_lists, chunk_vectors):
+        """Store one vector per chunk under its parent id"""
+        ids, documents, chunk_metadatas, embeddings = [], [], [], []
+        for parent_id, metadata, chunks, vectors in zip(parent_ids, metadatas, chunk_lists, chunk_vectors):
+            # 分块带上父记录的额外 metadata（如 decision_id），便于按条件一并删除
+            shared = {k: v for k, v in metadata.items() if k not in ("recommendation", "chunks")}
+            for index, (chunk, vector) in enumerate(zip(chunks, vectors)):
+                if vector is None:
+                    continue
+                ids.append(f"{parent_id}:{index}")
+                documents.append(chunk)
+                chunk_metadatas.append({**shared, "parent_id": parent_id, "chunk_index": index})
+                embeddings.append(vector)
+        if ids:
+            self._chunk_collection().add(
+                documents=documents, metadatas=chunk_metadatas, embeddings=embeddings, ids=ids
+            )
+
+    def _embed_chunked(self, situations, progress=None):
+        """Split situations into chunks and embed all chunks in batches
+
+        Returns:
+            (chunk lists, chunk vector lists, parent vectors); a parent vector is the
+            normalized mean of its chunk vectors, None when no chunk could be embedded
+        """
+        max_chars = self.config.get("memory_chunk_chars", 1500)
+        overlap = self.config.get("memory_chunk_overlap", 200)
+        chunk_lists = [split_situation(situation, max_chars, overlap) for situation in situations]
+        flat = self.get_embeddings([chunk for chunks in chunk_lists for chunk in chunks], progress=progress)
+
+        chunk_vectors, parent_vectors = [], []
+        position = 0
+        for chunks in chunk_lists:
+            vectors = flat[position:position + len(chunks)]
+            position += len(chunks)
+            chunk_vectors.append(vectors)
+            embedded = [vector for vector in vectors if vector is not None]
+            if not embedded:
+                parent_vectors.append(None)
+                continue
+            mean = np.mean(np.asarray(embedded, dtype=np.float32), axis=0)
+            norm = float(np.linalg.norm(mean)) or 1.0
+            parent_vectors.append((mean / norm).tolist())
+        return chunk_lists, chunk_vectors, parent_vectors
+
+    def _unindexed_ids(self):
+        """Ids of stored situations without chunk vectors (listed once, then kept up to date)"""
+        with self._chunk_index_lock:
+            if self._unindexed is None:
+                existing = self.situation_collection.get(include=["metadatas"])
+                self._unindexed = {
+                    record_id
+                    for record_id, metadata in zip(existing["ids"], existing["metadatas"])
+                    if "chunks" not in (metadata or {})
+                }
+            return set(self._unindexed)
+
+    def build_chunk_index(self, progress=None):
+        """Chunk-index situations stored before chunking was enabled
+
+        Run at startup or as an explicit migration step, not from the query path.
+        Situations whose chunks cannot be embedded stay unindexed and are still
+        matched by their parent vector; calling this again retries them.
+
+        Returns:
+            Number of situations that are still unindexed
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        if not self.chunking:
+            return 0
+        pending = self._unindexed_ids()
+        if not pending:
+            return 0
+
+        existing = self.situation_collection.get(ids=sorted(pending), include=["metadatas", "documents"])
+        legacy = [
+            (record_id, document, metadata or {})
+            for record_id, document, metadata in zip(
+                existing["ids"], existing["documents"], existing["metadatas"]
+            )
+        ]
+        logger.info(f"Chunk-indexing {len(legacy)} stored situations in {self.situation_collection.name}")
+        chunk_lists, chunk_vectors, _ = self._embed_chunked(
+            [document for _, document, _ in legacy], progress=progress
+        )
+        indexed = [i for i, vectors in enumerate(chunk_vectors) if any(v is not None for v in vectors)]
+        if indexed:
+            self._add_chunks(
+                [legacy[i][0] for i in indexed],
+                [legacy[i][2] for i in indexed],
+                [chunk_lists[i] for i in indexed],
+                [chunk_vectors[i] for i in indexed],
+            )
+            self.situation_collection.update(
+                ids=[legacy[i][0] for i in indexed],
+                metadatas=[{**legacy[i][2], "chunks": len(chunk_lists[i])} for i in indexed],
+            )
+
+        with self._chunk_index_lock:
+            self._unindexed -= {legacy[i][0] for i in indexed}
+            remaining = len(self._unindexed)
+        if remaining:
+            logger.warning(
+                f"{remaining} stored situations in {self.situation_collection.name} could not be "
+                f"chunk-indexed; they are matched by their parent vector until indexed"
+            )
+        return remaining
+
+    def add_situations(self, situations_and_advice, extra_metadata=None, progress=None):
         """
         Add financial situations and their corresponding advice.
 
         Args:
             situations_and_advice: List of tuples (situation, recommendation)
             extra_metadata: Optional dict with additional metadata (e.g., {"decision_id": "uuid"})
+            progress: Optional callback progress(done, total) while the situations
+                (or, with chunking, their chunks) are embedded
+
+        Returns:
+            Number of situations written (those whose embedding failed are skipped)
         """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        situations_and_advice = list(situations_and_advice)
+        texts = [situation for situation, _ in situations_and_advice]
+        if self.chunking:
+            chunk_lists, chunk_vectors, embedded = self._embed_chunked(texts, progress=progress)
+        else:
+            embedded = self.get_embeddings(texts, progress=progress)
 
         situations = []
         advice = []
         ids = []
         embeddings = []
+        kept = []
 
-        offset = self.situation_collection.count()
-
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for position, ((situation, recommendation), embedding) in enumerate(zip(situations_and_advice, embedded)):
+            if embedding is None:
+                continue
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            # 随机 id：按 count() 编号在删除记录后会与已有 id 重复，Chroma 会静默丢弃重复 id 的记录
+            ids.append(uuid.uuid4().hex)
+            embeddings.append(embedding)
+            kept.append(position)
+
+        skipped = len(situations_and_advice) - len(ids)
+        if skipped:
+            logger.warning(f"Skipped {skipped} situations without an embedding")
+        if not ids:
+            return 0
 
         # 构建metadata列表
         metadatas = []
-        for rec in advice:
+        for position, rec in zip(kept, advice):
             metadata = {"recommendation": rec}
             # 如果提供了额外的metadata，合并进去
             if extra_metadata:
                 metadata.update(extra_metadata)
+            if self.chunking:
+                metadata["chunks"] = len(chunk_lists[position])
             metadatas.append(metadata)
 
+        # 分块先写入，查询时只会命中父记录已存在的分块
+        if self.chunking:
+            self._add_chunks(
+                ids, metadatas, [chunk_lists[i] for i in kept], [chunk_vectors[i] for i in kept]
+            )
         self.situation_collection.add(
             documents=situations,
             metadatas=metadatas,
             embeddings=embeddings,
             ids=ids,
         )
+        if self._stored_dimension is None:
+            self._stored_dimension = len(embeddings[0])
+        # 以实际写入的记录数为准
+        return len(self.situation_collection.get(ids=ids, include=[])["ids"])
+
+    def _pool_chunk_scores(self, query_embeddings, parent_ids, chunk_collection):
+        """Score candidate parents against every query chunk and pool per parent
+
+        Each (query chunk, parent) pair gets the similarity of the parent's closest
+        chunk, computed from all of the parent's chunk vectors rather than only the
+        chunks that made a query chunk's top hits, so "mean" averages over every
+        query chunk instead of only the ones where the parent ranked high.
+        """
+        if not parent_ids:
+            return {}
+        stored = chunk_collection.get(
+            where={"parent_id": {"$in": parent_ids}}, include=["embeddings", "metadatas"]
+        )
+        if not len(stored["ids"]):
+            return {}
+        chunks = np.asarray(stored["embeddings"], dtype=np.float32)
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        # 与 Chroma 默认的 l2 距离（平方欧氏距离）一致，得分同样为 1 - 距离
+        distances = (
+            (queries ** 2).sum(axis=1)[:, None]
+            + (chunks ** 2).sum(axis=1)[None, :]
+            - 2 * queries @ chunks.T
+        )
+        similarities = 1 - distances
+
+        columns = {}
+        for column, metadata in enumerate(stored["metadatas"]):
+            columns.setdefault(metadata["parent_id"], []).append(column)
+        mean_pooling = self.config.get("memory_chunk_pooling", "max") == "mean"
+        scores = {}
+        for parent_id, parent_columns in columns.items():
+            # 每个查询分块取父记录中最相似的分块，再按 max/mean 汇总所有查询分块
+            best = similarities[:, parent_columns].max(axis=1)
+            scores[parent_id] = float(best.mean() if mean_pooling else best.max())
+        return scores
+
+    def _get_chunked_memories(self, current_situation, n_matches):
+        """Match query chunks against stored chunks and pool the scores per parent
+
+        Situations that are not chunk-indexed yet are matched by their parent vector.
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+
+        chunk_collection = self._chunk_collection()
+        chunk_count = chunk_collection.count()
+        unindexed = self._unindexed_ids()
+        if not chunk_count and not unindexed:
+            return []
+
+        scores = {}
+        documents = {}
+        if chunk_count:
+            query_chunks = split_situation(
+                current_situation,
+                self.config.get("memory_chunk_chars", 1500),
+                self.config.get("memory_chunk_overlap", 200),
+            )
+            query_embeddings = [v for v in self.get_embeddings(query_chunks) if v is not None]
+            if not query_embeddings:
+                logger.warning("Failed to create query embedding, returning empty results")
+                return []
+
+            candidates = n_matches * self.config.get("memory_chunk_candidates", 10)
+            results = chunk_collection.query(
+                query_embeddings=query_embeddings,
+                n_results=min(candidates, chunk_count),
+                include=["metadatas"],
+            )
+
+            # 候选父记录：任一查询分块的前 candidates 个命中分块所属的父记录
+            candidate_ids = sorted({
+                metadata["parent_id"] for metadatas in results["metadatas"] for metadata in metadatas
+            })
+            scores = self._pool_chunk_scores(query_embeddings, candidate_ids, chunk_collection)
+
+        if unindexed:
+            # 未分块的旧记录按整段情境的向量匹配，迁移失败时也不会从检索中消失
+            query_embedding = self.get_embedding(current_situation)
+            if query_embedding is not None:
+                results = self.situation_collection.query(
+                    query_embeddings=[query_embedding],
+                    ids=sorted(unindexed),
+                    n_results=min(n_matches, len(unindexed)),
+                    include=["metadatas", "documents", "distances"],
+                )
+                for parent_id, document, metadata, distance in zip(
+                    results["ids"][0], results["documents"][0],
+                    results["metadatas"][0], results["distances"][0],
+                ):
+                    scores[parent_id] = max(scores.get(parent_id, float("-inf")), 1 - distance)
+                    documents[parent_id] = (document, metadata)
+            elif not scores:
+                logger.warning("Failed to create query embedding, returning empty results")
+                return []
+
+        ranked = sorted(((score, parent_id) for parent_id, score in scores.items()), reverse=True)[:n_matches]
+        if not ranked:
+            return []
+
+        missing = [parent_id for _, parent_id in ranked if parent_id not in documents]
+        if missing:
+            parents = self.situation_collection.get(ids=missing, include=["metadatas", "documents"])
+            for parent_id, document, metadata in zip(parents["ids"], parents["documents"], parents["metadatas"]):
+                documents[parent_id] = (document, metadata)
+
+        matched_results = []
+        for score, parent_id in ranked:
+            if parent_id not in documents:
+                continue
+            document, metadata = documents[parent_id]
+            matched_results.append(
+                {
+                    "matched_situation": document,
+                    "recommendation": metadata["recommendation"],
+                    "similarity_score": score,
+                }
+            )
+        return matched_results
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
         import logging
         logger = logging.getLogger(__name__)
 
+        if self.chunking:
+            if not current_situation or not isinstance(current_situation, str) or not current_situation.strip():
+                logger.warning("Failed to create query embedding, returning empty results")
+                return []
+            return self._get_chunked_memories(current_situation, n_matches)
+
         query_embedding = self.get_embedding(current_situation)
 
         if query_embedding is None:
@@ -0,0 +1,177 @@
+"""
+记忆存储服务
+同一个 memory_persist_dir 只打开一个 chromadb.PersistentClient，由它分发各角色的记忆集合；
+支持跨集合查询和删除（如按 decision_id 删除所有角色中的同一条学习记录）；
+每个角色集合可以有一个存放分块向量的 <角色>_chunks 集合，删除时一并处理，并通知使用该集合的记忆实例
+"""
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import chromadb
+from chromadb.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# TradingAgentsGraph 使用的记忆角色（集合名）
+MEMORY_ROLES = (
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+)
+
+# 分块向量集合名后缀
+CHUNK_SUFFIX = "_chunks"
+
+
+def chunk_collection_name(name: str) -> str:
+    return f"{name}{CHUNK_SUFFIX}"
+
+
+def memory_persist_dir(config: Dict[str, Any]) -> str:
+    """配置中的记忆持久化目录"""
+    return os.path.abspath(
+        config.get("memory_persist_dir", os.path.join(config.get("project_dir", "."), "memory_db"))
+    )
+
+
+class MemoryStore:
+    """持有单个 PersistentClient 的记忆集合服务"""
+
+    def __init__(self, persist_directory: str):
+        """
+        初始化记忆存储
+
+        Args:
+            persist_directory: ChromaDB 持久化目录
+        """
+        self.persist_directory = persist_directory
+        os.makedirs(persist_directory, exist_ok=True)
+        self.client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(allow_reset=True)
+        )
+        self._collections: Dict[str, Any] = {}
+        # 集合名 -> 删除记录后调用的回调（弱引用，记忆实例释放后自动失效）
+        self._delete_listeners: Dict[str, List[weakref.WeakMethod]] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str):
+        """返回角色的集合，不存在时创建"""
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self.client.get_or_create_collection(name=name)
+                self._collections[name] = collection
+            return collection
+
+    def existing_collection(self, name: str):
+        """返回已存在的集合，不存在时抛出异常（只读操作不创建空集合）"""
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self.client.get_collection(name=name)
+                self._collections[name] = collection
+            return collection
+
+    def reset_collection(self, name: str):
+        """清空角色的集合，返回新的集合"""
+        with self._lock:
+            try:
+                self.client.delete_collection(name=name)
+            except Exception:
+                pass
+            collection = self.client.create_collection(name=name)
+            self._collections[name] = collection
+            return collection
+
+    def add_delete_listener(self, name: str, callback: Callable[[List[str]], None]):
+        """delete_where 删除集合中的记录后调用 callback(ids)；callback 须为绑定方法，按弱引用持有"""
+        with self._lock:
+            self._delete_listeners.setdefault(name, []).append(weakref.WeakMethod(callback))
+
+    def _notify_deleted(self, name: str, ids: List[str]):
+        with self._lock:
+            listeners = self._delete_listeners.get(name, [])
+            callbacks = [callback for callback in (ref() for ref in listeners) if callback is not None]
+            listeners[:] = [ref for ref in listeners if ref() is not None]
+        for callback in callbacks:
+            callback(ids)
+
+    def get_where(self, where: Dict[str, Any], roles: Optional[Iterable[str]] = None,
+                  include=("metadatas", "documents")) -> Dict[str, Dict[str, Any]]:
+        """
+        在多个集合中按 metadata 条件查询
+
+        Args:
+            where: ChromaDB where 条件，如 {"decision_id": "..."}
+            roles: 要查询的集合，默认 MEMORY_ROLES
+            include: 返回的字段
+
+        Returns:
+            集合名 -> ChromaDB get 结果；查询失败的集合为 {"ids": [], "error": "..."}
+        """
+        results = {}
+        for role in roles or MEMORY_ROLES:
+            try:
+                results[role] = self.existing_collection(role).get(where=where, include=list(include))
+            except Exception as e:
+                results[role] = {"ids": [], "error": str(e)}
+        return results
+
+    def delete_where(self, where: Dict[str, Any],
+                     roles: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        在多个集合中删除满足 metadata 条件的记录
+
+        Returns:
+            集合名 -> {"deleted": 数量, "ids": [...], "chunks_deleted": 分块数量}，失败的集合带 "error"
+        """
+        results = {}
+        for role, found in self.get_where(where, roles, include=()).items():
+            if "error" in found:
+                results[role] = {"deleted": 0, "error": found["error"]}
+                continue
+            ids = found.get("ids") or []
+            try:
+                if ids:
+                    self.existing_collection(role).delete(ids=ids)
+                results[role] = {"deleted": len(ids), "ids": ids}
+            except Exception as e:
+                results[role] = {"deleted": 0, "error": str(e)}
+                continue
+            if ids:
+                self._notify_deleted(role, ids)
+            results[role]["chunks_deleted"] = self._delete_chunks(role, where)
+        return results
+
+    def _delete_chunks(self, role: str, where: Dict[str, Any]) -> int:
+        """删除角色分块集合中满足条件的分块，没有分块集合时返回 0"""
+        try:
+            chunks = self.existing_collection(chunk_collection_name(role))
+        except Exception:
+            return 0
+        ids = chunks.get(where=where, include=[]).get("ids") or []
+        if ids:
+            chunks.delete(ids=ids)
+        return len(ids)
+
+
+# 全局记忆存储实例（按持久化目录共享）
+_global_stores: Dict[str, MemoryStore] = {}
+_global_stores_lock = threading.Lock()
+
+
+def get_memory_store(config: Dict[str, Any]) -> MemoryStore:
+    """返回配置的持久化目录对应的共享记忆存储"""
+    persist_directory = memory_persist_dir(config)
+    with _global_stores_lock:
+        store = _global_stores.get(persist_directory)
+        if store is None:
+            store = MemoryStore(persist_directory)
+            _global_stores[persist_directory] = store
+    return store
@@ -465,6 +465,11 @@ class ParadexDataManager:
             return {"error": f"获取风险指标失败: {str(e)}"}
 
 
+def paradex_configured() -> bool:
+    """Paradex SDK 可用且设置了 PARADEX_ADDR 和 PARADEX_KEY"""
+    return _paradex_py_available and bool(os.getenv('PARADEX_ADDR')) and bool(os.getenv('PARADEX_KEY'))
+
+
 # 全局实例
 _paradex_manager = None
 
@@ -0,0 +1,123 @@
+"""
+分析师工具节点
+同一轮中模型并行发出的多个工具调用同时执行（本轮耗时取决于最慢的工具而不是所有工具之和），
+每个调用带超时，并记录到 ToolMonitor
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt import ToolNode
+
+from .tool_monitor import get_tool_monitor
+
+logger = logging.getLogger(__name__)
+
+
+# 全局工具线程池实例（同步工具多为阻塞的 HTTP 请求，事件循环默认线程池在少核机器上只有几个线程）
+_tool_executor: Optional[ThreadPoolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor(max_workers: int = 32) -> ThreadPoolExecutor:
+    """返回共享的工具线程池（线程数取自首次创建时的配置）"""
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="tradingagents-tool"
+            )
+        return _tool_executor
+
+
+def _call_params(call: Dict[str, Any]) -> Dict[str, Any]:
+    """与 monitor_tool 相同的参数记录格式"""
+    return {
+        "args": [],
+        "kwargs": {k: str(v)[:100] for k, v in (call.get("args") or {}).items()},
+    }
+
+
+class ParallelToolNode(ToolNode):
+    """带超时和监控的 ToolNode
+
+    异步执行时一轮中的所有工具调用并发运行，同步工具在共享的工具线程池中执行；
+    超时的调用返回 status="error" 的 ToolMessage，模型可以据此继续分析而不是让整个节点失败。
+    线程中的同步工具无法被中断，超时后其结果会被丢弃。
+    """
+
+    def __init__(
+        self,
+        tools,
+        *,
+        timeout: Optional[float] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            tools: 工具列表
+            timeout: 单个工具调用的超时时间（秒），None 表示不限
+            executor: 执行同步工具的线程池，None 时使用共享的工具线程池
+        """
+        super().__init__(tools, **kwargs)
+        self.timeout = timeout
+        self.executor = executor or get_tool_executor()
+
+    def _record(self, call: Dict[str, Any], message: Any, started: float):
+        try:
+            error = None
+            result = None
+            if isinstance(message, ToolMessage):
+                content = message.content if isinstance(message.content, str) else str(message.content)
+                if message.status == "error":
+                    error = RuntimeError(content)
+                else:
+                    result = content
+            get_tool_monitor().log_tool_call(
+                tool_name=call["name"],
+                params=_call_params(call),
+                result=result,
+                error=error,
+                execution_time=time.time() - started,
+            )
+        except Exception as e:
+            # 监控失败不影响工具结果
+            logger.debug(f"Tool monitor failed for {call.get('name')}: {e}")
+
+    def _run_one(self, call, input_type, config):
+        started = time.time()
+        message = super()._run_one(call, input_type, config)
+        self._record(call, message, started)
+        return message
+
+    async def _arun_one(self, call, input_type, config):
+        started = time.time()
+        tool = self.tools_by_name.get(call["name"])
+        if tool is not None and getattr(tool, "coroutine", None) is None:
+            # 同步工具直接在工具线程池中走同步路径（回调和上下文变量随 context 一起传入）
+            run = asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(copy_context().run, ToolNode._run_one, self, call, input_type, config),
+            )
+        else:
+            run = super()._arun_one(call, input_type, config)
+
+        try:
+            message = await asyncio.wait_for(run, self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool {call['name']} timed out after {self.timeout}s")
+            message = ToolMessage(
+                content=f"Error: tool {call['name']} timed out after {self.timeout}s; continue without this data.",
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error",
+            )
+        self._record(call, message, started)
+        return message
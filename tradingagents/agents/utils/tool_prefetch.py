@@ -0,0 +1,136 @@
+"""
+分析师工具预取
+分析师提示词中参数固定的工具调用（如加密货币市场分析的 9 个 Binance 数据工具）在分析师首轮 LLM 调用之前
+按资产类型并发执行，结果以已完成的工具调用形式放入分析师上下文，省去只用于"决定调用工具"的 LLM 往返
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from .agent_utils import detect_asset_type
+
+logger = logging.getLogger(__name__)
+
+# 预取产生的工具调用消息的 name，用于和模型自己发出的工具调用区分
+PREFETCH_MESSAGE_NAME = "tool_prefetch"
+
+# 股票市场分析师提示词要求逐个获取的指标
+STOCK_MARKET_INDICATORS = [
+    "rsi", "macd", "macds", "macdh", "boll", "boll_ub", "boll_lb",
+    "close_50_sma", "close_200_sma", "atr", "vwma",
+]
+
+
+def is_prefetch_message(message) -> bool:
+    return isinstance(message, AIMessage) and message.name == PREFETCH_MESSAGE_NAME
+
+
+def _days_before(trade_date, days: int) -> str:
+    current = datetime.strptime(str(trade_date)[:10], "%Y-%m-%d")
+    return (current - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _crypto_market_plan(ticker: str, trade_date: str, tools) -> List[tuple]:
+    """与加密货币市场分析师提示词中的工具参数保持一致"""
+    end_date = str(trade_date)[:10]
+    return [
+        ("get_crypto_market_data", {
+            "symbol": ticker, "start_date": _days_before(trade_date, 7),
+            "end_date": end_date, "interval": "4h",
+        }),
+        ("get_crypto_technical_indicators", {
+            "symbol": ticker, "interval": "4h",
+            "indicators": ["rsi", "macd", "boll", "volume_profile"],
+            "start_date": _days_before(trade_date, 60), "end_date": end_date,
+        }),
+        ("get_crypto_orderbook_depth", {"symbol": ticker, "limit": 20}),
+        ("get_crypto_whale_trades", {"symbol": ticker}),
+        ("get_crypto_open_interest", {"symbol": ticker, "period": "5m", "limit": 48}),
+        ("get_crypto_funding_rate", {"symbol": ticker, "limit": 100}),
+        ("get_crypto_long_short_ratio", {"symbol": ticker, "period": "1h", "limit": 30}),
+        ("get_crypto_liquidations", {"symbol": ticker, "limit": 100}),
+        ("get_crypto_market_sentiment", {"symbol": ticker, "source": "funding"}),
+    ]
+
+
+def _stock_market_plan(ticker: str, trade_date: str, tools) -> List[tuple]:
+    """与股票市场分析师提示词中的工具参数保持一致（30 天行情和逐个指标）"""
+    end_date = str(trade_date)[:10]
+    price_tool, indicator_tool = tools[0].name, tools[1].name
+    plan = [(price_tool, {
+        "symbol": ticker, "start_date": _days_before(trade_date, 30), "end_date": end_date,
+    })]
+    plan.extend(
+        (indicator_tool, {"symbol": ticker, "indicator": indicator, "curr_date": end_date})
+        for indicator in STOCK_MARKET_INDICATORS
+    )
+    return plan
+
+
+# (分析师类型, 资产类型) -> 预取计划
+PREFETCH_PLANS: Dict[tuple, Callable] = {
+    ("market", "crypto"): _crypto_market_plan,
+    ("market", "stock"): _stock_market_plan,
+    ("market", "index"): _stock_market_plan,
+}
+
+
+def prefetch_tool_calls(analyst_type: str, ticker: str, trade_date: str, toolkit) -> List[Dict[str, Any]]:
+    """返回该分析师和标的的预取工具调用，没有预取计划时返回空列表"""
+    plan = PREFETCH_PLANS.get((analyst_type, detect_asset_type(ticker)))
+    if plan is None or not hasattr(toolkit, "get_tools_for_analyst"):
+        return []
+    tools = toolkit.get_tools_for_analyst(analyst_type, ticker)
+    # 只预取分析师本来就能调用的工具
+    available = {tool.name for tool in tools}
+    return [
+        {"name": name, "args": args, "id": _prefetch_call_id(index, name, args), "type": "tool_call"}
+        for index, (name, args) in enumerate(plan(ticker, trade_date, tools))
+        if name in available
+    ]
+
+
+def _prefetch_call_id(index: int, name: str, args: Dict[str, Any]) -> str:
+    """由调用内容生成固定的 id：同一请求的提示词保持不变，LLM 缓存和服务商前缀缓存才能命中"""
+    payload = json.dumps([index, name, args], sort_keys=True, ensure_ascii=False, default=str)
+    return f"prefetch_{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]}"
+
+
+def create_prefetch_node(analyst_type: str, toolkit, tool_node, skip: Optional[Callable] = None):
+    """创建分析师之前的预取节点
+
+    通过分析师自己的工具节点执行（并发、超时和监控与正常工具调用相同），
+    返回一条带工具调用的 AIMessage 及对应的 ToolMessage；没有预取计划时不修改状态。
+    skip(state) 返回 True 时（如分析师报告已缓存）不预取。
+    """
+
+    async def prefetch_node(state, config=None):
+        if skip is not None and skip(state):
+            logger.info(f"Skipping tool prefetch for cached {analyst_type} analyst report")
+            return {}
+        tool_calls = prefetch_tool_calls(
+            analyst_type, state["company_of_interest"], state["trade_date"], toolkit
+        )
+        if not tool_calls:
+            return {}
+
+        request = AIMessage(content="", tool_calls=tool_calls, name=PREFETCH_MESSAGE_NAME)
+        try:
+            result = await tool_node.ainvoke({"messages": [request]}, config)
+        except Exception as e:
+            # 预取失败时由分析师按原流程自行调用工具
+            logger.warning(f"Tool prefetch for {analyst_type} analyst failed: {e}")
+            return {}
+
+        tool_messages = [m for m in result.get("messages", []) if isinstance(m, ToolMessage)]
+        logger.info(
+            f"Prefetched {len(tool_messages)} tool results for {analyst_type} analyst "
+            f"({state['company_of_interest']})"
+        )
+        return {"messages": [request, *tool_messages]}
+
+    return prefetch_node
@@ -0,0 +1,154 @@
+"""
+共享 HTTP 连接池
+按 (base_url, api_key) 为进程内所有 OpenAI 兼容客户端（图中的 LLM、记忆 embedding、网络搜索、API 验证）
+提供长连接复用的 httpx 客户端，避免每次调用都重新建立 TCP/TLS 连接
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+# 可选依赖：安装 h2 后启用 HTTP/2
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_ClientKey = Tuple[str, Optional[str]]
+
+
+def _client_options(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """根据配置生成 httpx 客户端参数"""
+    if config is None:
+        from .config import get_config
+        config = get_config()
+    timeout = config.get("http_timeout", 600.0)
+    return {
+        "limits": httpx.Limits(
+            max_connections=config.get("http_max_connections", 100),
+            max_keepalive_connections=config.get("http_max_keepalive_connections", 20),
+            keepalive_expiry=config.get("http_keepalive_expiry", 30.0),
+        ),
+        "timeout": httpx.Timeout(timeout, connect=min(10.0, timeout)),
+        "http2": HTTP2_AVAILABLE and config.get("http2", True),
+        "follow_redirects": True,
+    }
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """按事件循环分别维护连接池的 AsyncClient
+
+    异步连接池绑定创建它的事件循环，跨循环复用会出错。请求在哪个循环上发出，
+    就转发给该循环自己的内部客户端；循环被回收后对应的连接池随之释放。
+    """
+
+    def __init__(self, **options: Any):
+        super().__init__(**options)
+        self._options = options
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._per_loop_lock = threading.Lock()
+
+    def _client_for_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._per_loop_lock:
+            client = self._per_loop.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(**self._options)
+                self._per_loop[loop] = client
+            return client
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return await self._client_for_loop().send(request, **kwargs)
+
+    async def aclose(self) -> None:
+        try:
+            client = self._client_for_loop()
+        except RuntimeError:
+            return
+        await client.aclose()
+
+
+# 全局连接池（按 base_url 和 api_key 共享）
+_sync_clients: Dict[_ClientKey, httpx.Client] = {}
+_async_clients: Dict[_ClientKey, LoopLocalAsyncClient] = {}
+_openai_clients: Dict[_ClientKey, OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(base_url: str, api_key: Optional[str] = None,
+                    config: Optional[Dict[str, Any]] = None) -> httpx.Client:
+    """返回共享的同步 httpx 客户端（连接池参数取自首次创建时的配置）"""
+    key = (base_url, api_key)
+    with _clients_lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = httpx.Client(**_client_options(config))
+            _sync_clients[key] = client
+        return client
+
+
+def get_async_http_client(base_url: str, api_key: Optional[str] = None,
+                          config: Optional[Dict[str, Any]] = None) -> httpx.AsyncClient:
+    """返回共享的异步 httpx 客户端，每个事件循环使用各自的连接池"""
+    key = (base_url, api_key)
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = LoopLocalAsyncClient(**_client_options(config))
+            _async_clients[key] = client
+        return client
+
+
+def get_openai_client(base_url: str, api_key: Optional[str] = None,
+                      config: Optional[Dict[str, Any]] = None) -> OpenAI:
+    """返回共享的 OpenAI 兼容客户端，api_key 为 None 时使用 OPENAI_API_KEY 环境变量"""
+    # 按实际使用的密钥区分，界面中修改环境变量里的密钥后会得到新的客户端
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    key = (base_url, api_key)
+    with _clients_lock:
+        client = _openai_clients.get(key)
+    if client is not None:
+        return client
+
+    client = OpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=get_http_client(base_url, api_key, config),
+    )
+    with _clients_lock:
+        return _openai_clients.setdefault(key, client)
+
+
+def openai_chat_http_kwargs(base_url: str, api_key: Optional[str] = None,
+                            config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """ChatOpenAI 的构造参数，让同步和异步调用都走共享连接池"""
+    # 与 get_openai_client 相同地解析密钥，使聊天模型和 embedding、网络搜索共用同一个连接池
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    return {
+        "http_client": get_http_client(base_url, api_key, config),
+        "http_async_client": get_async_http_client(base_url, api_key, config),
+    }
+
+
+def close_http_clients():
+    """关闭所有同步连接池（进程退出或测试清理时使用）"""
+    with _clients_lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+        _async_clients.clear()
+        _openai_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Closing HTTP client failed: {e}")
@@ -12,8 +12,11 @@ import os
 import pandas as pd
 from tqdm import tqdm
 import yfinance as yf
-from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
+from .llm_cache import cached_text_call, get_llm_cache
+from .rate_limiter import scheduled_call
+from .http_clients import get_openai_client
+from .search_cache import GLOBAL_SCOPE, cached_search
 
 
 def get_finnhub_news(
@@ -678,10 +681,22 @@ def call_llm_with_web_search(prompt: str, config: dict) -> str:
     Returns:
         str: LLM 的响应内容
     """
-    client = OpenAI(
-        base_url=config["backend_url"],
-        api_key=os.getenv("OPENAI_API_KEY")
+    # 启用 LLM 缓存时，相同 backend、模型和提示词的搜索结果直接复用；
+    # 未命中的请求经过统一调度，与聊天模型共享该服务商的配额
+    return cached_text_call(
+        get_llm_cache(config),
+        ["web_search", config["quick_think_llm"], prompt],
+        lambda: scheduled_call(
+            config,
+            config["backend_url"],
+            lambda: _call_llm_with_web_search(prompt, config),
+            count_tokens=None,
+        ),
     )
+
+
+def _call_llm_with_web_search(prompt: str, config: dict) -> str:
+    client = get_openai_client(config["backend_url"], config=config)
     
     # 检测是否是 OpenRouter
     if "openrouter" in config["backend_url"].lower():
@@ -793,18 +808,28 @@ def get_stock_news_openai(ticker, curr_date):
     config = get_config()
     prompt = f"Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period."
     
-    return call_llm_with_web_search(prompt, config)
+    return cached_search(
+        config, "stock_news", ticker.upper(), curr_date,
+        lambda: call_llm_with_web_search(prompt, config),
+    )
 
 
 def get_global_news_openai(curr_date):
     config = get_config()
     prompt = f"Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period."
     
-    return call_llm_with_web_search(prompt, config)
+    # 与标的无关，同一日期的多资产分析共享一次搜索
+    return cached_search(
+        config, "global_news", GLOBAL_SCOPE, curr_date,
+        lambda: call_llm_with_web_search(prompt, config),
+    )
 
 
 def get_fundamentals_openai(ticker, curr_date):
     config = get_config()
     prompt = f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc"
     
-    return call_llm_with_web_search(prompt, config)
+    return cached_search(
+        config, "fundamentals", ticker.upper(), curr_date,
+        lambda: call_llm_with_web_search(prompt, config),
+    )
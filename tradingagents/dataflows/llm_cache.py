@@ -0,0 +1,220 @@
+"""
+LLM 响应持久化缓存
+按 (provider, 模型, 规范化消息, 工具定义, 温度等参数) 做内容寻址，存放在本地 SQLite 文件中，
+用于历史日期回放和回测；回放模式下缓存未命中直接报错而不是调用 API
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMissError(RuntimeError):
+    """回放模式下请求未被缓存"""
+
+
+def _strip_message_ids(value: Any) -> Any:
+    """去掉序列化消息中的随机 id（LangGraph 会给每条消息分配 uuid），保证同一内容得到同一个 key"""
+    if isinstance(value, dict):
+        stripped = {k: _strip_message_ids(v) for k, v in value.items()}
+        kwargs = stripped.get("kwargs")
+        if stripped.get("lc") == 1 and isinstance(kwargs, dict):
+            kwargs.pop("id", None)
+        return stripped
+    if isinstance(value, list):
+        return [_strip_message_ids(v) for v in value]
+    return value
+
+
+def normalize_prompt(prompt: str) -> str:
+    """规范化 LangChain 序列化后的消息列表"""
+    try:
+        return json.dumps(_strip_message_ids(json.loads(prompt)), sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return prompt
+
+
+class SQLiteLLMCache(BaseCache):
+    """基于 SQLite 的 LangChain LLM 缓存，按总大小做 LRU 淘汰"""
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "",
+        max_bytes: int = 512 * 1024 * 1024,
+        replay: bool = False,
+    ):
+        """
+        初始化 LLM 缓存
+
+        Args:
+            path: SQLite 文件路径
+            namespace: 参与 key 计算的前缀（如 provider 和 backend_url），区分不同服务商的同名模型
+            max_bytes: 缓存总大小上限，超出后按最近访问时间淘汰
+            replay: 回放模式，未命中时抛出 LLMCacheMissError
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed_at ON llm_cache(accessed_at)"
+            )
+            self._conn.commit()
+
+    def make_key(self, prompt: str, llm_string: str) -> str:
+        payload = "\x1f".join([self.namespace, llm_string, normalize_prompt(prompt)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.make_key(prompt, llm_string)
+        value = self.get_text(key)
+        if value is None:
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations = loads(value)
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None:
+                # 让 LangGraph 为复用的回复分配新的消息 id，避免同一状态里 id 冲突
+                message.id = None
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.put_text(self.make_key(prompt, llm_string), dumps(list(return_val)))
+
+    def get_text(self, key: str) -> Optional[str]:
+        """按 key 读取缓存内容；回放模式下未命中会抛出 LLMCacheMissError"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+                return row[0]
+            self.stats["misses"] += 1
+        if self.replay:
+            raise LLMCacheMissError(f"LLM cache miss in replay mode (key {key[:12]})")
+        return None
+
+    def put_text(self, key: str, value: str):
+        """写入缓存内容，并在超过大小上限时淘汰最久未访问的条目"""
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 淘汰到上限的 90%，避免每次写入都触发淘汰
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= target:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+        self.stats["evicted"] += len(stale)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()[0]
+
+
+def cached_text_call(cache: Optional[SQLiteLLMCache], parts: Sequence[Any], call) -> str:
+    """对非 LangChain 的文本调用（如网络搜索）做缓存
+
+    Args:
+        cache: LLM 缓存，为 None 时直接调用
+        parts: 参与 key 计算的内容（provider、模型、提示词等）
+        call: 实际发起请求的无参函数
+    """
+    if cache is None:
+        return call()
+    key = hashlib.sha256(
+        json.dumps([cache.namespace, *parts], ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    cached = cache.get_text(key)
+    if cached is not None:
+        return json.loads(cached)
+    result = call()
+    if result:
+        cache.put_text(key, json.dumps(result, ensure_ascii=False))
+    return result
+
+
+# 全局 LLM 缓存实例（按配置共享）
+_global_caches: Dict[tuple, SQLiteLLMCache] = {}
+_global_caches_lock = threading.Lock()
+
+
+def get_llm_cache(config: Dict[str, Any]) -> Optional[SQLiteLLMCache]:
+    """根据配置返回共享的 LLM 缓存，未启用时返回 None"""
+    if not config.get("llm_cache_enabled", False):
+        return None
+
+    path = os.path.abspath(
+        config.get("llm_cache_path")
+        or os.path.join(config["data_cache_dir"], "llm_cache.sqlite")
+    )
+    namespace = f"{config.get('llm_provider', '')}|{config.get('backend_url', '')}"
+    replay = config.get("llm_cache_replay", False)
+    key = (path, namespace, replay)
+    with _global_caches_lock:
+        cache = _global_caches.get(key)
+        if cache is None:
+            cache = SQLiteLLMCache(
+                path,
+                namespace=namespace,
+                max_bytes=int(config.get("llm_cache_max_mb", 512) * 1024 * 1024),
+                replay=replay,
+            )
+            _global_caches[key] = cache
+    return cache
@@ -0,0 +1,355 @@
+"""
+LLM 请求调度
+按服务商（API 主机名）限制每分钟请求数和 token 数，交互式分析优先于后台学习，
+遇到 429 时按 Retry-After 暂停该服务商，并带抖动地指数退避重试
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 请求优先级：数值越小越优先
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_current_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """在上下文内发起的 LLM 请求使用指定优先级（如反思学习使用 BACKGROUND）"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def provider_key(url: Optional[str]) -> str:
+    """用 API 地址的主机名区分服务商，同一主机上的聊天、搜索和 embedding 共享配额"""
+    if not url:
+        return "default"
+    return urlparse(url).hostname or url
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判断异常是否为服务商的频率限制（HTTP 429）"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    name = type(error).__name__
+    return "RateLimit" in name or "ResourceExhausted" in name
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """从异常附带的响应头中读取 Retry-After（支持秒数、毫秒和 HTTP 日期）"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """重试等待时间：有 Retry-After 时以它为准并加少量抖动，否则使用全抖动指数退避"""
+    if retry_after is not None:
+        return min(max_delay, retry_after) + random.uniform(0, base_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class _TokenBucket:
+    """按分钟配额匀速补充的令牌桶，允许在记录实际用量时透支"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= amount
+
+
+class ProviderLimiter(BaseRateLimiter):
+    """单个服务商的限流器
+
+    每个请求消耗一个请求令牌；token 配额在响应返回后按实际用量扣减，
+    透支时后续请求等待配额恢复。作为 LangChain 聊天模型的 rate_limiter 使用时，
+    缓存命中的请求不会经过限流。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        check_every: float = 0.1,
+    ):
+        """
+        Args:
+            name: 服务商标识
+            requests_per_minute: 每分钟请求数上限，None 表示不限
+            tokens_per_minute: 每分钟 token 数上限，None 表示不限
+            check_every: 等待时的最短轮询间隔（秒）
+        """
+        self.name = name
+        self.check_every = check_every
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._interactive_waiting = 0
+        self.stats = {"requests": 0, "tokens": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _reserve(self, priority: int) -> float:
+        """尝试占用一个请求名额，成功返回 0，否则返回建议等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            if priority > INTERACTIVE and self._interactive_waiting:
+                wait = max(wait, self.check_every)
+            if self._requests is not None:
+                wait = max(wait, self._requests.wait_time(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.wait_time(0, now))
+            if wait > 0:
+                return wait
+            if self._requests is not None:
+                self._requests.consume(1, now)
+            self.stats["requests"] += 1
+            return 0.0
+
+    def _set_waiting(self, priority: int, delta: int):
+        if priority == INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting += delta
+
+    def _add_wait(self, seconds: float):
+        with self._lock:
+            self.stats["wait_seconds"] += seconds
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        priority = _current_priority.get()
+        wait = self._reserve(priority)
+        if wait <= 0 or not blocking:
+            return wait <= 0
+        start = time.monotonic()
+        self._set_waiting(priority, 1)
+        try:
+            while wait > 0:
+                time.sleep(max(self.check_every, min(wait, 1.0)))
+                wait = self._reserve(priority)
+        finally:
+            self._set_waiting(priority, -1)
+            self._add_wait(time.monotonic() - start)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        priority = _current_priority.get()
+        wait = self._reserve(priority)
+        if wait <= 0 or not blocking:
+            return wait <= 0
+        start = time.monotonic()
+        self._set_waiting(priority, 1)
+        try:
+            while wait > 0:
+                await asyncio.sleep(max(self.check_every, min(wait, 1.0)))
+                wait = self._reserve(priority)
+        finally:
+            self._set_waiting(priority, -1)
+            self._add_wait(time.monotonic() - start)
+        return True
+
+    def record_tokens(self, tokens: int):
+        """记录一次请求实际消耗的 token"""
+        if not tokens:
+            return
+        with self._lock:
+            self.stats["tokens"] += tokens
+            if self._tokens is not None:
+                self._tokens.consume(tokens, time.monotonic())
+
+    def penalize(self, seconds: float):
+        """收到 429 后暂停该服务商的所有请求"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self.stats["throttled"] += 1
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """把聊天模型的实际 token 用量和 429 错误反馈给限流器"""
+
+    run_inline = True
+
+    def __init__(self, limiter: ProviderLimiter, max_delay: float = 60.0):
+        self.limiter = limiter
+        self.max_delay = max_delay
+
+    def on_llm_end(self, response, **kwargs: Any):
+        total = 0
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    total += metadata.get("total_tokens", 0) or 0
+        if not total:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            total = token_usage.get("total_tokens", 0) or 0
+        self.limiter.record_tokens(total)
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any):
+        if is_rate_limit_error(error):
+            self.limiter.penalize(backoff_delay(0, retry_after_seconds(error), max_delay=self.max_delay))
+
+
+class LLMScheduler:
+    """所有 LLM、embedding 和网络搜索请求的统一调度入口"""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """
+        Args:
+            limits: 按服务商主机名配置的配额，如 {"openrouter.ai": {"requests_per_minute": 60}}；
+                "default" 用于未列出的服务商
+            max_retries: 429 后的最大重试次数
+            base_delay: 退避的基础等待时间（秒）
+            max_delay: 单次等待上限（秒）
+        """
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, key: str) -> ProviderLimiter:
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limits = self.limits.get(key) or self.limits.get("default") or {}
+                limiter = ProviderLimiter(
+                    key,
+                    requests_per_minute=limits.get("requests_per_minute"),
+                    tokens_per_minute=limits.get("tokens_per_minute"),
+                )
+                self._limiters[key] = limiter
+            return limiter
+
+    def chat_model_kwargs(self, url: Optional[str]) -> Dict[str, Any]:
+        """LangChain 聊天模型的构造参数：请求前限流，响应后记账，429 由 SDK 按 Retry-After 重试"""
+        limiter = self.limiter(provider_key(url))
+        return {
+            "rate_limiter": limiter,
+            "callbacks": [RateLimitCallbackHandler(limiter, self.max_delay)],
+            "max_retries": self.max_retries,
+        }
+
+    def call(self, key: str, func: Callable[[], Any], count_tokens: Optional[Callable[[Any], int]] = None):
+        """在限流下执行同步请求，遇到 429 时等待后重试
+
+        Args:
+            key: 服务商标识（见 provider_key）
+            func: 实际发起请求的无参函数
+            count_tokens: 从返回值中读取 token 用量的函数
+        """
+        limiter = self.limiter(key)
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            try:
+                result = func()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, retry_after_seconds(e), self.base_delay, self.max_delay)
+                logger.warning(f"{key} rate limited, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                limiter.penalize(delay)
+                continue
+            if count_tokens is not None:
+                try:
+                    limiter.record_tokens(count_tokens(result))
+                except Exception:
+                    pass
+            return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: dict(limiter.stats) for key, limiter in self._limiters.items()}
+
+
+def usage_total_tokens(response) -> int:
+    """读取 OpenAI SDK 响应中的 total_tokens"""
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", 0) or 0
+
+
+# 全局调度器实例（相同配额配置共享，保证同一进程内的多个分析共用配额）
+_global_schedulers: Dict[str, LLMScheduler] = {}
+_global_schedulers_lock = threading.Lock()
+
+
+def get_llm_scheduler(config: Dict[str, Any]) -> Optional[LLMScheduler]:
+    """根据配置返回共享的调度器，未启用时返回 None"""
+    if not config.get("rate_limit_enabled", False):
+        return None
+
+    limits = config.get("rate_limits") or {}
+    max_retries = config.get("llm_max_retries", 6)
+    key = json.dumps([limits, max_retries], sort_keys=True, default=str)
+    with _global_schedulers_lock:
+        scheduler = _global_schedulers.get(key)
+        if scheduler is None:
+            scheduler = LLMScheduler(limits, max_retries=max_retries)
+            _global_schedulers[key] = scheduler
+    return scheduler
+
+
+def scheduled_call(config: Dict[str, Any], url: Optional[str], func: Callable[[], Any],
+                   count_tokens: Optional[Callable[[Any], int]] = usage_total_tokens):
+    """通过全局调度器执行请求，未启用限流时直接调用"""
+    scheduler = get_llm_scheduler(config)
+    if scheduler is None:
+        return func()
+    return scheduler.call(provider_key(url), func, count_tokens)
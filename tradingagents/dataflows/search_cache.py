@@ -0,0 +1,176 @@
+"""
+网络搜索结果缓存
+按 (工具, 标的或 global, 日期, 模型) 缓存 LLM 网络搜索工具的结果，多资产分析时同一日期的全局新闻只搜索一次；
+并发请求同一个 key 时只发出一次请求，其余调用等待其结果（single-flight）
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+
+class _Flight:
+    """一次进行中的请求"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchResultCache:
+    """网络搜索结果的内存 + 磁盘缓存，带 single-flight 去重"""
+
+    def __init__(self, cache_dir: str, ttl: Optional[float] = 6 * 3600):
+        """
+        初始化搜索结果缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+            ttl: 有效期（秒），None 表示永不过期；key 已包含日期，过期只影响当天反复查询的结果
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    @staticmethod
+    def make_key(tool: str, scope: str, date: str, model: str) -> str:
+        payload = json.dumps([tool, scope, str(date), model])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return self.ttl is None or time.time() - entry.get("created_at", 0) <= self.ttl
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable search cache entry {key}: {e}")
+                return None
+            self._memory[key] = entry
+        if not self._fresh(entry):
+            self._memory.pop(key, None)
+            return None
+        return entry["value"]
+
+    def _store(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist search cache entry {key}: {e}")
+
+    def get_or_fetch(self, tool: str, scope: str, date: str, model: str,
+                     fetch: Callable[[], str]) -> str:
+        """
+        返回缓存结果，未命中时调用 fetch；同一 key 同时只有一个调用真正执行 fetch
+
+        Args:
+            tool: 工具名
+            scope: 标的代码，或全局数据使用 GLOBAL_SCOPE
+            date: 查询日期
+            model: 执行搜索的模型
+            fetch: 实际执行搜索的无参函数
+        """
+        key = self.make_key(tool, scope, date, model)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.stats["hits"] += 1
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.stats["misses"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            # 等待进行中的同一请求，失败时把同样的异常抛给所有等待者
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            value = fetch()
+            if value:
+                with self._lock:
+                    self._store(
+                        key,
+                        {
+                            "tool": tool,
+                            "scope": scope,
+                            "date": str(date),
+                            "model": model,
+                            "created_at": time.time(),
+                            "value": value,
+                        },
+                    )
+            flight.result = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+
+# 全局搜索缓存实例（按目录共享）
+_global_caches: Dict[str, SearchResultCache] = {}
+_global_caches_lock = threading.Lock()
+
+
+def get_search_cache(config: Dict[str, Any]) -> Optional[SearchResultCache]:
+    """根据配置返回共享的搜索结果缓存，未启用时返回 None"""
+    if not config.get("search_cache_enabled", True):
+        return None
+
+    cache_dir = os.path.abspath(
+        config.get("search_cache_dir")
+        or os.path.join(config["data_cache_dir"], "search_results")
+    )
+    with _global_caches_lock:
+        cache = _global_caches.get(cache_dir)
+        if cache is None:
+            cache = SearchResultCache(cache_dir, ttl=config.get("search_cache_ttl", 6 * 3600))
+            _global_caches[cache_dir] = cache
+    return cache
+
+
+def cached_search(config: Dict[str, Any], tool: str, scope: str, date: str,
+                  fetch: Callable[[], str]) -> str:
+    """通过共享缓存执行网络搜索，未启用缓存时直接调用"""
+    cache = get_search_cache(config)
+    if cache is None:
+        return fetch()
+    # 同名模型在不同服务商上的搜索能力不同，模型标识带上 backend
+    model = f"{config.get('backend_url', '')}|{config['quick_think_llm']}"
+    return cache.get_or_fetch(tool, scope, date, model, fetch)
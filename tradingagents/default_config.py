@@ -103,6 +103,12 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "memory_db",
     ),
+    "memory_chunking_enabled": True,  # Index long situations as one vector per chunk
+    "memory_chunk_reindex_on_start": False,  # Chunk-index older records when the graph is built; otherwise run scripts/migrate_memory_chunks.py (unindexed ones fall back to their parent vector)
+    "memory_chunk_chars": 1500,  # Maximum characters per chunk (paragraphs are packed up to this size)
+    "memory_chunk_overlap": 200,  # Overlap between windows of a paragraph longer than a chunk
+    "memory_chunk_pooling": "max",  # How per-chunk scores combine into a situation score: "max" or "mean"
+    "memory_chunk_candidates": 10,  # Chunks retrieved per query chunk for each requested match
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "deepseek/deepseek-v3.2-exp",
@@ -112,6 +118,7 @@ DEFAULT_CONFIG = {
         "https://openrouter.ai/api/v1",
         ALLOWED_API_DOMAINS
     ),
+    "mock_llm": None,  # Latency/output overrides for llm_provider "mock" (see graph/mock_llm.py DEFAULT_MOCK_CONFIG)
     # Embedding settings
     "embedding_url": get_safe_url(
         "TRADINGAGENTS_EMBEDDING_URL",
@@ -120,12 +127,79 @@ DEFAULT_CONFIG = {
     ),
     "embedding_model": os.getenv("TRADINGAGENTS_EMBEDDING_MODEL", "BAAI/bge-m3"),
     "embedding_api_key": os.getenv("TRADINGAGENTS_EMBEDDING_API_KEY", os.getenv("TRADINGAGENTS_API_KEY")),
+    "embedding_backend": "remote",  # "remote" (embedding_url), or in-process "hashing" / "onnx"; vectors differ, so use a separate memory_persist_dir per backend (a store of another vector size is rejected)
+    "embedding_local_dimensions": 512,  # Vector size of the hashing backend
+    "embedding_onnx_path": None,  # .onnx file or directory with model.onnx and tokenizer.json (onnx backend)
+    "embedding_onnx_tokenizer_path": None,  # Defaults to tokenizer.json next to the model
+    "embedding_onnx_max_length": 512,  # Tokens per input for the onnx backend
+    "embedding_batch_size": 64,  # Inputs per embeddings request when adding situations in bulk
+    "embedding_max_concurrency": 4,  # Embedding batch requests in flight at once
+    "embedding_max_retries": 2,  # Retries of the items that failed, with the batch size halved each time
+    "embedding_cache_enabled": True,  # Share embeddings of identical texts across all memories (keyed by content hash)
+    "embedding_cache_size": 1024,  # Vectors kept in memory; least recently used are evicted
+    "embedding_cache_path": None,  # Optional SQLite file that keeps embeddings across runs (None: memory only)
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    "debate_context_enabled": False,  # Summarize older debate turns instead of resending the full history
+    "debate_keep_turns": 4,  # Most recent turns kept verbatim
+    "debate_token_budget": 24000,  # Estimated prompt tokens allowed per debater call
+    # Judge cascade settings (Research Manager and Risk Judge)
+    "judge_cascade_enabled": False,  # Let the quick model draft judge decisions and escalate only when needed
+    "judge_cascade_min_confidence": 0.75,  # Drafts with a lower self-rated confidence go to the deep model
+    "judge_cascade_max_position_usd": 10000,  # Escalate when the existing Paradex position is larger or a configured lookup fails (None: skip)
+    "judge_cascade_max_leverage": 5,  # Escalate when that position's leverage is higher (None: skip)
+    # Graph execution settings
+    "parallel_analysts": False,  # Run the selected analysts concurrently instead of in sequence
+    "parallel_risk_opening": False,  # Generate round one of the risk debate with all debaters at once
+    "timeline_enabled": True,  # Write a per-node timeline_<date>.json next to each full state log
+    "signal_rule_extraction": True,  # Parse LONG/SHORT/NEUTRAL from decision lines before asking the LLM
+    "batch_max_concurrency": 4,  # Tickers analyzed at once by propagate_batch
+    "graph_cache_size": 4,  # Built graphs kept warm by the process-wide graph registry
+    "checkpoint_enabled": False,  # Save the state after every node so failed runs can be resumed
+    "checkpoint_db_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "checkpoints/graph_checkpoints.sqlite",
+    ),
+    "checkpoint_retention_days": 7,  # Checkpointed runs older than this are pruned
+    "checkpoint_max_runs": 500,  # Only the most recent runs are kept
+    "checkpoint_keep_completed": False,  # Keep checkpoints of successful runs until pruned
+    "analyst_cache_enabled": False,  # Reuse analyst reports for the same ticker, date, model and prompt
+    "analyst_cache_dir": None,  # Defaults to <data_cache_dir>/analyst_reports
+    "analyst_cache_ttl": {  # Seconds an analyst report stays valid, per analyst type
+        "market": 4 * 3600,
+        "social": 2 * 3600,
+        "news": 1 * 3600,
+        "fundamentals": 24 * 3600,
+    },
+    "analyst_cache_revalidate": False,  # Re-run the recorded tool calls on a hit and miss if outputs changed
+    # LLM cache settings
+    "llm_cache_enabled": False,  # Reuse responses for identical requests (historical replays, backtests)
+    "llm_cache_path": None,  # Defaults to <data_cache_dir>/llm_cache.sqlite
+    "llm_cache_max_mb": 512,  # Least recently used responses are evicted past this size
+    "llm_cache_replay": False,  # Fail on a cache miss instead of calling the provider
+    # Web search cache settings (news and fundamentals searches, keyed by tool, ticker or global, date and model)
+    "search_cache_enabled": True,  # Share results across tickers and runs; concurrent identical searches wait on one request
+    "search_cache_dir": None,  # Defaults to <data_cache_dir>/search_results
+    "search_cache_ttl": 6 * 3600,  # Seconds before a result is searched again; None keeps results forever
+    # Rate limit settings
+    "rate_limit_enabled": False,  # Route chat, web search and embedding calls through per-provider budgets
+    "rate_limits": {  # Budgets keyed by API host name; "default" covers unlisted providers
+        "default": {"requests_per_minute": 60, "tokens_per_minute": None},
+    },
+    "llm_max_retries": 6,  # Retries on 429, waiting for the provider's Retry-After when given
+    # HTTP client settings (shared connection pools for OpenAI-compatible clients)
+    "http_max_connections": 100,  # Open connections per (base_url, api_key) pool
+    "http_max_keepalive_connections": 20,  # Idle connections kept alive for reuse
+    "http_keepalive_expiry": 30.0,  # Seconds an idle connection stays open
+    "http_timeout": 600.0,  # Read timeout for LLM requests, in seconds
+    "http2": True,  # Use HTTP/2 when the optional h2 package is installed
     # Tool settings
     "online_tools": True,
+    "tool_timeout": 120,  # Seconds before a single tool call is abandoned and reported to the model as an error
+    "tool_max_workers": 32,  # Threads running blocking tools; parallel calls in one analyst turn run at once
+    "tool_prefetch_enabled": True,  # Fetch the market analyst's fixed data bundle before its first LLM turn
     # Language settings
     "language": "chinese",
     "language_instruction": "重要提示：务必始终使用中文回答。所有分析、报告和决策都应使用中文。"
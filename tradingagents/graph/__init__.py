@@ -6,6 +6,15 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .checkpointing import CheckpointStore, get_checkpoint_store
+from .timeline import TimelineRecorder, aggregate_timelines
+from .streaming import TokenStream, stream_token
+from .registry import (
+    GraphRegistry,
+    get_graph_registry,
+    get_trading_graph,
+    invalidate_graph_cache,
+)
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +23,14 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "CheckpointStore",
+    "get_checkpoint_store",
+    "TimelineRecorder",
+    "aggregate_timelines",
+    "TokenStream",
+    "stream_token",
+    "GraphRegistry",
+    "get_graph_registry",
+    "get_trading_graph",
+    "invalidate_graph_cache",
 ]
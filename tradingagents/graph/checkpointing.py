@@ -0,0 +1,214 @@
+# TradingAgents/graph/checkpointing.py
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .event_loop import run_sync
+
+logger = logging.getLogger(__name__)
+
+# langgraph-checkpoint-sqlite 为可选依赖，缺失时禁用检查点功能
+_sqlite_checkpoint_available = False
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    _sqlite_checkpoint_available = True
+except ImportError as e:
+    logger.warning(f"SQLite checkpointer unavailable, checkpointing disabled: {e}")
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+
+_RUNS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS propagate_runs (
+    decision_id TEXT PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_propagate_runs_updated_at ON propagate_runs(updated_at);
+"""
+
+
+class CheckpointStore:
+    """SQLite-backed LangGraph checkpoints for propagate runs, keyed by decision_id.
+
+    Every run is one checkpoint thread (thread_id = decision_id) plus a row in the
+    ``propagate_runs`` table recording its ticker, trade date and status, which is
+    what ``TradingAgentsGraph.resume`` looks up. Completed threads are dropped unless
+    ``keep_completed`` is set, and ``prune`` removes runs past the retention window.
+
+    The SQLite connection is opened on the shared graph event loop, so all async
+    methods must be awaited there.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention_days: float = 7,
+        max_runs: int = 500,
+        keep_completed: bool = False,
+    ):
+        if not _sqlite_checkpoint_available:
+            raise RuntimeError(
+                "langgraph-checkpoint-sqlite is not installed; cannot enable checkpointing"
+            )
+        self.path = path
+        self.retention_days = retention_days
+        self.max_runs = max_runs
+        self.keep_completed = keep_completed
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.saver = run_sync(self._open())
+        removed = self.prune()
+        if removed:
+            logger.info(f"Pruned {removed} expired checkpointed runs from {path}")
+
+    async def _open(self) -> "AsyncSqliteSaver":
+        saver = AsyncSqliteSaver(aiosqlite.connect(self.path))
+        await saver.setup()
+        async with saver.lock:
+            await saver.conn.executescript(_RUNS_TABLE_SQL)
+            await saver.conn.commit()
+        return saver
+
+    @staticmethod
+    def thread_config(decision_id: str) -> Dict[str, Any]:
+        """LangGraph config addressing the checkpoint thread of a run."""
+        return {"configurable": {"thread_id": decision_id}}
+
+    async def astart_run(self, decision_id: str, ticker: str, trade_date: str):
+        """Record a new run before its first checkpoint is written."""
+        now = time.time()
+        async with self.saver.lock:
+            await self.saver.conn.execute(
+                "INSERT OR REPLACE INTO propagate_runs "
+                "(decision_id, ticker, trade_date, status, error, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                (decision_id, ticker, str(trade_date), RUN_RUNNING, now, now),
+            )
+            await self.saver.conn.commit()
+
+    async def amark_run(self, decision_id: str, status: str, error: Optional[str] = None):
+        """Update a run's status, dropping its checkpoints once it has completed."""
+        async with self.saver.lock:
+            await self.saver.conn.execute(
+                "UPDATE propagate_runs SET status = ?, error = ?, updated_at = ? "
+                "WHERE decision_id = ?",
+                (status, error, time.time(), decision_id),
+            )
+            await self.saver.conn.commit()
+        if status == RUN_COMPLETED and not self.keep_completed:
+            await self.saver.adelete_thread(decision_id)
+
+    async def aget_run(self, decision_id: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded run for a decision_id, or None."""
+        runs = await self._aselect("WHERE decision_id = ?", (decision_id,))
+        return runs[0] if runs else None
+
+    async def alist_runs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return recorded runs, most recently updated first."""
+        if status is None:
+            return await self._aselect("ORDER BY updated_at DESC LIMIT ?", (limit,))
+        return await self._aselect(
+            "WHERE status = ? ORDER BY updated_at DESC LIMIT ?", (status, limit)
+        )
+
+    def list_runs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Blocking counterpart of alist_runs."""
+        return run_sync(self.alist_runs(status, limit))
+
+    async def _aselect(self, clause: str, params: tuple) -> List[Dict[str, Any]]:
+        columns = ["decision_id", "ticker", "trade_date", "status", "error", "created_at", "updated_at"]
+        async with self.saver.lock:
+            async with self.saver.conn.execute(
+                f"SELECT {', '.join(columns)} FROM propagate_runs {clause}", params
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    async def aprune(
+        self,
+        retention_days: Optional[float] = None,
+        max_runs: Optional[int] = None,
+    ) -> int:
+        """Delete runs older than the retention window or beyond the newest max_runs.
+
+        Returns:
+            Number of runs removed
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        max_runs = self.max_runs if max_runs is None else max_runs
+
+        stale = set()
+        if retention_days is not None:
+            cutoff = time.time() - retention_days * 86400
+            for run in await self._aselect("WHERE updated_at < ?", (cutoff,)):
+                stale.add(run["decision_id"])
+        if max_runs is not None:
+            for run in await self._aselect(
+                "ORDER BY updated_at DESC LIMIT -1 OFFSET ?", (max_runs,)
+            ):
+                stale.add(run["decision_id"])
+
+        for decision_id in stale:
+            await self.adelete_run(decision_id)
+        return len(stale)
+
+    def prune(
+        self,
+        retention_days: Optional[float] = None,
+        max_runs: Optional[int] = None,
+    ) -> int:
+        """Blocking counterpart of aprune."""
+        return run_sync(self.aprune(retention_days, max_runs))
+
+    async def adelete_run(self, decision_id: str):
+        """Remove a run and all of its checkpoints."""
+        await self.saver.adelete_thread(decision_id)
+        async with self.saver.lock:
+            await self.saver.conn.execute(
+                "DELETE FROM propagate_runs WHERE decision_id = ?", (decision_id,)
+            )
+            await self.saver.conn.commit()
+
+
+# 全局检查点存储实例（按数据库路径共享）
+_global_stores: Dict[str, CheckpointStore] = {}
+_global_stores_lock = threading.Lock()
+
+
+def get_checkpoint_store(config: Dict[str, Any]) -> Optional[CheckpointStore]:
+    """Return the shared CheckpointStore for a config, or None when checkpointing is off.
+
+    Graphs built from configs pointing at the same database share one store and
+    SQLite connection.
+    """
+    if not config.get("checkpoint_enabled", False):
+        return None
+    if not _sqlite_checkpoint_available:
+        logger.warning("checkpoint_enabled is set but langgraph-checkpoint-sqlite is not installed")
+        return None
+
+    path = os.path.abspath(config["checkpoint_db_path"])
+    with _global_stores_lock:
+        store = _global_stores.get(path)
+        if store is None:
+            store = CheckpointStore(
+                path,
+                retention_days=config.get("checkpoint_retention_days", 7),
+                max_runs=config.get("checkpoint_max_runs", 500),
+                keep_completed=config.get("checkpoint_keep_completed", False),
+            )
+            _global_stores[path] = store
+    return store
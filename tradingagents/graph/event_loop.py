@@ -0,0 +1,87 @@
+# TradingAgents/graph/event_loop.py
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop used to drive async graph runs from sync code.
+
+    The loop lives in a daemon thread for the lifetime of the process, so async HTTP
+    connection pools opened by the LLM clients stay bound to a single, running loop
+    across calls instead of being orphaned by a fresh ``asyncio.run`` each time.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="tradingagents-event-loop", daemon=True
+            ).start()
+    return _loop
+
+
+def _ensure_not_on_loop(loop: asyncio.AbstractEventLoop):
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if running is loop:
+        raise RuntimeError(
+            "Synchronous graph API called from inside the graph event loop; await the async variant instead"
+        )
+
+
+async def _next_item(agen: AsyncIterator[Any]) -> Any:
+    return await agen.__anext__()
+
+
+async def _close(agen: AsyncIterator[Any]):
+    aclose = getattr(agen, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine on the shared event loop and block until it finishes."""
+    loop = get_event_loop()
+    _ensure_not_on_loop(loop)
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def iter_sync(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """Iterate an async generator from sync code, pulling one item at a time.
+
+    Work scheduled by the generator (e.g. parallel graph branches) keeps running on the
+    shared loop while the caller processes each item.
+    """
+    loop = get_event_loop()
+    _ensure_not_on_loop(loop)
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(_next_item(agen), loop).result()
+            except StopAsyncIteration:
+                break
+    finally:
+        asyncio.run_coroutine_threadsafe(_close(agen), loop).result()
+
+
+async def run_on_shared_loop(coro: Awaitable[Any]) -> Any:
+    """Await a coroutine on the shared event loop, hopping over from another loop if needed.
+
+    Used for work bound to resources opened on the shared loop, such as the SQLite
+    checkpoint connection.
+    """
+    loop = get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
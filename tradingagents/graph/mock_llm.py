@@ -0,0 +1,276 @@
+# TradingAgents/graph/mock_llm.py
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+DEFAULT_MOCK_CONFIG = {
+    # Latency of every chat call; see sample_latency for the supported distributions
+    "latency": {"distribution": "lognormal", "mean": 0.5, "stddev": 0.2},
+    # Latency of every tool call
+    "tool_latency": {"distribution": "uniform", "min": 0.01, "max": 0.05},
+    "tool_calls_per_turn": 1,
+    "report_chars": 2000,
+    "tool_output_chars": 4000,
+    "decision": "LONG",
+    "seed": 0,
+}
+
+# Characters per streamed chunk of a mock report
+STREAM_CHUNK_CHARS = 64
+
+
+def mock_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """DEFAULT_MOCK_CONFIG overridden by the "mock_llm" config value."""
+    return {**DEFAULT_MOCK_CONFIG, **(config.get("mock_llm") or {})}
+
+
+def sample_latency(spec: Optional[Dict[str, Any]], rng: random.Random) -> float:
+    """Draw a latency in seconds from a distribution spec.
+
+    Supported specs: ``{"distribution": "fixed", "mean": s}``, ``"uniform"`` with
+    ``min``/``max``, and ``"normal"`` or ``"lognormal"`` with ``mean``/``stddev``
+    (the lognormal is parameterized by the mean and stddev of the latency itself,
+    giving the long tail real providers have). ``min``/``max`` also clamp the
+    normal distributions.
+    """
+    if not spec:
+        return 0.0
+    distribution = spec.get("distribution", "fixed")
+    mean = float(spec.get("mean", 0.0))
+    stddev = float(spec.get("stddev", 0.0))
+    if distribution == "uniform":
+        value = rng.uniform(float(spec.get("min", 0.0)), float(spec.get("max", mean)))
+    elif distribution == "normal":
+        value = rng.gauss(mean, stddev)
+    elif distribution == "lognormal":
+        if mean <= 0:
+            return 0.0
+        sigma2 = math.log(1 + (stddev / mean) ** 2)
+        mu = math.log(mean) - sigma2 / 2
+        value = rng.lognormvariate(mu, sigma2 ** 0.5)
+    elif distribution == "fixed":
+        value = mean
+    else:
+        raise ValueError(f"Unknown latency distribution: {distribution}")
+    if "min" in spec:
+        value = max(value, float(spec["min"]))
+    if "max" in spec:
+        value = min(value, float(spec["max"]))
+    return max(0.0, value)
+
+
+def _rng(seed: Any, *parts: str) -> random.Random:
+    """Per-call generator, so results do not depend on how concurrent calls interleave."""
+    digest = hashlib.sha256("\x1f".join([str(seed), *parts]).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _filler(prefix: str, length: int, rng: random.Random) -> str:
+    words = ["price", "volume", "trend", "support", "resistance", "momentum",
+             "earnings", "guidance", "sentiment", "liquidity", "volatility", "risk"]
+    parts = [prefix]
+    size = len(prefix)
+    while size < length:
+        word = rng.choice(words)
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)
+
+
+def _mock_argument(name: str, schema: Dict[str, Any]) -> Any:
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "integer":
+        return 7
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if kind == "array":
+        return []
+    if kind == "object":
+        return {}
+    if "date" in name.lower():
+        return "2024-01-02"
+    return "MOCK"
+
+
+class MockChatModel(BaseChatModel):
+    """Offline chat model returning scripted tool calls and reports.
+
+    When tools are bound and the conversation does not end with a tool result,
+    the model calls the first ``tool_calls_per_turn`` tools with placeholder
+    arguments; otherwise it answers with a report of ``report_chars`` characters
+    ending in "FINAL TRADING PROPOSAL: **<decision>**". Each call sleeps for a
+    latency drawn from ``latency`` and reports approximate token usage, so the
+    whole graph runs end-to-end with realistic timing but no network. Streamed
+    calls wait the same latency before the first chunk and then yield the report
+    in pieces, so token streaming can be exercised offline too.
+    """
+
+    model: str = "mock"
+    latency: Optional[Dict[str, Any]] = None
+    tool_calls_per_turn: int = 1
+    report_chars: int = 2000
+    decision: str = "LONG"
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def bind_tools(self, tools, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _reply(self, messages: List[BaseMessage], rng: random.Random,
+               tools: Optional[List[Dict[str, Any]]]) -> ChatResult:
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        if tools and not isinstance(messages[-1], ToolMessage):
+            tool_calls = []
+            for index, tool in enumerate(tools[: max(1, self.tool_calls_per_turn)]):
+                function = tool["function"]
+                properties = function.get("parameters", {}).get("properties", {})
+                tool_calls.append({
+                    "name": function["name"],
+                    "args": {name: _mock_argument(name, schema) for name, schema in properties.items()},
+                    "id": f"call_{rng.getrandbits(48):012x}_{index}",
+                })
+            message = AIMessage(content="", tool_calls=tool_calls)
+            completion_chars = 40 * len(tool_calls)
+        else:
+            content = (
+                _filler(f"Mock {self.model} report.", self.report_chars, rng)
+                + f"\n\nFINAL TRADING PROPOSAL: **{self.decision}**"
+            )
+            message = AIMessage(content=content)
+            completion_chars = len(content)
+
+        # Roughly four characters per token
+        input_tokens, output_tokens = prompt_chars // 4, completion_chars // 4
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _call_rng(self, messages: List[BaseMessage]) -> random.Random:
+        return _rng(self.seed, self.model, *(str(message.content) for message in messages))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        rng = self._call_rng(messages)
+        time.sleep(sample_latency(self.latency, rng))
+        return self._reply(messages, rng, kwargs.get("tools"))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        rng = self._call_rng(messages)
+        await asyncio.sleep(sample_latency(self.latency, rng))
+        return self._reply(messages, rng, kwargs.get("tools"))
+
+    @staticmethod
+    def _chunks(result: ChatResult) -> Iterator[ChatGenerationChunk]:
+        message = result.generations[0].message
+        if message.tool_calls:
+            chunks = [AIMessageChunk(content="", tool_call_chunks=[
+                tool_call_chunk(name=call["name"], args=json.dumps(call["args"]), id=call["id"], index=index)
+                for index, call in enumerate(message.tool_calls)
+            ])]
+        else:
+            content = message.content
+            chunks = [
+                AIMessageChunk(content=content[start:start + STREAM_CHUNK_CHARS])
+                for start in range(0, len(content), STREAM_CHUNK_CHARS)
+            ]
+        # Usage is reported once, on the last chunk
+        chunks[-1].usage_metadata = message.usage_metadata
+        for chunk in chunks:
+            yield ChatGenerationChunk(message=chunk)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        rng = self._call_rng(messages)
+        time.sleep(sample_latency(self.latency, rng))
+        for chunk in self._chunks(self._reply(messages, rng, kwargs.get("tools"))):
+            if run_manager is not None:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        rng = self._call_rng(messages)
+        await asyncio.sleep(sample_latency(self.latency, rng))
+        for chunk in self._chunks(self._reply(messages, rng, kwargs.get("tools"))):
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def create_mock_llms(config: Dict[str, Any], **llm_kwargs: Any):
+    """Deep- and quick-thinking MockChatModels configured from ``config["mock_llm"]``."""
+    settings = mock_settings(config)
+    common = {
+        "latency": settings["latency"],
+        "tool_calls_per_turn": settings["tool_calls_per_turn"],
+        "report_chars": settings["report_chars"],
+        "decision": settings["decision"],
+        "seed": settings["seed"],
+        **llm_kwargs,
+    }
+    return (
+        MockChatModel(model=config["deep_think_llm"], **common),
+        MockChatModel(model=config["quick_think_llm"], **common),
+    )
+
+
+def mock_tool(tool, latency: Optional[Dict[str, Any]], output_chars: int, seed: int = 0) -> StructuredTool:
+    """Copy of ``tool`` with the same name and schema that returns canned data."""
+
+    def run(**kwargs: Any) -> str:
+        rng = _rng(seed, tool.name, repr(sorted(kwargs.items())))
+        time.sleep(sample_latency(latency, rng))
+        return _filler(f"Mock {tool.name} output.", output_chars, rng)
+
+    async def arun(**kwargs: Any) -> str:
+        rng = _rng(seed, tool.name, repr(sorted(kwargs.items())))
+        await asyncio.sleep(sample_latency(latency, rng))
+        return _filler(f"Mock {tool.name} output.", output_chars, rng)
+
+    return StructuredTool.from_function(
+        func=run,
+        coroutine=arun,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+    )
+
+
+def mock_tools(tools, config: Dict[str, Any]) -> List[StructuredTool]:
+    """Replace analyst tools with offline mock_tool copies."""
+    settings = mock_settings(config)
+    return [
+        mock_tool(tool, settings["tool_latency"], settings["tool_output_chars"], settings["seed"])
+        for tool in tools
+    ]
+
+
+def mock_embedding(text: str, dimensions: int = 64) -> List[float]:
+    """Deterministic unit-length embedding derived from the text's hash."""
+    rng = _rng("embedding", text)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
@@ -53,9 +53,20 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, thread_id: str = None, stream_tokens: bool = False) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread to run under, required when the graph has a
+                checkpointer
+            stream_tokens: Also stream LLM tokens as they are generated. Streamed
+                chunks are then ``(mode, payload)`` tuples, where mode is "values"
+                or "messages"
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if thread_id is not None:
+            config["configurable"] = {"thread_id": thread_id}
         return {
-            "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "stream_mode": ["values", "messages"] if stream_tokens else "values",
+            "config": config,
         }
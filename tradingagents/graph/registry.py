@@ -0,0 +1,173 @@
+# TradingAgents/graph/registry.py
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.interface import set_config
+
+from .trading_graph import TradingAgentsGraph
+
+DEFAULT_ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+# Environment variables the LLM clients read their API keys from at construction
+CREDENTIAL_ENV_VARS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY")
+
+
+def normalize_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge a (possibly partial) config over DEFAULT_CONFIG into a fresh dict."""
+    return {**DEFAULT_CONFIG, **(config or {})}
+
+
+def config_fingerprint(config: Optional[Dict[str, Any]] = None) -> str:
+    """Stable hash of a normalized config."""
+    payload = json.dumps(normalize_config(config), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def credentials_fingerprint() -> str:
+    """Hash of the API keys a newly built graph's LLM clients would use."""
+    payload = json.dumps([os.getenv(name) for name in CREDENTIAL_ENV_VARS])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GraphRegistry:
+    """Process-wide LRU cache of built TradingAgentsGraph instances.
+
+    Graphs are keyed by the fingerprint of the normalized config, the API keys in
+    the environment, the analyst selection and the debug flag. Changing a key (e.g.
+    from the Streamlit sidebar) builds a new graph and drops the ones built with the
+    old key. Cached graphs are shared between callers, so the per-instance
+    ``curr_state``/``ticker`` attributes reflect the most recent run.
+    """
+
+    def __init__(self, max_size: int = 4):
+        self.max_size = max_size
+        self._graphs: "OrderedDict[tuple, TradingAgentsGraph]" = OrderedDict()
+        # Builds in progress; concurrent misses on the same key wait for one build
+        self._building: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _activate(graph: TradingAgentsGraph) -> TradingAgentsGraph:
+        # Another graph may have replaced the shared dataflow/toolkit config since
+        set_config(graph.config)
+        graph.toolkit.update_config(graph.config)
+        return graph
+
+    def get(
+        self,
+        selected_analysts: Optional[List[str]] = None,
+        debug: bool = False,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> TradingAgentsGraph:
+        """Return a cached graph for this config and analyst selection, building it on a miss.
+
+        The build runs outside the registry lock, so lookups of other graphs are not
+        blocked by a slow build.
+        """
+        selected_analysts = list(selected_analysts or DEFAULT_ANALYSTS)
+        config = normalize_config(config)
+        key = (config_fingerprint(config), credentials_fingerprint(), tuple(selected_analysts), debug)
+
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+                return self._activate(graph)
+            future = self._building.get(key)
+            building = future is None
+            if building:
+                future = Future()
+                self._building[key] = future
+
+        if not building:
+            return self._activate(future.result())
+
+        try:
+            graph = TradingAgentsGraph(selected_analysts, debug=debug, config=config)
+        except BaseException as e:
+            with self._lock:
+                self._building.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._building.pop(key, None)
+            # Graphs for the same setup built with previous API keys are stale
+            for stale in [k for k in self._graphs if k[0] == key[0] and k[2:] == key[2:]]:
+                del self._graphs[stale]
+            self._graphs[key] = graph
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+        future.set_result(graph)
+        return graph
+
+    def invalidate(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Optional[List[str]] = None,
+    ) -> int:
+        """Drop cached graphs and return how many were removed.
+
+        Args:
+            config: Only drop graphs built from this config. If None, drop everything.
+            selected_analysts: Further restrict to graphs built for these analysts.
+        """
+        with self._lock:
+            if config is None and selected_analysts is None:
+                removed = len(self._graphs)
+                self._graphs.clear()
+                return removed
+
+            fingerprint = config_fingerprint(config) if config is not None else None
+            analysts = tuple(selected_analysts) if selected_analysts is not None else None
+            stale = [
+                key
+                for key in self._graphs
+                if (fingerprint is None or key[0] == fingerprint)
+                and (analysts is None or key[2] == analysts)
+            ]
+            for key in stale:
+                del self._graphs[key]
+            return len(stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._graphs)
+
+
+# 全局图注册表实例
+_global_registry = None
+_global_registry_lock = threading.Lock()
+
+
+def get_graph_registry() -> GraphRegistry:
+    """Return the process-wide graph registry."""
+    global _global_registry
+    with _global_registry_lock:
+        if _global_registry is None:
+            _global_registry = GraphRegistry(DEFAULT_CONFIG.get("graph_cache_size", 4))
+    return _global_registry
+
+
+def get_trading_graph(
+    selected_analysts: Optional[List[str]] = None,
+    debug: bool = False,
+    config: Optional[Dict[str, Any]] = None,
+) -> TradingAgentsGraph:
+    """Return a warm TradingAgentsGraph for this config, building it only on first use."""
+    return get_graph_registry().get(selected_analysts, debug=debug, config=config)
+
+
+def invalidate_graph_cache(
+    config: Optional[Dict[str, Any]] = None,
+    selected_analysts: Optional[List[str]] = None,
+) -> int:
+    """Drop cached graphs from the process-wide registry."""
+    return get_graph_registry().invalidate(config, selected_analysts)
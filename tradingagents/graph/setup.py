@@ -6,8 +6,10 @@ from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
-from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.agent_states import AgentState, ANALYST_REPORT_FIELDS
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.analyst_cache import create_cache_probe, create_cached_analyst
+from tradingagents.agents.utils.tool_prefetch import PREFETCH_PLANS, create_prefetch_node
 
 from .conditional_logic import ConditionalLogic
 
@@ -27,6 +29,11 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        analyst_cache=None,
+        debate_context=None,
+        prefetch_tools=False,
+        judge_cascade=None,
+        offline=False,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -39,9 +46,100 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.analyst_cache = analyst_cache
+        self.debate_context = debate_context
+        self.prefetch_tools = prefetch_tools
+        self.judge_cascade = judge_cascade
+        # Offline runs (mock provider) never query Paradex
+        self.offline = offline
+
+    @staticmethod
+    def _prefetch_name(analyst_type):
+        return f"Prefetch {analyst_type.capitalize()}"
+
+    def _entry_node(self, analyst_type, prefetch_nodes):
+        """First node of an analyst: its prefetch node when it has one."""
+        if analyst_type in prefetch_nodes:
+            return self._prefetch_name(analyst_type)
+        return f"{analyst_type.capitalize()} Analyst"
+
+    def _create_analyst_branch(self, analyst_type, analyst_node, tool_node, prefetch_node=None):
+        """Compile one analyst's tool loop into a sub-graph with a private message channel.
+
+        The branch starts from a fresh message list, so concurrently running analysts
+        never see each other's tool calls, and only the analyst's report is written
+        back to the parent state.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        clear_name = f"Msg Clear {analyst_type.capitalize()}"
+        report_field = ANALYST_REPORT_FIELDS[analyst_type]
+
+        branch = StateGraph(AgentState)
+        branch.add_node(analyst_name, analyst_node)
+        branch.add_node(tools_name, tool_node)
+        if prefetch_node is not None:
+            branch.add_node(self._prefetch_name(analyst_type), prefetch_node)
+            branch.add_edge(START, self._prefetch_name(analyst_type))
+            branch.add_edge(self._prefetch_name(analyst_type), analyst_name)
+        else:
+            branch.add_edge(START, analyst_name)
+        branch.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {tools_name: tools_name, clear_name: END},
+        )
+        branch.add_edge(tools_name, analyst_name)
+        branch = branch.compile()
+
+        async def analyst_branch_node(state, config=None):
+            result = await branch.ainvoke(
+                {
+                    "messages": [("human", state["company_of_interest"])],
+                    "company_of_interest": state["company_of_interest"],
+                    "trade_date": state["trade_date"],
+                },
+                config,
+            )
+            return {report_field: result.get(report_field, "")}
+
+        return analyst_branch_node
+
+    def _connect_sequential_analysts(self, workflow, selected_analysts, prefetch_nodes):
+        """Chain the analysts one after another, ending at the Bull Researcher."""
+        # Start with the first analyst
+        first_analyst = selected_analysts[0]
+        workflow.add_edge(START, self._entry_node(first_analyst, prefetch_nodes))
+
+        # Connect analysts in sequence
+        for i, analyst_type in enumerate(selected_analysts):
+            current_analyst = f"{analyst_type.capitalize()} Analyst"
+            current_tools = f"tools_{analyst_type}"
+            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+            # Add conditional edges for current analyst
+            workflow.add_conditional_edges(
+                current_analyst,
+                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                [current_tools, current_clear],
+            )
+            workflow.add_edge(current_tools, current_analyst)
+            if analyst_type in prefetch_nodes:
+                workflow.add_edge(self._prefetch_name(analyst_type), current_analyst)
+
+            # Connect to next analyst or to Bull Researcher if this is the last analyst
+            if i < len(selected_analysts) - 1:
+                next_analyst = self._entry_node(selected_analysts[i + 1], prefetch_nodes)
+                workflow.add_edge(current_clear, next_analyst)
+            else:
+                workflow.add_edge(current_clear, "Bull Researcher")
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        checkpointer=None,
+        parallel_risk_opening=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +149,12 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the selected analysts concurrently, each in
+                its own sub-graph, instead of chaining them one after another.
+            checkpointer: Optional LangGraph checkpointer. When given, the state is
+                saved after every node so an interrupted run can be resumed.
+            parallel_risk_opening (bool): Generate the first round of the risk debate
+                with all three debaters concurrently; later rounds take turns as usual.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -88,24 +192,63 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # Reuse cached reports of analysts whose inputs have not changed
+        cache_probes = {}
+        if self.analyst_cache is not None:
+            quick_model = getattr(self.quick_thinking_llm, "model_name", None) or getattr(
+                self.quick_thinking_llm, "model", ""
+            )
+            for analyst_type in list(analyst_nodes):
+                cache_probes[analyst_type] = create_cache_probe(
+                    analyst_type, analyst_nodes[analyst_type], self.analyst_cache, quick_model
+                )
+                analyst_nodes[analyst_type] = create_cached_analyst(
+                    analyst_type,
+                    analyst_nodes[analyst_type],
+                    self.analyst_cache,
+                    quick_model,
+                    tool_node=tool_nodes[analyst_type],
+                )
+
+        # Fetch the fixed tool bundle of analysts with a prefetch plan before their first turn,
+        # unless the analyst's report is already cached
+        prefetch_nodes = {}
+        if self.prefetch_tools:
+            planned = {plan_analyst for plan_analyst, _ in PREFETCH_PLANS}
+            for analyst_type in analyst_nodes:
+                if analyst_type in planned:
+                    prefetch_nodes[analyst_type] = create_prefetch_node(
+                        analyst_type, self.toolkit, tool_nodes[analyst_type],
+                        skip=cache_probes.get(analyst_type),
+                    )
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, context=self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, context=self.debate_context
         )
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self.deep_thinking_llm, self.invest_judge_memory, cascade=self.judge_cascade
         )
-        trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
+        if self.offline:
+            trader_node = create_trader(self.quick_thinking_llm, self.trader_memory, load_portfolio=None)
+        else:
+            trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(
+            self.quick_thinking_llm, context=self.debate_context
+        )
+        neutral_analyst = create_neutral_debator(
+            self.quick_thinking_llm, context=self.debate_context
+        )
+        safe_analyst = create_safe_debator(
+            self.quick_thinking_llm, context=self.debate_context
+        )
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self.deep_thinking_llm, self.risk_manager_memory, cascade=self.judge_cascade
         )
 
         # Create workflow
@@ -113,7 +256,18 @@ class GraphSetup:
 
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
+            if parallel_analysts:
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_analyst_branch(
+                        analyst_type, node, tool_nodes[analyst_type],
+                        prefetch_node=prefetch_nodes.get(analyst_type),
+                    ),
+                )
+                continue
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+            if analyst_type in prefetch_nodes:
+                workflow.add_node(self._prefetch_name(analyst_type), prefetch_nodes[analyst_type])
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
             )
@@ -128,32 +282,24 @@ class GraphSetup:
         workflow.add_node("Neutral Analyst", neutral_analyst)
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
-
-        # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        if parallel_risk_opening:
+            workflow.add_node(
+                "Risk Opening Round",
+                create_risk_opening_round(risky_analyst, safe_analyst, neutral_analyst),
             )
-            workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        # Define edges
+        if parallel_analysts:
+            # Fan out to every analyst, then wait for all reports before the debate
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Bull Researcher")
+        else:
+            self._connect_sequential_analysts(workflow, selected_analysts, prefetch_nodes)
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -173,7 +319,18 @@ class GraphSetup:
             },
         )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
+        if parallel_risk_opening:
+            workflow.add_edge("Trader", "Risk Opening Round")
+            workflow.add_conditional_edges(
+                "Risk Opening Round",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Risky Analyst": "Risky Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+        else:
+            workflow.add_edge("Trader", "Risky Analyst")
         workflow.add_conditional_edges(
             "Risky Analyst",
             self.conditional_logic.should_continue_risk_analysis,
@@ -202,4 +359,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
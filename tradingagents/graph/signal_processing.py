@@ -1,14 +1,117 @@
 # TradingAgents/graph/signal_processing.py
 
+import logging
+import re
+from typing import Optional
+
 from langchain_openai import ChatOpenAI
 
+logger = logging.getLogger(__name__)
+
+# "FINAL TRADING PROPOSAL: **LONG**", "最终交易建议：做多" and similar decision lines
+_DECISION_MARKER = re.compile(
+    r"(?:FINAL\s+TRADING\s+PROPOSAL|FINAL\s+TRADE\s+DECISION|FINAL\s+DECISION"
+    r"|最终交易(?:建议|建案|提案|决策)|最终(?:决策|建议))"
+    r"[\s*_#`]*[:：][\s*_#`\[(（【]*"
+    r"(?P<token>[A-Za-z]+|[\u4e00-\u9fa5]{2,4})",
+    re.IGNORECASE,
+)
+
+_DECISION_WORDS = {
+    "LONG": "LONG",
+    "BUY": "LONG",
+    "SHORT": "SHORT",
+    "SELL": "SHORT",
+    "NEUTRAL": "NEUTRAL",
+    "HOLD": "NEUTRAL",
+    "做多": "LONG",
+    "买入": "LONG",
+    "增持": "LONG",
+    "做空": "SHORT",
+    "卖出": "SHORT",
+    "减持": "SHORT",
+    "中性": "NEUTRAL",
+    "观望": "NEUTRAL",
+    "持有": "NEUTRAL",
+}
+
+
+# Negations and hedges ("暂不做多", "避免做空", "谨慎做多") leave the decision to the LLM
+_HEDGE_MARKERS = ("不", "非", "无", "勿", "别", "未", "否", "避免", "禁止", "暂", "谨慎", "考虑", "可能", "或")
+
+
+def _map_decision_token(token: str) -> Optional[str]:
+    decision = _DECISION_WORDS.get(token.upper())
+    if decision:
+        return decision
+    if any(marker in token for marker in _HEDGE_MARKERS):
+        return None
+    found = {d for word, d in _DECISION_WORDS.items() if not word.isascii() and word in token}
+    return found.pop() if len(found) == 1 else None
+
+
+def extract_decision(full_signal: str) -> Optional[str]:
+    """Extract LONG, SHORT or NEUTRAL from the decision lines of a trading signal.
+
+    Returns None when there is no decision line or the lines disagree, in which
+    case the caller should fall back to the LLM.
+    """
+    if not full_signal:
+        return None
+
+    decisions = set()
+    for match in _DECISION_MARKER.finditer(full_signal):
+        # Skip template echoes such as "LONG/NEUTRAL/SHORT"
+        following = full_signal[match.end():match.end() + 4].lstrip(" *")
+        if following[:1] in ("/", "|", "／"):
+            continue
+        decision = _map_decision_token(match.group("token"))
+        if decision is None:
+            return None
+        decisions.add(decision)
+
+    return decisions.pop() if len(decisions) == 1 else None
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(self, quick_thinking_llm: ChatOpenAI, use_rules: bool = True):
+        """Initialize with an LLM for processing.
+
+        Args:
+            quick_thinking_llm: LLM used when the decision cannot be parsed directly
+            use_rules: Try the deterministic extractor before calling the LLM
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.use_rules = use_rules
+        self.stats = {"rule_hits": 0, "llm_calls": 0}
+
+    def _build_messages(self, full_signal: str) -> list:
+        """Build the extraction prompt for a full trading signal."""
+        return [
+            (
+                "system",
+                "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the trading decision: SHORT, LONG, or NEUTRAL. Provide only the extracted decision (SHORT, LONG, or NEUTRAL) as your output, without adding any additional text or information.",
+            ),
+            ("human", full_signal),
+        ]
+
+    def _try_rules(self, full_signal: str) -> Optional[str]:
+        if not self.use_rules:
+            return None
+        decision = extract_decision(full_signal)
+        if decision is not None:
+            self.stats["rule_hits"] += 1
+        else:
+            self.stats["llm_calls"] += 1
+        return decision
+
+    @property
+    def rule_hit_rate(self) -> float:
+        """Share of processed signals decided without an LLM call."""
+        total = self.stats["rule_hits"] + self.stats["llm_calls"]
+        return self.stats["rule_hits"] / total if total else 0.0
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -20,12 +123,17 @@ class SignalProcessor:
         Returns:
             Extracted decision (LONG, SHORT, or NEUTRAL)
         """
-        messages = [
-            (
-                "system",
-                "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the trading decision: SHORT, LONG, or NEUTRAL. Provide only the extracted decision (SHORT, LONG, or NEUTRAL) as your output, without adding any additional text or information.",
-            ),
-            ("human", full_signal),
-        ]
+        decision = self._try_rules(full_signal)
+        if decision is not None:
+            return decision
+        return self.quick_thinking_llm.invoke(self._build_messages(full_signal)).content
 
-        return self.quick_thinking_llm.invoke(messages).content
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async counterpart of process_signal."""
+        decision = self._try_rules(full_signal)
+        if decision is not None:
+            return decision
+        response = await self.quick_thinking_llm.ainvoke(
+            self._build_messages(full_signal)
+        )
+        return response.content
@@ -0,0 +1,79 @@
+# TradingAgents/graph/streaming.py
+
+import time
+from typing import Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+
+def stream_token(payload) -> Optional[Tuple[str, str]]:
+    """Extract ``(node, text)`` from a ``stream_mode="messages"`` payload.
+
+    Models that cannot stream arrive as one complete AIMessage. Returns None for
+    anything that is not visible model text, such as tool messages or tool-call
+    argument chunks.
+    """
+    message, metadata = payload
+    if not isinstance(message, AIMessage):
+        return None
+    content = message.content
+    if isinstance(content, list):
+        # Anthropic-style content blocks
+        content = "".join(
+            block.get("text", "") for block in content
+            if isinstance(block, dict) and block.get("type") == "text"
+        )
+    if not content:
+        return None
+    return metadata.get("langgraph_node", ""), content
+
+
+class TokenStream:
+    """Accumulate streamed tokens per node and throttle UI repaints.
+
+    Displays only need to repaint the text of the node that is currently
+    generating; ``feed`` returns True once ``min_interval`` has passed since the
+    last repaint, so a UI can redraw a single panel a few times per second
+    instead of once per token.
+    """
+
+    def __init__(self, min_interval: float = 0.25):
+        self.min_interval = min_interval
+        self.node: Optional[str] = None
+        self._parts: Dict[str, list] = {}
+        self._last_paint = 0.0
+
+    def feed(self, payload) -> bool:
+        """Add a ``stream_mode="messages"`` payload; returns True when a repaint is due."""
+        token = stream_token(payload)
+        if token is None:
+            return False
+        return self.add(*token)
+
+    def add(self, node: str, text: str) -> bool:
+        """Add a token generated by ``node``; returns True when a repaint is due."""
+        self._parts.setdefault(node, []).append(text)
+        self.node = node
+        now = time.monotonic()
+        if now - self._last_paint >= self.min_interval:
+            self._last_paint = now
+            return True
+        return False
+
+    def text(self, node: Optional[str] = None) -> str:
+        node = self.node if node is None else node
+        return "".join(self._parts.get(node, ()))
+
+    def tail(self, max_chars: int = 2000, node: Optional[str] = None) -> str:
+        """Last ``max_chars`` characters of a node's text, for fixed-size panels."""
+        text = self.text(node)
+        if len(text) <= max_chars:
+            return text
+        return "…" + text[-max_chars:]
+
+    def finish(self, node: Optional[str] = None):
+        """Drop the buffered text of a node whose output is now in the state."""
+        node = self.node if node is None else node
+        self._parts.pop(node, None)
+        if node == self.node:
+            self.node = None
@@ -0,0 +1,395 @@
+# TradingAgents/graph/timeline.py
+
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def _usage_from_result(response) -> Dict[str, int]:
+    """Pull token counts out of an LLMResult, whichever way the provider reports them."""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0}
+    found = False
+    for generations in response.generations or []:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                found = True
+                usage["prompt_tokens"] += metadata.get("input_tokens", 0) or 0
+                usage["completion_tokens"] += metadata.get("output_tokens", 0) or 0
+                details = metadata.get("input_token_details") or {}
+                usage["cached_tokens"] += details.get("cache_read", 0) or 0
+                usage["cache_write_tokens"] += details.get("cache_creation", 0) or 0
+    if not found:
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        usage["prompt_tokens"] = token_usage.get("prompt_tokens", 0) or 0
+        usage["completion_tokens"] = token_usage.get("completion_tokens", 0) or 0
+        details = token_usage.get("prompt_tokens_details") or {}
+        usage["cached_tokens"] = details.get("cached_tokens", 0) or 0
+    return usage
+
+
+def _cache_hit_rate(stats: Dict[str, Any]) -> float:
+    """Share of prompt tokens served from the provider's prefix cache."""
+    prompt_tokens = stats.get("prompt_tokens", 0)
+    if not prompt_tokens:
+        return 0.0
+    return round(stats.get("cached_tokens", 0) / prompt_tokens, 4)
+
+
+def _escalation_rate(stats: Dict[str, Any]) -> float:
+    """Share of cascaded judge decisions that were handed to the deep model."""
+    decisions = stats.get("judge_decisions", 0)
+    if not decisions:
+        return 0.0
+    return round(stats.get("judge_escalations", 0) / decisions, 4)
+
+
+def _count_judge_events(events: List[Dict[str, Any]], totals: Dict[str, Any]):
+    """Add judge cascade events (see agents/utils/judge_cascade.py) to the run totals."""
+    for event in events:
+        if event.get("name") != "judge_cascade":
+            continue
+        data = event.get("data") or {}
+        totals["judge_decisions"] += 1
+        totals["judge_escalations"] += int(bool(data.get("escalated")))
+        totals["judge_saved_seconds"] = round(
+            totals["judge_saved_seconds"] + (data.get("saved_seconds") or 0.0), 4
+        )
+
+
+def _node_path(ns: str, fallback: Optional[str]) -> Optional[str]:
+    """Readable node path from a checkpoint namespace, e.g. "Market Analyst > tools_market"."""
+    parts = [part.split(":")[0] for part in (ns or "").split("|") if part]
+    return " > ".join(parts) if parts else fallback
+
+
+def _output_bytes(output: Any) -> int:
+    content = getattr(output, "content", output)
+    return len(str(content).encode("utf-8"))
+
+
+class TimelineRecorder(BaseCallbackHandler):
+    """Callback handler that records an execution timeline for one graph run.
+
+    Every graph node, LLM call and tool call becomes a span with start/end offsets
+    (seconds since the run started), status and retries. LLM spans carry prompt,
+    completion and cached token counts, tool spans the size of their output. Node
+    spans also get the queue wait between the end of the previous superstep and
+    the node actually starting. Custom events dispatched from inside a run (e.g. by
+    rate limiters) are attached to the span that emitted them.
+    """
+
+    run_inline = True
+    raise_error = False
+
+    def __init__(self, decision_id: Optional[str] = None):
+        self.decision_id = decision_id
+        self.started_at = datetime.now().isoformat()
+        self._t0 = time.perf_counter()
+        self._spans: Dict[UUID, Dict[str, Any]] = {}
+        self._order: List[UUID] = []
+        self._events: List[Dict[str, Any]] = []
+        # End of the latest span per (namespace, superstep), used for queue wait
+        self._step_ends: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return round(time.perf_counter() - self._t0, 4)
+
+    def _start_span(self, run_id, parent_run_id, kind, name, metadata, **extra):
+        metadata = metadata or {}
+        span = {
+            "id": str(run_id),
+            "parent_id": str(parent_run_id) if parent_run_id else None,
+            "kind": kind,
+            "name": name,
+            "node": metadata.get("langgraph_node"),
+            "step": metadata.get("langgraph_step"),
+            "ns": metadata.get("langgraph_checkpoint_ns", ""),
+            "path": _node_path(metadata.get("langgraph_checkpoint_ns", ""), metadata.get("langgraph_node")),
+            "start": self._now(),
+            "end": None,
+            "duration": None,
+            "status": "running",
+            "retries": 0,
+            **extra,
+        }
+        with self._lock:
+            if kind == "node":
+                ns_parent = span["ns"].rsplit("|", 1)[0] if "|" in span["ns"] else ""
+                ready_at = self._step_ends.get((ns_parent, (span["step"] or 0) - 1), 0.0)
+                span["queue_wait"] = round(max(0.0, span["start"] - ready_at), 4)
+            self._spans[run_id] = span
+            self._order.append(run_id)
+
+    def _end_span(self, run_id, error=None, **extra):
+        with self._lock:
+            span = self._spans.get(run_id)
+            if span is None:
+                return None
+            span["end"] = self._now()
+            span["duration"] = round(span["end"] - span["start"], 4)
+            span["status"] = "error" if error is not None else "success"
+            if error is not None:
+                span["error"] = str(error)[:500]
+            span.update(extra)
+            if span["kind"] == "node":
+                ns_parent = span["ns"].rsplit("|", 1)[0] if "|" in span["ns"] else ""
+                key = (ns_parent, span["step"] or 0)
+                self._step_ends[key] = max(self._step_ends.get(key, 0.0), span["end"])
+            return span
+
+    # Graph nodes
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        node = (metadata or {}).get("langgraph_node")
+        if not node or name != node:
+            return
+        parent = self._spans.get(parent_run_id)
+        if parent is not None and parent["kind"] == "node" and parent["name"] == name:
+            return
+        self._start_span(run_id, parent_run_id, "node", name, metadata)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id, error=error)
+
+    # LLM calls
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (metadata or {}).get("ls_model_name")
+        self._start_span(run_id, parent_run_id, "llm", kwargs.get("name") or "llm", metadata, model=model)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (metadata or {}).get("ls_model_name")
+        self._start_span(run_id, parent_run_id, "llm", kwargs.get("name") or "llm", metadata, model=model)
+
+    def on_llm_end(self, response, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id, **_usage_from_result(response))
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id, error=error)
+
+    def on_retry(self, retry_state, *, run_id, parent_run_id=None, **kwargs):
+        with self._lock:
+            span = self._spans.get(run_id)
+            if span is not None:
+                span["retries"] += 1
+                return
+        # Retries wrapped around a runnable (with_retry) are reported on its own run
+        self.record_event(
+            "retry",
+            {"attempt": getattr(retry_state, "attempt_number", None)},
+        )
+
+    # Tool calls
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None, inputs=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start_span(run_id, parent_run_id, "tool", name, metadata)
+
+    def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id, output_bytes=_output_bytes(output))
+
+    def on_tool_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end_span(run_id, error=error)
+
+    # Custom events (rate limiter waits, cache hits, ...)
+    def on_custom_event(self, name, data, *, run_id, tags=None, metadata=None, **kwargs):
+        self.record_event(name, data, run_id=run_id, metadata=metadata)
+
+    def record_event(self, name: str, data: Any = None, run_id: Optional[UUID] = None, metadata=None):
+        """Attach an event to the span of ``run_id`` (or to the run if there is none)."""
+        event = {"name": name, "at": self._now(), "data": data}
+        if metadata and metadata.get("langgraph_node"):
+            event["node"] = metadata["langgraph_node"]
+        with self._lock:
+            span = self._spans.get(run_id) if run_id is not None else None
+            if span is not None:
+                span.setdefault("events", []).append(event)
+            else:
+                self._events.append(event)
+
+    def to_dict(self, **extra) -> Dict[str, Any]:
+        """Return the timeline with spans in start order and a per-node summary."""
+        with self._lock:
+            spans = [dict(self._spans[run_id]) for run_id in self._order]
+            events = list(self._events)
+        summary = summarize_spans(spans)
+        summary["totals"]["retries"] += sum(1 for e in events if e["name"] == "retry")
+        _count_judge_events(events, summary["totals"])
+        summary["judge_escalation_rate"] = _escalation_rate(summary["totals"])
+        return {
+            "decision_id": self.decision_id,
+            "started_at": self.started_at,
+            "duration": self._now(),
+            **extra,
+            "summary": summary,
+            "spans": spans,
+            "events": events,
+        }
+
+
+def summarize_spans(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate spans into per-node totals plus run totals.
+
+    Nodes of sub-graphs are keyed by their full path, so an analyst branch and the
+    analyst node inside it are counted separately.
+    """
+    nodes: Dict[str, Dict[str, Any]] = {}
+    totals = {
+        "llm_calls": 0,
+        "tool_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "cache_write_tokens": 0,
+        "retries": 0,
+        "tool_output_bytes": 0,
+        "errors": 0,
+        "judge_decisions": 0,
+        "judge_escalations": 0,
+        "judge_saved_seconds": 0.0,
+    }
+
+    def bucket(name):
+        return nodes.setdefault(
+            name,
+            {
+                "runs": 0,
+                "duration": 0.0,
+                "queue_wait": 0.0,
+                "llm_calls": 0,
+                "tool_calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cached_tokens": 0,
+                "cache_write_tokens": 0,
+                "tool_output_bytes": 0,
+            },
+        )
+
+    for span in spans:
+        totals["retries"] += span.get("retries", 0)
+        if span.get("status") == "error":
+            totals["errors"] += 1
+        _count_judge_events(span.get("events", []), totals)
+        node = span.get("path") or span.get("node") or span.get("name")
+        if span["kind"] == "node":
+            b = bucket(node)
+            b["runs"] += 1
+            b["duration"] = round(b["duration"] + (span.get("duration") or 0.0), 4)
+            b["queue_wait"] = round(b["queue_wait"] + span.get("queue_wait", 0.0), 4)
+        elif span["kind"] == "llm":
+            b = bucket(node)
+            b["llm_calls"] += 1
+            totals["llm_calls"] += 1
+            for field in ("prompt_tokens", "completion_tokens", "cached_tokens", "cache_write_tokens"):
+                b[field] += span.get(field, 0)
+                totals[field] += span.get(field, 0)
+        elif span["kind"] == "tool":
+            b = bucket(node)
+            b["tool_calls"] += 1
+            totals["tool_calls"] += 1
+            b["tool_output_bytes"] += span.get("output_bytes", 0)
+            totals["tool_output_bytes"] += span.get("output_bytes", 0)
+
+    for stats in nodes.values():
+        stats["cache_hit_rate"] = _cache_hit_rate(stats)
+    return {
+        "nodes": nodes,
+        "totals": totals,
+        "cache_hit_rate": _cache_hit_rate(totals),
+        "judge_escalation_rate": _escalation_rate(totals),
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 4)
+
+
+def aggregate_timelines(results_dir: str = "eval_results", ticker: Optional[str] = None) -> Dict[str, Any]:
+    """Aggregate the timeline_*.json files written by propagate across runs.
+
+    Args:
+        results_dir: Directory the run logs are written to
+        ticker: Only include runs for this ticker
+
+    Returns:
+        Per-node duration percentiles, queue wait, LLM/tool call counts, token
+        totals and prompt-cache hit rates, plus run-level duration percentiles,
+        totals and the judge cascade escalation rate
+    """
+    pattern = os.path.join(
+        results_dir, ticker or "*", "TradingAgentsStrategy_logs", "timeline_*.json"
+    )
+    node_durations: Dict[str, List[float]] = {}
+    node_totals: Dict[str, Dict[str, float]] = {}
+    run_durations = []
+    totals: Dict[str, float] = {}
+
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                timeline = json.load(f)
+        except (OSError, ValueError):
+            continue
+        run_durations.append(timeline.get("duration", 0.0))
+        summary = timeline.get("summary", {})
+        for key, value in summary.get("totals", {}).items():
+            totals[key] = totals.get(key, 0) + value
+        for span in timeline.get("spans", []):
+            if span.get("kind") == "node" and span.get("duration") is not None:
+                path = span.get("path") or span["name"]
+                node_durations.setdefault(path, []).append(span["duration"])
+        for name, stats in summary.get("nodes", {}).items():
+            node = node_totals.setdefault(name, {})
+            for key, value in stats.items():
+                if key != "cache_hit_rate":
+                    node[key] = node.get(key, 0) + value
+
+    nodes = {}
+    for name, stats in node_totals.items():
+        durations = node_durations.get(name, [])
+        nodes[name] = {
+            **stats,
+            "p50_duration": _percentile(durations, 50),
+            "p95_duration": _percentile(durations, 95),
+            "max_duration": round(max(durations), 4) if durations else 0.0,
+            "cache_hit_rate": _cache_hit_rate(stats),
+        }
+
+    return {
+        "runs": len(run_durations),
+        "p50_duration": _percentile(run_durations, 50),
+        "p95_duration": _percentile(run_durations, 95),
+        "totals": totals,
+        "cache_hit_rate": _cache_hit_rate(totals),
+        "judge_escalation_rate": _escalation_rate(totals),
+        "nodes": nodes,
+    }
+
+
+# 命令行接口
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="汇总 propagate 运行时间线")
+    parser.add_argument("--results-dir", default="eval_results", help="运行日志目录")
+    parser.add_argument("--ticker", help="只统计该标的")
+    args = parser.parse_args()
+
+    print(json.dumps(aggregate_timelines(args.results_dir, args.ticker), indent=2, ensure_ascii=False))
@@ -1,5 +1,7 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import logging
 import os
 import uuid
 from pathlib import Path
@@ -16,18 +18,33 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory_store import get_memory_store
+from tradingagents.agents.utils.analyst_cache import create_analyst_cache
+from tradingagents.agents.utils.debate_context import create_debate_context
+from tradingagents.agents.utils.tool_executor import ParallelToolNode, get_tool_executor
+from tradingagents.agents.utils.judge_cascade import create_judge_cascade
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.llm_cache import get_llm_cache
+from tradingagents.dataflows.http_clients import openai_chat_http_kwargs
+from tradingagents.dataflows.rate_limiter import BACKGROUND, get_llm_scheduler, llm_priority
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .event_loop import iter_sync, run_on_shared_loop, run_sync
+from .checkpointing import RUN_COMPLETED, RUN_FAILED, get_checkpoint_store
+from .timeline import TimelineRecorder
+from .streaming import stream_token
+from .mock_llm import create_mock_llms, mock_tools
+
+logger = logging.getLogger(__name__)
 
 
 class TradingAgentsGraph:
@@ -58,16 +75,34 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Persistent LLM response cache for replays (None when disabled)
+        self.llm_cache = get_llm_cache(self.config)
+
+        # Shared per-provider request/token budgets (None when disabled)
+        self.llm_scheduler = get_llm_scheduler(self.config)
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            llm_kwargs = {
+                **self._llm_kwargs(self.config["backend_url"]),
+                # Pooled keep-alive connections shared with embeddings and web search
+                **openai_chat_http_kwargs(self.config["backend_url"], config=self.config),
+            }
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], **llm_kwargs)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], **llm_kwargs)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            llm_kwargs = self._llm_kwargs(self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], **llm_kwargs)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], **llm_kwargs)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            llm_kwargs = self._llm_kwargs("https://generativelanguage.googleapis.com")
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], **llm_kwargs)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], **llm_kwargs)
+        elif self.config["llm_provider"].lower() == "mock":
+            # Offline scripted models for benchmarking the orchestration (no network)
+            self.deep_thinking_llm, self.quick_thinking_llm = create_mock_llms(
+                self.config, **self._llm_kwargs(None)
+            )
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -75,18 +110,24 @@ class TradingAgentsGraph:
         from tradingagents.agents import CryptoAwareToolkit
         self.toolkit = CryptoAwareToolkit(config=self.config)
 
-        # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        # Initialize memories (role collections of one shared memory store)
+        self.memory_store = get_memory_store(self.config)
+        self.bull_memory = FinancialSituationMemory("bull_memory", self.config, self.memory_store)
+        self.bear_memory = FinancialSituationMemory("bear_memory", self.config, self.memory_store)
+        self.trader_memory = FinancialSituationMemory("trader_memory", self.config, self.memory_store)
+        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config, self.memory_store)
+        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config, self.memory_store)
+        if self.config.get("memory_chunk_reindex_on_start", False):
+            self._build_chunk_indexes()
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config.get("max_debate_rounds", 1),
+            max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 1),
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -98,18 +139,69 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            analyst_cache=create_analyst_cache(self.config),
+            debate_context=create_debate_context(self.quick_thinking_llm, self.config),
+            prefetch_tools=self.config.get("tool_prefetch_enabled", True),
+            judge_cascade=create_judge_cascade(
+                self.quick_thinking_llm, self.deep_thinking_llm, self.config
+            ),
+            offline=self.config["llm_provider"].lower() == "mock",
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            use_rules=self.config.get("signal_rule_extraction", True),
+        )
 
         # State tracking
         self.curr_state = None
         self.ticker = None
+        self.last_decision_id = None
+
+        # Durable checkpoints so interrupted runs can be resumed (None when disabled)
+        self.checkpoint_store = get_checkpoint_store(self.config)
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            checkpointer=self.checkpoint_store.saver if self.checkpoint_store else None,
+            parallel_risk_opening=self.config.get("parallel_risk_opening", False),
+        )
+
+    def _llm_kwargs(self, url):
+        """Constructor arguments shared by the deep- and quick-thinking chat models."""
+        kwargs = {"cache": self.llm_cache}
+        if self.llm_scheduler is not None:
+            kwargs.update(self.llm_scheduler.chat_model_kwargs(url))
+        return kwargs
+
+    def _build_chunk_indexes(self):
+        """Chunk-index situations stored before chunked memory indexing, outside the query path."""
+        for memory in (
+            self.bull_memory,
+            self.bear_memory,
+            self.trader_memory,
+            self.invest_judge_memory,
+            self.risk_manager_memory,
+        ):
+            try:
+                memory.build_chunk_index()
+            except Exception as e:
+                # Unindexed situations are still matched by their parent vector
+                logger.warning(f"Chunk-indexing {memory.situation_collection.name} failed: {e}")
+
+    def _tool_node(self, tools) -> ToolNode:
+        """Tool node running one turn's tool calls concurrently, each with a timeout."""
+        if self.config["llm_provider"].lower() == "mock":
+            tools = mock_tools(tools, self.config)
+        return ParallelToolNode(
+            tools,
+            timeout=self.config.get("tool_timeout"),
+            executor=get_tool_executor(self.config.get("tool_max_workers", 32)),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -129,7 +221,7 @@ class TradingAgentsGraph:
             ]
         
         return {
-            "market": ToolNode(
+            "market": self._tool_node(
                 [
                     # online tools
                     self.toolkit.get_YFin_data_online,
@@ -139,7 +231,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_stockstats_indicators_report,
                 ] + crypto_tools  # 添加加密货币工具
             ),
-            "social": ToolNode(
+            "social": self._tool_node(
                 [
                     # online tools
                     self.toolkit.get_stock_news_openai,
@@ -147,7 +239,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_stock_info,
                 ] + ([self.toolkit.crypto_toolkit.get_crypto_market_sentiment] if hasattr(self.toolkit, 'crypto_toolkit') else [])
             ),
-            "news": ToolNode(
+            "news": self._tool_node(
                 [
                     # online tools
                     self.toolkit.get_global_news_openai,
@@ -157,7 +249,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_news,
                 ]
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": self._tool_node(
                 [
                     # online tools
                     self.toolkit.get_fundamentals_openai,
@@ -175,21 +267,182 @@ class TradingAgentsGraph:
         }
 
     def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+        """Run the trading agents graph for a company on a specific date.
+
+        Blocking wrapper around apropagate, executed on the shared graph event loop.
+        """
+        return run_sync(self.apropagate(company_name, trade_date))
+
+    def propagate_stream(self, company_name, trade_date):
+        """Run the graph like propagate, yielding LLM tokens while it runs.
+
+        Yields ``("token", node, text)`` for every piece of model output as it is
+        generated, then a final ``("result", final_state, decision)``. Iterated from
+        the calling thread, so UI code can render tokens directly.
+        """
+        return iter_sync(self._apropagate_stream(company_name, trade_date))
+
+    async def _apropagate_stream(self, company_name, trade_date):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def on_token(node, text):
+            loop.call_soon_threadsafe(queue.put_nowait, (node, text))
+
+        task = asyncio.ensure_future(
+            self.apropagate(company_name, trade_date, on_token=on_token)
+        )
+        task.add_done_callback(lambda _: loop.call_soon_threadsafe(queue.put_nowait, None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield ("token", *item)
+            final_state, decision = task.result()
+            yield ("result", final_state, decision)
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def apropagate(self, company_name, trade_date, on_token=None):
+        """Asynchronously run the trading agents graph for a company on a specific date.
+
+        Every agent node awaits its LLM call, so many of these runs can be awaited
+        concurrently on one event loop. With checkpointing enabled, the state is saved
+        after every node under the run's decision_id (``self.last_decision_id``), so a
+        failed run can be continued with resume().
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Trade date of the analysis
+            on_token: Optional ``on_token(node, text)`` callback receiving LLM output
+                as it streams in
+        """
 
         self.ticker = company_name
         decision_id = str(uuid.uuid4())
+        self.last_decision_id = decision_id
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+
+        return await self._arun(
+            init_agent_state, company_name, trade_date, decision_id, on_token=on_token
+        )
+
+    def resume(self, decision_id):
+        """Continue an interrupted run from its last completed node.
+
+        Blocking wrapper around aresume, executed on the shared graph event loop.
+        """
+        return run_sync(self.aresume(decision_id))
+
+    async def aresume(self, decision_id):
+        """Asynchronously continue an interrupted run from its last completed node.
+
+        Args:
+            decision_id: decision_id of a run started with checkpointing enabled
+
+        Returns:
+            The same (final_state, decision) tuple as apropagate
+        """
+        if self.checkpoint_store is None:
+            raise RuntimeError(
+                "Checkpointing is disabled; set checkpoint_enabled in the config to resume runs"
+            )
+        run = await run_on_shared_loop(self.checkpoint_store.aget_run(decision_id))
+        if run is None:
+            raise ValueError(f"No checkpointed run found for decision_id {decision_id}")
+        if run["status"] == RUN_COMPLETED:
+            raise ValueError(f"Run {decision_id} has already completed")
+
+        self.ticker = run["ticker"]
+        self.last_decision_id = decision_id
+
+        # A None input makes LangGraph continue from the thread's latest checkpoint
+        return await self._arun(None, run["ticker"], run["trade_date"], decision_id)
+
+    async def _arun(self, graph_input, company_name, trade_date, decision_id, on_token=None):
+        if self.checkpoint_store is not None:
+            # The checkpoint connection is bound to the shared loop
+            return await run_on_shared_loop(
+                self._arun_graph(graph_input, company_name, trade_date, decision_id, on_token)
+            )
+        return await self._arun_graph(graph_input, company_name, trade_date, decision_id, on_token)
+
+    async def _arun_graph(self, graph_input, company_name, trade_date, decision_id, on_token=None):
+        store = self.checkpoint_store
+        args = self.propagator.get_graph_args(
+            thread_id=decision_id if store is not None else None
+        )
+        if store is not None and graph_input is not None:
+            await store.astart_run(decision_id, company_name, trade_date)
+
+        recorder = None
+        if self.config.get("timeline_enabled", True):
+            recorder = TimelineRecorder(decision_id)
+            args["config"]["callbacks"] = [recorder]
+
+        try:
+            final_state = await self._ainvoke_graph(graph_input, args, on_token)
+
+            # Store current state for reflection
+            self.curr_state = final_state
+
+            # Log state
+            await asyncio.to_thread(self._log_state, trade_date, final_state, decision_id)
+
+            decision = await self.aprocess_signal(final_state["final_trade_decision"])
+        except Exception as e:
+            if recorder is not None:
+                await asyncio.to_thread(
+                    self._log_timeline, company_name, trade_date, recorder, "error"
+                )
+            if store is not None:
+                await store.amark_run(decision_id, RUN_FAILED, str(e))
+            raise
+
+        if recorder is not None:
+            await asyncio.to_thread(
+                self._log_timeline, company_name, trade_date, recorder, "success"
+            )
+        if store is not None:
+            await store.amark_run(decision_id, RUN_COMPLETED)
+
+        # Return decision and processed signal
+        return final_state, decision
+
+    async def _ainvoke_graph(self, graph_input, args, on_token=None):
+        if graph_input is None:
+            snapshot = await self.graph.aget_state(args["config"])
+            if not snapshot.values:
+                raise ValueError(
+                    f"No checkpoints left for run {args['config']['configurable']['thread_id']}"
+                )
+            if not snapshot.next:
+                # The graph itself finished; only the post-processing failed
+                return snapshot.values
+
+        if on_token is not None:
+            # Stream tokens alongside the state values; the last values chunk is the result
+            args = {**args, "stream_mode": ["values", "messages"]}
+            final_state = None
+            async for mode, payload in self.graph.astream(graph_input, **args):
+                if mode == "messages":
+                    token = stream_token(payload)
+                    if token is not None:
+                        on_token(*token)
+                else:
+                    final_state = payload
+            return final_state
 
         if self.debug:
             # Debug mode with tracing
             trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
+            async for chunk in self.graph.astream(graph_input, **args):
                 if len(chunk.get("messages", [])) == 0:
                     pass
                 else:
@@ -199,19 +452,102 @@ class TradingAgentsGraph:
             if not trace:
                 raise RuntimeError("Debug mode: No chunks with messages were produced")
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            return trace[-1]
 
-        # Store current state for reflection
-        self.curr_state = final_state
+        # Standard mode without tracing
+        return await self.graph.ainvoke(graph_input, **args)
 
-        # Log state
-        self._log_state(trade_date, final_state, decision_id)
+    def propagate_batch(self, tickers, trade_date, max_concurrency=None):
+        """Run several tickers through this graph, yielding each result as it finishes.
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        Blocking counterpart of apropagate_batch; see it for the result format.
+        """
+        return iter_sync(
+            self.apropagate_batch(tickers, trade_date, max_concurrency=max_concurrency)
+        )
+
+    async def apropagate_batch(self, tickers, trade_date, max_concurrency=None):
+        """Run several tickers through this compiled graph concurrently.
+
+        Args:
+            tickers: Ticker symbols to analyze
+            trade_date: Trade date shared by all runs
+            max_concurrency: Maximum number of runs in flight at once. Defaults to
+                the "batch_max_concurrency" config value
+
+        Yields:
+            One dict per ticker, in completion order, with "ticker" and "status"
+            ("success" or "error") plus either "state" and "decision" or "error"
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get("batch_max_concurrency", 4)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(ticker):
+            async with semaphore:
+                try:
+                    state, decision = await self.apropagate(ticker, trade_date)
+                except Exception as e:
+                    logger.exception(f"Batch run failed for {ticker}: {e}")
+                    return {"ticker": ticker, "status": "error", "error": str(e)}
+                return {
+                    "ticker": ticker,
+                    "status": "success",
+                    "state": state,
+                    "decision": decision,
+                }
+
+        stats_before = dict(self.signal_processor.stats)
+        tasks = [asyncio.create_task(run_one(ticker)) for ticker in tickers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        rule_hits = self.signal_processor.stats["rule_hits"] - stats_before["rule_hits"]
+        llm_calls = self.signal_processor.stats["llm_calls"] - stats_before["llm_calls"]
+        if rule_hits + llm_calls:
+            logger.info(
+                f"Signal extraction for batch of {len(tickers)}: {rule_hits} parsed by rules, "
+                f"{llm_calls} sent to the LLM ({rule_hits / (rule_hits + llm_calls):.0%} saved)"
+            )
+
+    def stream(self, init_agent_state, **args):
+        """Synchronously iterate the chunks of the graph's async stream.
+
+        With checkpointing enabled, the run is recorded under ``self.last_decision_id``
+        (or the thread_id already given in ``args``) so it can be resumed if interrupted.
+        """
+        return iter_sync(self._astream(init_agent_state, **args))
+
+    async def _astream(self, init_agent_state, **args):
+        store = self.checkpoint_store
+        if store is None:
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                yield chunk
+            return
+
+        config = dict(args.get("config") or {})
+        configurable = dict(config.get("configurable") or {})
+        decision_id = configurable.setdefault("thread_id", str(uuid.uuid4()))
+        config["configurable"] = configurable
+        args = {**args, "config": config}
+        self.last_decision_id = decision_id
+
+        await store.astart_run(
+            decision_id,
+            init_agent_state["company_of_interest"],
+            init_agent_state["trade_date"],
+        )
+        try:
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                yield chunk
+        except Exception as e:
+            await store.amark_run(decision_id, RUN_FAILED, str(e))
+            raise
+        await store.amark_run(decision_id, RUN_COMPLETED)
 
     def _log_state(self, trade_date, final_state, decision_id):
         """Log the final state to a JSON file."""
@@ -246,33 +582,55 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        # Save to file (the ticker comes from the state, as concurrent runs share self.ticker)
+        ticker = final_state["company_of_interest"]
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
             json.dump(log_entry, f, indent=4)
 
+    def _log_timeline(self, ticker, trade_date, recorder, status):
+        """Write the run's execution timeline next to its full state log."""
+        timeline = recorder.to_dict(
+            ticker=ticker, trade_date=str(trade_date), status=status
+        )
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with open(directory / f"timeline_{trade_date}.json", "w") as f:
+            json.dump(timeline, f, indent=4, ensure_ascii=False, default=str)
+
+        totals = timeline["summary"]["totals"]
+        if totals["prompt_tokens"]:
+            logger.info(
+                f"Prompt cache for {ticker} {trade_date}: {totals['cached_tokens']}/"
+                f"{totals['prompt_tokens']} prompt tokens cached "
+                f"({timeline['summary']['cache_hit_rate']:.0%})"
+            )
+
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
-        )
+        # Learning is background work: interactive analyses get the provider quota first
+        with llm_priority(BACKGROUND):
+            self.reflector.reflect_bull_researcher(
+                self.curr_state, returns_losses, self.bull_memory
+            )
+            self.reflector.reflect_bear_researcher(
+                self.curr_state, returns_losses, self.bear_memory
+            )
+            self.reflector.reflect_trader(
+                self.curr_state, returns_losses, self.trader_memory
+            )
+            self.reflector.reflect_invest_judge(
+                self.curr_state, returns_losses, self.invest_judge_memory
+            )
+            self.reflector.reflect_risk_manager(
+                self.curr_state, returns_losses, self.risk_manager_memory
+            )
 
     def reflect_on_past_decision(self, past_state, returns_losses):
         """
@@ -281,25 +639,30 @@ class TradingAgentsGraph:
         """
         reflections = {}
 
-        # Each of these calls will now return the reflection report string
-        reflections["bull_researcher"] = self.reflector.reflect_bull_researcher(
-            past_state, returns_losses, self.bull_memory
-        )
-        reflections["bear_researcher"] = self.reflector.reflect_bear_researcher(
-            past_state, returns_losses, self.bear_memory
-        )
-        reflections["trader"] = self.reflector.reflect_trader(
-            past_state, returns_losses, self.trader_memory
-        )
-        reflections["invest_judge"] = self.reflector.reflect_invest_judge(
-            past_state, returns_losses, self.invest_judge_memory
-        )
-        reflections["risk_manager"] = self.reflector.reflect_risk_manager(
-            past_state, returns_losses, self.risk_manager_memory
-        )
-        
+        with llm_priority(BACKGROUND):
+            # Each of these calls will now return the reflection report string
+            reflections["bull_researcher"] = self.reflector.reflect_bull_researcher(
+                past_state, returns_losses, self.bull_memory
+            )
+            reflections["bear_researcher"] = self.reflector.reflect_bear_researcher(
+                past_state, returns_losses, self.bear_memory
+            )
+            reflections["trader"] = self.reflector.reflect_trader(
+                past_state, returns_losses, self.trader_memory
+            )
+            reflections["invest_judge"] = self.reflector.reflect_invest_judge(
+                past_state, returns_losses, self.invest_judge_memory
+            )
+            reflections["risk_manager"] = self.reflector.reflect_risk_manager(
+                past_state, returns_losses, self.risk_manager_memory
+            )
+
         return reflections
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Asynchronously process a signal to extract the core decision."""
+        return await self.signal_processor.aprocess_signal(full_signal)
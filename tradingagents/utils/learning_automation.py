@@ -21,7 +21,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.registry import get_trading_graph
 from tradingagents.agents.utils.paradex_tools import ParadexDataManager
 from tradingagents.agents.utils.memory import FinancialSituationMemory
 from tradingagents.default_config import DEFAULT_CONFIG
@@ -35,7 +35,7 @@ class LearningManager:
         self.processed_fills_log = self.project_root / "eval_results/processed_fills.log"
         self.decision_logs_dir = self.project_root / "eval_results"
         self.paradex_manager = ParadexDataManager()
-        self.trading_agents_graph = TradingAgentsGraph()
+        self.trading_agents_graph = get_trading_graph()
         load_dotenv(self.project_root / ".env")
 
     def _load_processed_fills(self) -> set:
@@ -3,9 +3,10 @@ API 验证器
 提供各种 API 连接测试功能
 """
 
-from openai import OpenAI
 import finnhub
 
+from tradingagents.dataflows.http_clients import get_openai_client
+
 
 class APIValidator:
     """API 连接验证器"""
@@ -24,10 +25,7 @@ class APIValidator:
             (成功标志, 消息)
         """
         try:
-            client = OpenAI(
-                base_url=backend_url,
-                api_key=api_key
-            )
+            client = get_openai_client(backend_url, api_key)
             response = client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": "Hello"}],
@@ -51,10 +49,7 @@ class APIValidator:
             (成功标志, 消息)
         """
         try:
-            client = OpenAI(
-                base_url=embedding_url,
-                api_key=api_key
-            )
+            client = get_openai_client(embedding_url, api_key)
             response = client.embeddings.create(
                 model=model,
                 input="test"